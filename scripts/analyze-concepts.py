@@ -6,18 +6,35 @@ This script is called by the PostToolUse hook after Write/Edit operations.
 It analyzes the written code for programming concepts and triggers quiz
 generation when new concepts are detected.
 
+Analysis uses the claude CLI, guarded by a latency budget and circuit
+breaker (see analyzer_breaker.py). While the breaker is open, concepts are
+detected locally with LOCAL_PATTERNS and the file is deferred; deferred
+files get a full analysis in the background once the CLI recovers, which
+records only the concepts the local pass did not already record.
+
 Input (stdin): JSON with tool_input containing file_path and content
 Output (stdout): Status message for Claude Code context
+
+Usage:
+    python analyze-concepts.py                   # hook mode, reads stdin
+    python analyze-concepts.py --drain-deferred  # analyze deferred files
 """
 
+import fcntl
 import json
 import os
+import re
 import sys
 import subprocess
 import hashlib
+import time
 from pathlib import Path
 from datetime import datetime
 
+# Add parent directory to path for imports; the hook runs on every Write
+# and Edit, so its own modules are imported where they are used
+sys.path.insert(0, str(Path(__file__).parent))
+
 # File extensions we analyze for concepts
 CODE_EXTENSIONS = {
     '.ts', '.tsx', '.js', '.jsx',  # TypeScript/JavaScript
@@ -51,6 +68,34 @@ CONCEPT_CATEGORIES = {
     ],
 }
 
+# Cheap local detection used while the claude analyzer is unavailable. The
+# patterns look for clear signs of a concept, so this finds fewer concepts
+# than the analyzer rather than more.
+LOCAL_PATTERNS = {
+    "memoization": r"@(?:functools\.)?(?:lru_)?cache\b|\bmemo(?:ize|ized)?\b",
+    "binary_search": r"\bbisect(?:_left|_right)?\b|\bmid\s*=\s*\(?\s*(?:lo|low|left|l)\s*\+",
+    "heap": r"\bheapq\b|\bheappush\b|std::make_heap",
+    "priority_queue": r"\bPriorityQueue\b|priority_queue\s*<",
+    "deque": r"\bdeque\s*[<(]|\bArrayDeque\b",
+    "trie": r"\b(?:class|struct)\s+Trie",
+    "linked_list": r"\b(?:class|struct)\s+(?:ListNode|LinkedList)\b",
+    "binary_tree": r"\b(?:class|struct)\s+TreeNode\b",
+    "disjoint_set": r"\b(?:class|struct)\s+(?:UnionFind|DisjointSet|DSU)\b",
+    "topological_sort": r"\bin_?degrees?\b",
+    "async_await": r"\basync\s+(?:def|function)\b|\bawait\s",
+    "generators": r"\byield\b|\bfunction\s*\*",
+    "metaclasses": r"\bmetaclass\s*=",
+    "singleton": r"\b_instance\s*=\s*None\b|\bgetInstance\s*\(",
+}
+
+# Function definitions, for spotting direct recursion locally
+FUNCTION_DEF_PATTERN = re.compile(
+    r"\bdef\s+(\w+)\s*\(|\bfunction\s+(\w+)\s*\(|\bfunc\s+(\w+)\s*\(|\bfun\s+(\w+)\s*\("
+)
+
+# Files waiting for a full analysis, per project
+DEFERRED_FILENAME = 'deferred-analysis.json'
+
 
 def get_leetvibe_dir() -> Path:
     """Get the .leetvibe directory in the current project."""
@@ -68,10 +113,12 @@ def get_learning_history_path() -> Path:
 
 def load_learning_history() -> dict:
     """Load the learning history from disk."""
+    import metrics
+
     history_path = get_learning_history_path()
     if history_path.exists():
         try:
-            with open(history_path, 'r') as f:
+            with metrics.span('history.load'), open(history_path, 'r') as f:
                 return json.load(f)
         except (json.JSONDecodeError, IOError):
             pass
@@ -80,9 +127,11 @@ def load_learning_history() -> dict:
 
 def save_learning_history(history: dict) -> None:
     """Save the learning history to disk."""
+    import metrics
+
     history_path = get_learning_history_path()
     history_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(history_path, 'w') as f:
+    with metrics.span('history.save'), open(history_path, 'w') as f:
         json.dump(history, f, indent=2)
 
 
@@ -94,8 +143,8 @@ def is_code_file(file_path: str) -> bool:
     return ext in CODE_EXTENSIONS
 
 
-def analyze_with_claude(code: str, file_path: str) -> list[str]:
-    """Use Claude CLI to analyze code for concepts."""
+def analyze_with_claude(code: str, file_path: str, timeout: float = 30) -> list[str] | None:
+    """Use Claude CLI to analyze code for concepts. Returns None if the call failed."""
     prompt = f"""Analyze this code and identify any programming concepts from this list.
 Return ONLY a JSON array of concept names that are clearly demonstrated in the code.
 Be conservative - only include concepts that are explicitly used, not just tangentially related.
@@ -121,7 +170,7 @@ If no significant concepts found, return: []"""
             ['claude', '-p', prompt, '--output-format', 'text'],
             capture_output=True,
             text=True,
-            timeout=30,
+            timeout=timeout,
             cwd=os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd())
         )
 
@@ -138,10 +187,107 @@ If no significant concepts found, return: []"""
                 for category in CONCEPT_CATEGORIES.values():
                     all_concepts.extend(category)
                 return [c for c in concepts if c in all_concepts]
-    except (subprocess.TimeoutExpired, subprocess.SubprocessError, json.JSONDecodeError):
+    except (subprocess.TimeoutExpired, subprocess.SubprocessError, OSError, json.JSONDecodeError):
+        pass
+
+    return None
+
+
+def analyze_locally(code: str) -> list[str]:
+    """Detect concepts with LOCAL_PATTERNS and direct recursion."""
+    concepts = [concept for concept, pattern in LOCAL_PATTERNS.items() if re.search(pattern, code)]
+    definitions = list(FUNCTION_DEF_PATTERN.finditer(code))
+    for i, match in enumerate(definitions):
+        name = next(group for group in match.groups() if group)
+        body_end = definitions[i + 1].start() if i + 1 < len(definitions) else len(code)
+        if re.search(rf"\b{re.escape(name)}\s*\(", code[match.end():body_end]):
+            concepts.append("recursion")
+            break
+    return concepts
+
+
+def get_deferred_path(leetvibe_dir: Path) -> Path:
+    return leetvibe_dir / DEFERRED_FILENAME
+
+
+def load_deferred(leetvibe_dir: Path) -> dict:
+    """
+    Deferred files as {file_path: {'deferred_at', 'recorded'}}, where
+    'recorded' lists the concepts already recorded from local detection.
+    """
+    try:
+        with open(get_deferred_path(leetvibe_dir), 'r') as f:
+            deferred = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return {}
+    if not isinstance(deferred, dict):
+        return {}
+    # Entries written before 'recorded' was kept are just the timestamp
+    return {path: entry if isinstance(entry, dict) else {'deferred_at': entry, 'recorded': []}
+            for path, entry in deferred.items()}
+
+
+def update_deferred(leetvibe_dir: Path, add: str | None = None, remove: str | None = None,
+                    recorded: list[str] = ()) -> None:
+    """
+    Add or remove a deferred file under a lock, writing atomically. A file
+    deferred again keeps its place and adds `recorded` to its concepts.
+    """
+    leetvibe_dir.mkdir(parents=True, exist_ok=True)
+    deferred_path = get_deferred_path(leetvibe_dir)
+    with open(leetvibe_dir / f'{DEFERRED_FILENAME}.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        deferred = load_deferred(leetvibe_dir)
+        if add:
+            entry = deferred.setdefault(add, {'deferred_at': datetime.now().isoformat(),
+                                              'recorded': []})
+            entry['recorded'] = sorted(set(entry['recorded']) | set(recorded))
+        if remove:
+            deferred.pop(remove, None)
+        partial = deferred_path.with_name(f'.{deferred_path.name}.{os.getpid()}.tmp')
+        with open(partial, 'w') as f:
+            json.dump(deferred, f, indent=2)
+        os.replace(partial, deferred_path)
+
+
+def spawn_deferred_drain() -> None:
+    """Analyze deferred files in a detached process so the hook returns now."""
+    try:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).absolute()), '--drain-deferred'],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
         pass
 
-    return []
+
+def detect_concepts(content: str, file_path: str, leetvibe_dir: Path) -> list[str]:
+    """
+    Analyze with the claude CLI while the circuit breaker allows it, within
+    the latency budget; otherwise detect locally and defer the file.
+    """
+    import analyzer_breaker
+    import metrics
+
+    if analyzer_breaker.allow_request():
+        start = time.perf_counter()
+        with metrics.span('analyze', backend='claude'):
+            concepts = analyze_with_claude(content, file_path, timeout=analyzer_breaker.latency_budget())
+        if concepts is not None:
+            analyzer_breaker.record_success((time.perf_counter() - start) * 1000)
+            if load_deferred(leetvibe_dir):
+                spawn_deferred_drain()
+            return concepts
+        analyzer_breaker.record_failure()
+
+    with metrics.span('analyze', backend='local'):
+        concepts = analyze_locally(content)
+    # main() records these now; the drain records only what they missed
+    update_deferred(leetvibe_dir, add=str(Path(file_path).absolute()), recorded=concepts)
+    return concepts
 
 
 def get_next_quiz_id(leetvibe_dir: Path) -> str:
@@ -170,40 +316,26 @@ def get_next_quiz_id(leetvibe_dir: Path) -> str:
 
 def get_language_from_file(file_path: str) -> str:
     """Determine language from file extension."""
+    from runners.registry import EXTENSION_LANGUAGES
+
     ext = Path(file_path).suffix.lower()
-    ext_to_lang = {
-        '.py': 'python',
-        '.ts': 'typescript', '.tsx': 'typescript',
-        '.js': 'javascript', '.jsx': 'javascript',
-        '.cpp': 'cpp', '.cc': 'cpp', '.cxx': 'cpp',
-        '.swift': 'swift',
-        '.kt': 'kotlin', '.kts': 'kotlin',
-    }
-    return ext_to_lang.get(ext, 'python')
-
-
-def write_pending_request(concept: str, quiz_id: str, source_file: str, source_code: str) -> Path:
-    """Write a pending quiz request for Claude Code to process."""
-    leetvibe_dir = get_leetvibe_dir()
-    pending_dir = leetvibe_dir / 'pending'
-    pending_dir.mkdir(parents=True, exist_ok=True)
+    return EXTENSION_LANGUAGES.get(ext, 'python')
 
-    language = get_language_from_file(source_file)
 
-    request = {
-        "concept": concept,
-        "quiz_id": quiz_id,
-        "source_file": source_file,
-        "source_code": source_code[:3000],  # Limit size
-        "language": language,
-        "timestamp": datetime.now().isoformat(),
-    }
+def write_pending_request(concept: str, quiz_id: str, source_file: str,
+                          source_code: str) -> tuple[str, bool]:
+    """
+    Queue a quiz request for Claude Code to process.
 
-    pending_file = pending_dir / f"{quiz_id}-{concept}.json"
-    with open(pending_file, 'w') as f:
-        json.dump(request, f, indent=2)
+    Returns (quiz_id, created); a concept already queued or already solved
+    in this language keeps its existing quiz ID and is not queued again.
+    """
+    import pending_queue
+    from runners.registry import language_extensions
 
-    return pending_file
+    language = get_language_from_file(source_file)
+    return pending_queue.enqueue(get_leetvibe_dir(), concept, language, quiz_id,
+                                 source_file, source_code, extensions=language_extensions(language))
 
 
 def main():
@@ -231,22 +363,35 @@ def main():
         sys.exit(0)
 
     # Analyze for concepts
-    concepts = analyze_with_claude(content, file_path)
+    leetvibe_dir = get_leetvibe_dir()
+    concepts = detect_concepts(content, file_path, leetvibe_dir)
 
     if not concepts:
         sys.exit(0)
 
+    record_concepts(concepts, file_path, content, leetvibe_dir)
+
+
+def record_concepts(concepts: list[str], file_path: str, content: str, leetvibe_dir: Path) -> None:
+    """Update the learning history and queue quizzes for newly seen concepts."""
+    import pending_queue
+    import project_registry
+    from quiz_bank import fulfill_from_bank
+
     # Load learning history
     history = load_learning_history()
-    leetvibe_dir = get_leetvibe_dir()
+    project_registry.register(leetvibe_dir)
 
-    # Find new concepts first
+    # Find new concepts first; a known concept still waiting for its quiz
+    # moves up the pending queue
+    language = get_language_from_file(file_path)
     new_concepts = []
     for concept in concepts:
         if concept not in history['concepts']:
             new_concepts.append(concept)
         else:
             history['concepts'][concept]['times_seen'] += 1
+            pending_queue.touch(leetvibe_dir, concept, language)
 
     # Assign unique quiz IDs upfront (before spawning background processes)
     quiz_assignments = []
@@ -261,6 +406,7 @@ def main():
                 current_max_id = max(current_max_id, fid)
             except (ValueError, IndexError):
                 pass
+    current_max_id = max(current_max_id, pending_queue.max_queued_id(leetvibe_dir))
 
     # Assign IDs sequentially
     for concept in new_concepts:
@@ -277,9 +423,6 @@ def main():
             'source_file': file_path,
         }
 
-    # Save updated history BEFORE spawning background processes
-    save_learning_history(history)
-
     # Read source code for context
     source_code = ""
     try:
@@ -288,16 +431,80 @@ def main():
     except IOError:
         source_code = content  # Fall back to edit content
 
-    # Write pending quiz requests for Claude Code to process
+    # Queue quiz requests for Claude Code to process; a concept that is
+    # already queued or solved (e.g. after a history reset) keeps its quiz
+    queued = []
+    from_bank = []
     for concept, quiz_id in quiz_assignments:
-        write_pending_request(concept, quiz_id, file_path, source_code)
+        queued_id, created = write_pending_request(concept, quiz_id, file_path, source_code)
+        history['concepts'][concept]['quiz_id'] = queued_id
+        if not created:
+            continue
+        # Quizzes generated before (in any project) come from the quiz bank
+        request = {'concept': concept, 'quiz_id': queued_id,
+                   'language': get_language_from_file(file_path)}
+        if fulfill_from_bank(leetvibe_dir, request):
+            pending_queue.remove(leetvibe_dir, concept, request['language'])
+            from_bank.append(f"[{queued_id}] {concept}")
+        else:
+            queued.append(concept)
+
+    save_learning_history(history)
+
+    if from_bank:
+        print(f"[LeetVibe] New quizzes ready from your quiz bank: {', '.join(from_bank)}")
 
     # Output instruction for Claude Code to auto-generate quizzes in background
-    if new_concepts:
-        concepts_list = ", ".join(new_concepts)
+    if queued:
+        concepts_list = ", ".join(queued)
         print(f"[LeetVibe] New concepts detected: {concepts_list}")
         print(f"[LeetVibe:AutoGenerate] Generate quizzes for pending requests in .leetvibe/pending/")
 
 
+def drain_deferred() -> None:
+    """
+    Give deferred files a full analysis, oldest first, while the circuit
+    breaker allows it. Only one drain runs per project at a time.
+    """
+    import analyzer_breaker
+    import metrics
+
+    leetvibe_dir = get_leetvibe_dir()
+    with open(leetvibe_dir / f'{DEFERRED_FILENAME}.drain.lock', 'w') as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return
+
+        deferred = load_deferred(leetvibe_dir)
+        for file_path in sorted(deferred, key=lambda path: deferred[path]['deferred_at']):
+            try:
+                with open(file_path, 'r') as f:
+                    content = f.read()
+            except (IOError, UnicodeDecodeError):
+                update_deferred(leetvibe_dir, remove=file_path)
+                continue
+            if not analyzer_breaker.allow_request():
+                return
+            start = time.perf_counter()
+            with metrics.span('analyze', backend='claude-deferred'):
+                concepts = analyze_with_claude(content, file_path, timeout=analyzer_breaker.latency_budget())
+            if concepts is None:
+                analyzer_breaker.record_failure()
+                return
+            analyzer_breaker.record_success((time.perf_counter() - start) * 1000)
+            update_deferred(leetvibe_dir, remove=file_path)
+            recorded = set(deferred[file_path]['recorded'])
+            missed = [concept for concept in concepts if concept not in recorded]
+            if missed:
+                record_concepts(missed, file_path, content, leetvibe_dir)
+
+
 if __name__ == '__main__':
-    main()
+    if '--drain-deferred' in sys.argv[1:]:
+        drain_deferred()
+    else:
+        import metrics
+
+        with metrics.span('hook'):
+            main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Analyzer Circuit Breaker for LeetVibe
+
+The PostToolUse hook asks the `claude` CLI which concepts an edit uses. When
+the CLI is slow or failing, waiting on it for every file save is worse than
+skipping it, so the hook consults this breaker first.
+
+    closed     the analyzer is called with a timeout of the latency budget
+    open       the analyzer is skipped; the hook falls back to local
+               detection and defers the file for a full analysis later
+    half_open  after a cooldown, one hook invocation probes the analyzer;
+               success closes the breaker, failure reopens it with twice
+               the cooldown (up to MAX_COOLDOWN_SECONDS)
+
+The analyzer is killed once it runs over budget. The breaker trips after
+FAILURE_THRESHOLD consecutive failures (errors or calls over budget), or
+when the median latency of the last LATENCY_WINDOW successful calls is over
+SLOW_FRACTION of the budget. State is shared by all projects in
+~/.leetvibe/analyzer-breaker.json.
+
+The budget defaults to DEFAULT_BUDGET_SECONDS and can be set with the
+LEETVIBE_ANALYZER_BUDGET environment variable (seconds).
+
+Usage:
+    python analyzer_breaker.py [status] [--json]
+    python analyzer_breaker.py reset
+"""
+
+import fcntl
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Environment variable overriding the analyzer latency budget (seconds)
+BUDGET_ENV = 'LEETVIBE_ANALYZER_BUDGET'
+DEFAULT_BUDGET_SECONDS = 10.0
+
+FAILURE_THRESHOLD = 3
+LATENCY_WINDOW = 5
+SLOW_FRACTION = 0.75
+
+COOLDOWN_SECONDS = 60.0
+MAX_COOLDOWN_SECONDS = 15 * 60.0
+
+
+def get_state_path() -> Path:
+    """Path to the shared breaker state."""
+    return Path.home() / '.leetvibe' / 'analyzer-breaker.json'
+
+
+def latency_budget() -> float:
+    """The analyzer latency budget in seconds."""
+    try:
+        return max(1.0, float(os.environ[BUDGET_ENV]))
+    except (KeyError, ValueError):
+        return DEFAULT_BUDGET_SECONDS
+
+
+def _initial_state() -> dict:
+    return {
+        'state': 'closed',
+        'consecutive_failures': 0,
+        'latencies_ms': [],
+        'opened_at': None,
+        'cooldown_s': COOLDOWN_SECONDS,
+        'probe_started': None,
+        'trips': 0,
+    }
+
+
+@contextmanager
+def _locked():
+    """Serialize read-modify-write of the breaker state across processes."""
+    state_path = get_state_path()
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(state_path.with_name('analyzer-breaker.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _read() -> dict:
+    try:
+        with open(get_state_path(), 'r') as f:
+            return {**_initial_state(), **json.load(f)}
+    except (json.JSONDecodeError, IOError, TypeError):
+        return _initial_state()
+
+
+def _write(state: dict) -> None:
+    state_path = get_state_path()
+    partial = state_path.with_name(f'.{state_path.name}.{os.getpid()}.tmp')
+    with open(partial, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(partial, state_path)
+
+
+def allow_request() -> bool:
+    """
+    Whether this hook invocation may call the analyzer. Once an open
+    breaker's cooldown has passed, exactly one caller is let through as the
+    half-open probe; a probe that never reports back expires after another
+    budget's worth of time.
+    """
+    state = _read()
+    if state['state'] == 'closed':
+        return True
+
+    now = time.time()
+    with _locked():
+        state = _read()
+        if state['state'] == 'closed':
+            return True
+        if state['state'] == 'half_open' and now - (state['probe_started'] or 0) < 2 * latency_budget():
+            return False  # another invocation is probing
+        if state['state'] == 'open' and now - (state['opened_at'] or 0) < state['cooldown_s']:
+            return False
+        state['state'] = 'half_open'
+        state['probe_started'] = now
+        _write(state)
+    return True
+
+
+def _median(values: list[float]) -> float:
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2]
+
+
+def _trip(state: dict, now: float) -> None:
+    if state['state'] == 'half_open':
+        state['cooldown_s'] = min(state['cooldown_s'] * 2, MAX_COOLDOWN_SECONDS)
+    state['state'] = 'open'
+    state['opened_at'] = now
+    state['probe_started'] = None
+    state['trips'] += 1
+
+
+def record_success(latency_ms: float) -> None:
+    """Record a completed analyzer call; a slow median still trips the breaker."""
+    now = time.time()
+    with _locked():
+        state = _read()
+        # A successful probe starts a fresh latency window
+        window = [] if state['state'] == 'half_open' else state['latencies_ms']
+        state['latencies_ms'] = (window + [round(latency_ms, 1)])[-LATENCY_WINDOW:]
+        state['consecutive_failures'] = 0
+        if (len(state['latencies_ms']) == LATENCY_WINDOW
+                and _median(state['latencies_ms']) > SLOW_FRACTION * latency_budget() * 1000):
+            _trip(state, now)
+        else:
+            state['state'] = 'closed'
+            state['cooldown_s'] = COOLDOWN_SECONDS
+            state['probe_started'] = None
+        _write(state)
+
+
+def record_failure() -> None:
+    """Record a failed or over-budget analyzer call."""
+    now = time.time()
+    with _locked():
+        state = _read()
+        state['consecutive_failures'] += 1
+        if state['state'] == 'half_open' or state['consecutive_failures'] >= FAILURE_THRESHOLD:
+            _trip(state, now)
+        _write(state)
+
+
+def status() -> dict:
+    """Breaker state with the time left before the next probe."""
+    state = _read()
+    retry_in = None
+    if state['state'] == 'open':
+        retry_in = max(0.0, (state['opened_at'] or 0) + state['cooldown_s'] - time.time())
+    return {**state, 'budget_s': latency_budget(), 'retry_in_s': retry_in}
+
+
+def reset() -> None:
+    with _locked():
+        _write(_initial_state())
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].startswith('-') else 'status'
+    if command not in ('status', 'reset'):
+        print(__doc__.strip().split('Usage:')[1].strip(), file=sys.stderr)
+        sys.exit(1)
+
+    if command == 'reset':
+        reset()
+        print("Analyzer circuit breaker reset (closed).")
+        return
+
+    info = status()
+    if '--json' in sys.argv[1:]:
+        print(json.dumps(info, indent=2))
+        return
+
+    print("\n  LeetVibe Analyzer")
+    print("  =================\n")
+    print(f"  Breaker:           {info['state'].replace('_', '-')}")
+    print(f"  Latency budget:    {info['budget_s']:g}s")
+    if info['latencies_ms']:
+        print(f"  Recent latencies:  {', '.join(f'{ms / 1000:.1f}s' for ms in info['latencies_ms'])}")
+    print(f"  Failures in a row: {info['consecutive_failures']}")
+    if info['retry_in_s'] is not None:
+        print(f"  Next probe in:     {info['retry_in_s']:.0f}s (local detection until then)")
+    print(f"  Times tripped:     {info['trips']}")
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Reference Benchmarking for LeetVibe
+
+Times a quiz solution against the quiz's hidden reference solution
+(.leetvibe/reference/{same filename}) on the same inputs, so an answer that
+passes but is slow gets concrete feedback: "your solution is 14.0x slower".
+
+The inputs are the quiz's generated stress cases expanded at each scale
+factor (see generators.scale_case), which also shows how each implementation
+grows with input size; quizzes without generated cases are benchmarked on
+their literal inputs. Every input runs `warmup` untimed times and then
+`repeat` timed times, one case at a time, and the median in-harness time and
+the peak memory are reported. The reference runs first and its outputs are
+the expected values for the user's runs, so a solution that disagrees with
+the reference on a scaled input is flagged.
+
+Warmups only help when the runs share a process: batch runners run them all
+in one harness, and Python runs go to a warm worker (see WarmPythonWorker).
+Runners that start a process per case (TypeScript) give cold runs, and the
+report says so.
+
+Nothing is recorded: a benchmark is not a submission.
+
+Usage:
+    leetvibe submit 002 --bench
+    leetvibe submit 002 --bench --repeat 9 --warmup 2 --scale 1,2,8
+"""
+
+import math
+import statistics
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from check_solution import get_leetvibe_dir, run_solution
+from generators import expand_input, get_cache_dir, is_generated, scale_case
+from runners import registry
+
+DEFAULT_SCALES = (1.0, 4.0)
+DEFAULT_WARMUP = 1
+DEFAULT_REPEAT = 5
+
+# Times are floored to this (ms) before taking ratios, so a case the harness
+# times at zero does not divide by zero
+TIME_FLOOR_MS = 0.001
+
+# Ratios within this factor of 1 are reported as on par
+PAR_TOLERANCE = 1.1
+
+
+def parse_scales(text: str) -> list[float]:
+    """Parse a comma-separated list of positive scale factors ("1,4")."""
+    try:
+        scales = [float(part) for part in text.split(',') if part.strip()]
+    except ValueError:
+        raise ValueError(f"Invalid --scale: {text!r} (expected e.g. 1,4)")
+    if not scales or any(s <= 0 for s in scales):
+        raise ValueError(f"Invalid --scale: {text!r} (factors must be positive)")
+    return sorted(set(scales))
+
+
+def bench_inputs(test_cases: dict, scales: list[float], cache_dir: Path) -> list[dict]:
+    """
+    The inputs to benchmark, as {'case': number, 'scale': factor, 'input': args}.
+    Generated cases are expanded at every scale; without generated cases,
+    the literal inputs are used once each at scale 1.
+    """
+    cases = test_cases['test_cases']
+    generated = [(i, tc) for i, tc in enumerate(cases) if is_generated(tc)]
+    if not generated:
+        return [{'case': i + 1, 'scale': 1.0, 'input': tc.get('input', [])}
+                for i, tc in enumerate(cases)]
+
+    inputs = []
+    for i, tc in generated:
+        for scale in scales:
+            scaled = tc if scale == 1 else scale_case(tc, scale)
+            try:
+                args = expand_input(scaled, cache_dir)
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"Test case {i + 1} at scale {scale:g}x: invalid generator spec: {e}")
+            inputs.append({'case': i + 1, 'scale': scale, 'input': args})
+    return inputs
+
+
+def _timed_runs(solution_path: Path, test_cases: dict, inputs: list[dict], expected: list,
+                warmup: int, repeat: int, options: dict):
+    """
+    Run each input warmup + repeat times, one case at a time. Returns the
+    RunResult and, per input, its timed (non-warmup) results.
+    """
+    runs = warmup + repeat
+    cases = [{'input': item['input'], 'expected': value}
+             for item, value in zip(inputs, expected) for _ in range(runs)]
+    result = run_solution(solution_path, {**test_cases, 'test_cases': cases},
+                          options={**options, 'jobs': 1, 'measure_memory': True})
+    if result.compile_error:
+        return result, []
+    return result, [result.results[k * runs + warmup:(k + 1) * runs]
+                    for k in range(len(inputs))]
+
+
+def _summarize(results: list) -> dict:
+    """Median time and peak memory over one input's timed results."""
+    errors = [r.error for r in results if r.error]
+    peaks = [r.peak_mb for r in results if r.peak_mb is not None]
+    return {
+        'median_ms': statistics.median(r.execution_time_ms for r in results),
+        'min_ms': min(r.execution_time_ms for r in results),
+        'peak_mb': max(peaks) if peaks else None,
+        'error': errors[0] if errors else None,
+        'agrees': all(r.passed for r in results),
+    }
+
+
+def _geometric_mean(values: list[float]) -> float | None:
+    if not values:
+        return None
+    return math.exp(sum(math.log(v) for v in values) / len(values))
+
+
+def _growth(rows: list[dict], side: str) -> float | None:
+    """
+    Empirical growth exponent k (time ~ n^k) between the smallest and the
+    largest scale of each case, as the median over cases.
+    """
+    exponents = []
+    for case in sorted({row['case'] for row in rows}):
+        points = [row for row in rows if row['case'] == case and not row[side]['error']]
+        if len(points) < 2:
+            continue
+        low, high = points[0], points[-1]
+        ratio = (max(high[side]['median_ms'], TIME_FLOOR_MS)
+                 / max(low[side]['median_ms'], TIME_FLOOR_MS))
+        exponents.append(math.log(ratio) / math.log(high['scale'] / low['scale']))
+    return statistics.median(exponents) if exponents else None
+
+
+def run_benchmark(solution_path: Path, reference_path: Path, test_cases: dict,
+                  scales: list[float] = DEFAULT_SCALES, warmup: int = DEFAULT_WARMUP,
+                  repeat: int = DEFAULT_REPEAT, options: dict = None) -> dict:
+    """
+    Benchmark a solution against the reference solution.
+
+    Returns a report {'reference', 'warmup', 'repeat', 'cold', 'scales',
+    'cases', 'summary'}; each case has the 'yours' and 'reference' medians,
+    peaks and errors and their 'ratio'. 'cold' names the language when each
+    run is a fresh process. Raises ValueError if the inputs cannot be built
+    or the reference fails.
+    """
+    options = dict(options or {})
+    inputs = bench_inputs(test_cases, list(scales), get_cache_dir(get_leetvibe_dir()))
+    if not inputs:
+        raise ValueError("No test cases to benchmark")
+
+    spec = registry.find_runner(solution_path.suffix)
+    cold = None
+    worker = None
+    if spec and spec.supports(registry.WARM_WORKER):
+        from runners.python_runner import DEFAULT_INTERPRETER, WarmPythonWorker
+        worker = WarmPythonWorker(options.get('python') or DEFAULT_INTERPRETER)
+        options['worker'] = worker
+    elif spec and not spec.supports(registry.BATCH):
+        cold = spec.language
+
+    try:
+        reference, reference_runs = _timed_runs(
+            reference_path, test_cases, inputs, [None] * len(inputs), warmup, repeat,
+            {**options, 'echo_actual': True})
+        if reference.compile_error:
+            raise ValueError(f"Reference solution failed to compile: {reference.compile_error}")
+        expected = []
+        for item, results in zip(inputs, reference_runs):
+            failed = next((r for r in results if r.error), None)
+            if failed:
+                raise ValueError(f"Reference solution failed on test case {item['case']} "
+                                 f"at scale {item['scale']:g}x: {failed.error}")
+            expected.append(results[0].actual)
+
+        yours, your_runs = _timed_runs(solution_path, test_cases, inputs, expected,
+                                       warmup, repeat, options)
+    finally:
+        if worker:
+            worker.close()
+
+    rows = []
+    for k, item in enumerate(inputs):
+        ref = _summarize(reference_runs[k])
+        ref['agrees'] = True
+        if yours.compile_error:
+            mine = {'median_ms': None, 'min_ms': None, 'peak_mb': None,
+                    'error': yours.compile_error, 'agrees': False}
+        else:
+            mine = _summarize(your_runs[k])
+        ratio = None
+        if not mine['error']:
+            ratio = max(mine['median_ms'], TIME_FLOOR_MS) / max(ref['median_ms'], TIME_FLOOR_MS)
+        rows.append({'case': item['case'], 'scale': item['scale'],
+                     'yours': mine, 'reference': ref, 'ratio': ratio})
+
+    memory_ratios = [row['yours']['peak_mb'] / row['reference']['peak_mb'] for row in rows
+                     if row['yours']['peak_mb'] and row['reference']['peak_mb']]
+    return {
+        'reference': str(reference_path),
+        'warmup': warmup,
+        'repeat': repeat,
+        'cold': cold,
+        'scales': sorted({item['scale'] for item in inputs}),
+        'cases': rows,
+        'summary': {
+            'time_ratio': _geometric_mean([row['ratio'] for row in rows if row['ratio'] is not None]),
+            'memory_ratio': _geometric_mean(memory_ratios),
+            'growth_yours': None if yours.compile_error else _growth(rows, 'yours'),
+            'growth_reference': _growth(rows, 'reference'),
+            'all_agree': all(row['yours']['agrees'] for row in rows),
+            'compile_error': yours.compile_error,
+        },
+    }
+
+
+def speed_verdict(ratio: float) -> str:
+    """'Your solution is 14.0x slower than the reference', or faster, or on par."""
+    if ratio >= PAR_TOLERANCE:
+        return f"Your solution is {ratio:.1f}x slower than the reference"
+    if ratio <= 1 / PAR_TOLERANCE:
+        return f"Your solution is {1 / ratio:.1f}x faster than the reference"
+    return "Your solution is on par with the reference"
+
+
+def format_benchmark(report: dict) -> str:
+    """Render a benchmark report as a table with a one-line verdict."""
+    summary = report['summary']
+    widths = [5, 6, 11, 11, 10, 9, 9]
+
+    def row(cells: list[str]) -> str:
+        return '  ' + '  '.join(f"{cell:>{w}}" for cell, w in zip(cells, widths))
+
+    def memory(value: float | None) -> str:
+        return f"{value:.2f}" if value is not None else '-'
+
+    runs = f"median of {report['repeat']} run{'s' if report['repeat'] != 1 else ''}"
+    if report['warmup']:
+        runs += f" after {report['warmup']} warmup{'s' if report['warmup'] != 1 else ''}"
+    lines = [f"Benchmark against {report['reference']}",
+             f"{runs}; time in ms, memory in MB; * marks output that differs from the reference"]
+    if report['cold']:
+        lines.append(f"each {report['cold']} run is a fresh process, so warmups do not carry over "
+                     "and times are cold")
+    lines += ["", row(['Case', 'Scale', 'Yours', 'Reference', 'Ratio', 'Yours MB', 'Ref MB'])]
+    for r in report['cases']:
+        mine, ref = r['yours'], r['reference']
+        if mine['error']:
+            yours_time = 'error'
+        else:
+            yours_time = f"{mine['median_ms']:.3f}" + ('' if mine['agrees'] else '*')
+        lines.append(row([
+            str(r['case']), f"{r['scale']:g}x", yours_time, f"{ref['median_ms']:.3f}",
+            f"{r['ratio']:.2f}x" if r['ratio'] is not None else '-',
+            memory(mine['peak_mb']), memory(ref['peak_mb']),
+        ]))
+
+    lines.append("")
+    if summary['compile_error']:
+        lines.append(f"  Compilation failed: {summary['compile_error']}")
+        return '\n'.join(lines)
+    if summary['time_ratio'] is not None:
+        lines.append(f"  {speed_verdict(summary['time_ratio'])} (geometric mean over cases)")
+    if summary['memory_ratio'] is not None:
+        lines.append(f"  Peak memory: {summary['memory_ratio']:.1f}x the reference's")
+    if summary['growth_yours'] is not None and summary['growth_reference'] is not None:
+        lines.append(f"  Growth with input size: yours ~n^{summary['growth_yours']:.1f}, "
+                     f"reference ~n^{summary['growth_reference']:.1f}")
+    errors = [r for r in report['cases'] if r['yours']['error']]
+    for r in errors:
+        lines.append(f"  Case {r['case']} at {r['scale']:g}x: {r['yours']['error']}")
+    if any(not r['yours']['agrees'] and not r['yours']['error'] for r in report['cases']):
+        lines.append("  Your output differs from the reference on the cases marked *")
+    return '\n'.join(lines)
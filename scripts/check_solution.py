@@ -8,6 +8,11 @@ Automatically selects the appropriate language runner based on file extension.
 Usage (from terminal, no Claude needed):
     leetvibe-submit 002
     leetvibe-submit ./path/to/solution.py
+    leetvibe-submit 002 --json --stream   # NDJSON events for editor integrations
+    leetvibe-submit 002 --python pypy3    # run a Python solution under PyPy
+    leetvibe-submit 002 --compare-interpreters
+    leetvibe-submit 002 --no-cache        # re-run cases with a cached verdict
+    leetvibe-submit 002 --bench           # time against the reference solution
 
 Or directly:
     python check_solution.py <quiz_id>
@@ -15,9 +20,9 @@ Or directly:
 """
 
 import argparse
+import hashlib
 import json
 import os
-import re
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -25,28 +30,19 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from runners.base_runner import RunResult
-from runners.python_runner import PythonRunner
-from runners.typescript_runner import TypeScriptRunner
-from runners.cpp_runner import CppRunner
-from runners.swift_runner import SwiftRunner
-from runners.kotlin_runner import KotlinRunner
-
-
-# Map file extensions to runners
-RUNNER_MAP = {
-    '.py': PythonRunner,
-    '.ts': TypeScriptRunner,
-    '.tsx': TypeScriptRunner,
-    '.js': TypeScriptRunner,
-    '.jsx': TypeScriptRunner,
-    '.cpp': CppRunner,
-    '.cc': CppRunner,
-    '.cxx': CppRunner,
-    '.swift': SwiftRunner,
-    '.kt': KotlinRunner,
-    '.kts': KotlinRunner,
-}
+import metrics
+from generators import (
+    expand_input, generator_spec, get_cache_dir, is_generated,
+    load_cached, save_cached, spec_hash,
+)
+from project_config import load_project_config
+from quiz_manifest import record_submission
+import result_cache
+from runners import registry
+from runners.base_runner import RunResult, TestResult
+from testcase_store import (
+    find_function_name, get_tests_dir, load_test_cases, parse_solution_comments,
+)
 
 
 def get_leetvibe_dir() -> Path:
@@ -102,86 +98,408 @@ def find_solution_file(quiz_id: str) -> Path | None:
     if not solutions_dir.exists():
         return None
 
-    # Look for any file matching the quiz ID prefix
-    for ext in RUNNER_MAP.keys():
-        candidates = list(solutions_dir.glob(f'{quiz_id}-*{ext}'))
-        if candidates:
-            return candidates[0]
+    # Look for a file matching the quiz ID prefix that some runner handles,
+    # preferring built-in languages in registry order
+    candidates = sorted(solutions_dir.glob(f'{quiz_id}-*'))
+    builtin = registry.builtin_extensions()
+    for ext in builtin:
+        for candidate in candidates:
+            if candidate.suffix.lower() == ext:
+                return candidate
+    for candidate in candidates:
+        if candidate.suffix.lower() not in builtin and registry.is_supported(candidate.name):
+            return candidate
 
     return None
 
 
 def parse_test_cases_from_solution(solution_path: Path) -> dict | None:
-    """Extract test cases from comments in solution file.
+    """Load the test cases for a solution file.
 
-    Test cases are embedded as comments like:
+    Test cases are read from the sidecar file .leetvibe/tests/{id}.jsonl when
+    it exists. Otherwise they are extracted from comments in the solution:
     # TEST:001:{"input": [1], "expected": 1}
     // TEST:001:{"input": [1], "expected": 1}
+    # COMPARATOR:001:"unordered"     (optional, see runners/comparators.py)
     """
-    content = solution_path.read_text()
-
     # Extract quiz ID from filename
     quiz_id = solution_path.stem.split('-')[0]
 
-    # Find all test case comments
-    # Match both # and // comment styles
-    pattern = rf'(?:#|//)\s*TEST:{quiz_id}:(\{{.*?\}})'
-    matches = re.findall(pattern, content)
+    tests_dir = get_tests_dir(solution_path.parent.parent)
+    test_cases = load_test_cases(tests_dir, quiz_id)
+    if test_cases and test_cases['test_cases']:
+        if 'function_name' not in test_cases:
+            test_cases['function_name'] = find_function_name(solution_path.read_text())
+        return test_cases
+
+    # Fall back to TEST comments in the solution file
+    return parse_solution_comments(solution_path.read_text(), quiz_id)
+
+
+def find_reference_solution(solution_path: Path) -> Path | None:
+    """Find the hidden reference solution stored beside the quiz, if any.
+
+    Reference solutions live in .leetvibe/reference/ under the same filename
+    as the user's solution file.
+    """
+    reference_path = solution_path.parent.parent / 'reference' / solution_path.name
+    return reference_path if reference_path.exists() else None
+
+
+def expand_generated_cases(solution_path: Path, test_cases: dict) -> str | None:
+    """Expand generator specs in test_cases in place.
 
-    if not matches:
+    Inputs are cached by spec hash. Missing expected values are computed by
+    running the reference solution and cached by (spec, reference) hash.
+    Each expanded case gets a 'spec_key' naming its spec and the source of
+    its expected value, which keys its cached verdict (see result_cache.py).
+
+    Returns:
+        An error message if a case could not be expanded, otherwise None
+    """
+    cases = test_cases['test_cases']
+    generated = [i for i, tc in enumerate(cases) if is_generated(tc)]
+    if not generated:
         return None
 
-    test_cases = []
-    for match in matches:
+    cache_dir = get_cache_dir(get_leetvibe_dir())
+    reference_path = find_reference_solution(solution_path)
+    reference_hash = None
+    if reference_path:
+        reference_hash = hashlib.sha256(reference_path.read_bytes()).hexdigest()
+
+    needs_reference = []
+    for i in generated:
+        tc = cases[i]
+        expanded = {k: v for k, v in tc.items() if k not in ('generate', 'seed')}
         try:
-            tc = json.loads(match)
-            test_cases.append(tc)
-        except json.JSONDecodeError:
-            pass
+            expanded['input'] = expand_input(tc, cache_dir)
+        except (ValueError, TypeError) as e:
+            return f"Test case {i + 1}: invalid generator spec: {e}"
+
+        if 'expected' in tc:
+            expanded['spec_key'] = spec_hash([generator_spec(tc), tc['expected']])
+        else:
+            if not reference_path:
+                return (f"Test case {i + 1} has no expected value and no reference "
+                        f"solution was found at .leetvibe/reference/{solution_path.name}")
+            expanded['spec_key'] = spec_hash([generator_spec(tc), reference_hash])
+            key = expanded['spec_key'] + '.expected'
+            cached = load_cached(cache_dir, key)
+            if cached is not None:
+                expanded['expected'] = cached['expected']
+            else:
+                needs_reference.append((i, key))
+        cases[i] = expanded
+
+    if needs_reference:
+        reference_cases = {
+            'function_name': test_cases['function_name'],
+            'test_cases': [{'input': cases[i]['input'], 'expected': None}
+                           for i, _ in needs_reference],
+        }
+        result = run_solution(reference_path, reference_cases,
+                              options={'echo_actual': True})
+        if result.compile_error:
+            return f"Reference solution failed to compile: {result.compile_error}"
+        for (i, key), ref_result in zip(needs_reference, result.results):
+            if ref_result.error:
+                return f"Reference solution failed on test case {i + 1}: {ref_result.error}"
+            cases[i]['expected'] = ref_result.actual
+            save_cached(cache_dir, key, {'expected': ref_result.actual})
 
-    if not test_cases:
-        return None
+    return None
 
-    # Extract function name from the solution
-    # Look for def func_name( or function func_name( or func func_name(
-    func_pattern = r'(?:def|function|func|fun)\s+(\w+)\s*\('
-    func_match = re.search(func_pattern, content)
-    function_name = func_match.group(1) if func_match else "solve"
 
-    return {
-        "function_name": function_name,
-        "test_cases": test_cases
-    }
+def execution_options(spec: registry.RunnerSpec, test_cases: dict, options: dict = None) -> dict:
+    """Runner options with the execution strategy the runner's capabilities allow.
+
+    Runners whose cases are independent processes run several at once,
+    unless the caller chose jobs or a warm worker. Batch harnesses that
+    speak the binary wire format get it for large batches.
+    """
+    options = dict(options or {})
+    if 'jobs' not in options and not options.get('worker'):
+        options['jobs'] = registry.parallel_jobs(spec, len(test_cases.get('test_cases', [])))
+    options.setdefault('binary_wire', spec.supports(registry.BINARY_WIRE))
+    return options
 
 
-def run_solution(solution_path: Path, test_cases: dict) -> RunResult:
-    """Run the solution with the appropriate runner."""
-    ext = solution_path.suffix.lower()
+def run_solution(solution_path: Path, test_cases: dict, on_result=None,
+                 options: dict = None) -> RunResult:
+    """Run the solution with the appropriate runner.
 
-    if ext not in RUNNER_MAP:
+    If on_result is given it is called with (index, TestResult) as each
+    test case completes. options are passed through to the runner.
+    """
+    spec = registry.find_runner(solution_path.suffix)
+    if spec is None:
         # Return error result
         return RunResult(
             total=0,
             passed=0,
             failed=0,
             results=[],
-            compile_error=f"Unsupported file extension: {ext}"
+            compile_error=f"Unsupported file extension: {solution_path.suffix.lower()}"
         )
 
-    runner_class = RUNNER_MAP[ext]
-    runner = runner_class(solution_path, test_cases)
+    runner = registry.load_runner_class(spec)(solution_path, test_cases,
+                                              execution_options(spec, test_cases, options))
+
+    try:
+        with metrics.span('run', language=runner.language):
+            return runner.run_all_tests(on_result=on_result)
+    finally:
+        runner.cleanup()
+
 
+def run_solution_cached(solution_path: Path, test_cases: dict, on_result=None,
+                        options: dict = None) -> tuple[RunResult, int]:
+    """Like run_solution, but reuse cached verdicts for cases already run.
+
+    Cached results are reported through on_result first; only the remaining
+    cases are run. Returns the combined RunResult (cases in their original
+    order) and the number of cases taken from the cache.
+    """
+    spec = registry.find_runner(solution_path.suffix)
+    if spec is None:
+        return run_solution(solution_path, test_cases, on_result, options), 0
+
+    runner = registry.load_runner_class(spec)(solution_path, test_cases,
+                                              execution_options(spec, test_cases, options))
     try:
-        return runner.run_all_tests()
+        if runner.config_error:
+            return run_solution(solution_path, test_cases, on_result, options), 0
+        key = result_cache.run_key(solution_path, runner)
     finally:
         runner.cleanup()
 
+    leetvibe_dir = get_leetvibe_dir()
+    verdicts = result_cache.load(leetvibe_dir, solution_path, key)
+    cases = test_cases['test_cases']
+    case_keys = [result_cache.case_key(tc) for tc in cases]
+
+    results = [None] * len(cases)
+    misses = []
+    for i, tc in enumerate(cases):
+        if case_keys[i] in verdicts:
+            results[i] = result_cache.from_verdict(verdicts[case_keys[i]], tc)
+            if on_result:
+                on_result(i, results[i])
+        else:
+            misses.append(i)
+    cached = len(cases) - len(misses)
+
+    if misses:
+        remaining = {**test_cases, 'test_cases': [cases[i] for i in misses]}
+        forward = (lambda j, r: on_result(misses[j], r)) if on_result else None
+        fresh = run_solution(solution_path, remaining, forward, options)
+        if fresh.compile_error:
+            return RunResult(total=len(cases), passed=0, failed=len(cases), results=[],
+                             compile_error=fresh.compile_error), 0
+        for j, result in enumerate(fresh.results):
+            results[misses[j]] = result
+
+    fresh_verdicts = {}
+    for case_key, result in zip(case_keys, results):
+        verdict = result_cache.to_verdict(result)
+        if verdict is not None:
+            fresh_verdicts[case_key] = verdict
+    if misses or fresh_verdicts.keys() != verdicts.keys():
+        result_cache.save(leetvibe_dir, solution_path, key, fresh_verdicts)
+
+    passed = sum(1 for r in results if r.passed)
+    return RunResult(total=len(cases), passed=passed, failed=len(cases) - passed,
+                     results=results), cached
+
+
+def compare_interpreters(solution_path: Path, test_cases: dict,
+                         interpreters: list[tuple[str, str]]) -> list[dict]:
+    """Run a Python solution under each (interpreter, version label).
+
+    Returns one entry per interpreter with its version label and RunResult.
+    """
+    comparison = []
+    for interpreter, version in interpreters:
+        result = run_solution(solution_path, test_cases, options={'python': interpreter})
+        comparison.append({'interpreter': interpreter, 'version': version, 'result': result})
+    return comparison
+
+
+def format_interpreter_comparison(comparison: list[dict], total: int) -> str:
+    """Render per-case timings side by side, one column per interpreter."""
+    headers = [c['version'] for c in comparison]
+    widths = [max(len(h), 10) for h in headers]
+
+    def row(label: str, cells: list[str]) -> str:
+        return f"  {label:<7}" + ''.join(f"  {cell:>{w}}" for cell, w in zip(cells, widths))
+
+    label_width = max(len(h) for h in headers)
+    lines = ["Interpreters:"]
+    lines += [f"  {c['version']:<{label_width}}  {c['interpreter']}" for c in comparison]
+    lines += ["", "Per-case time (ms); * marks a failed case", "", row('Case', headers)]
+    for i in range(total):
+        cells = []
+        for c in comparison:
+            results = c['result'].results
+            if i >= len(results):
+                cells.append('-')
+                continue
+            r = results[i]
+            cells.append(f"{r.execution_time_ms:.3f}" + ('' if r.passed else '*'))
+        lines.append(row(str(i + 1), cells))
+
+    totals = []
+    for c in comparison:
+        result = c['result']
+        if result.compile_error:
+            totals.append('error')
+        else:
+            totals.append(f"{sum(r.execution_time_ms for r in result.results):.3f}")
+    lines.append(row('Total', totals))
+    lines.append(row('Passed', [f"{c['result'].passed}/{c['result'].total}" for c in comparison]))
+
+    for c in comparison:
+        if c['result'].compile_error:
+            lines.append(f"\n  {c['interpreter']}: {c['result'].compile_error}")
+    return '\n'.join(lines)
+
+
+def result_to_dict(result: TestResult) -> dict:
+    """Convert a single test result to its JSON output form.
+
+    A failing case's spilled output is read back here, one case at a time.
+    Large passing outputs are reported by digest only.
+    """
+    output = {
+        'passed': result.passed,
+        'input': result.input_data,
+        'expected': result.expected,
+        'actual': result.full_actual(),
+        'error': result.error,
+        'mismatch': result.mismatch,
+        'time_ms': result.execution_time_ms,
+        'verdict': result.verdict,
+    }
+    if result.peak_mb is not None:
+        output['peak_mb'] = result.peak_mb
+    if result.actual_digest:
+        output['actual_sha256'] = result.actual_digest
+    return output
+
+
+def write_json_report(summary: dict, results: list[TestResult], stream=None) -> None:
+    """Write the --json report, encoding one result at a time.
+
+    Only one case's output is held in encoded form at once, instead of
+    building the whole document in memory.
+    """
+    stream = stream or sys.stdout
+    stream.write('{\n')
+    for key, value in summary.items():
+        stream.write(f'  {json.dumps(key)}: {json.dumps(value)},\n')
+    stream.write('  "results": [')
+    for i, result in enumerate(results):
+        stream.write(',\n    ' if i else '\n    ')
+        stream.write(json.dumps(result_to_dict(result), default=repr))
+    stream.write('\n  ]\n}\n' if results else ']\n}\n')
+    stream.flush()
+
+
+def emit_event(event: str, **fields) -> None:
+    """Write one NDJSON event line to stdout and flush it immediately."""
+    print(json.dumps({'event': event, **fields}), flush=True)
+
+
+class ProgressLine:
+    """Single-line live progress display, rewritten in place on a terminal."""
+
+    def __init__(self, total: int, stream=None):
+        self.total = total
+        self.stream = stream or sys.stdout
+        self.passed = 0
+        self.done = 0
+        self.enabled = self.stream.isatty()
+
+    def update(self, index: int, result: TestResult) -> None:
+        self.done += 1
+        if result.passed:
+            self.passed += 1
+        if not self.enabled:
+            return
+        failed = self.done - self.passed
+        self.stream.write(
+            f"\r  Running tests: {self.done}/{self.total}"
+            f"  ({self.passed} passed, {failed} failed)"
+        )
+        self.stream.flush()
+
+    def clear(self) -> None:
+        if self.enabled and self.done:
+            self.stream.write("\r\033[K")
+            self.stream.flush()
+
+
+def run_bench(solution_path: Path, test_cases: dict, args, config: dict) -> None:
+    """Handle --bench: benchmark against the reference solution and exit."""
+    import bench
+
+    reference_path = find_reference_solution(solution_path)
+    if not reference_path:
+        print(f"Error: No reference solution at .leetvibe/reference/{solution_path.name}",
+              file=sys.stderr)
+        sys.exit(1)
+    repeat = bench.DEFAULT_REPEAT if args.repeat is None else args.repeat
+    warmup = bench.DEFAULT_WARMUP if args.warmup is None else args.warmup
+    if repeat < 1 or warmup < 0:
+        print("Error: --repeat must be at least 1 and --warmup at least 0", file=sys.stderr)
+        sys.exit(1)
+    try:
+        scales = bench.parse_scales(args.scale) if args.scale else list(bench.DEFAULT_SCALES)
+        report = bench.run_benchmark(solution_path, reference_path, test_cases, scales,
+                                     warmup, repeat, {'python': args.python or config.get('python')})
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        filename_parts = solution_path.stem.split('-', 1)
+        concept = filename_parts[1] if len(filename_parts) > 1 else "unknown"
+        print(f"\n  LeetVibe Quiz {filename_parts[0]}: {concept.replace('_', ' ').title()}")
+        print(f"  {'=' * 50}\n")
+        print(bench.format_benchmark(report))
+        print()
+    summary = report['summary']
+    sys.exit(0 if summary['all_agree'] and not summary['compile_error'] else 1)
+
 
 def main():
     parser = argparse.ArgumentParser(description='Check LeetVibe solution')
     parser.add_argument('target', help='Quiz ID (e.g., 001) or path to solution file')
     parser.add_argument('--json', action='store_true', help='Output as JSON')
+    parser.add_argument('--stream', action='store_true',
+                        help='With --json, emit one NDJSON event per test case as it completes')
+    parser.add_argument('--python', metavar='INTERPRETER',
+                        help='Interpreter for Python solutions (e.g. pypy3, python3.12)')
+    parser.add_argument('--compare-interpreters', action='store_true',
+                        help='Run a Python solution under each available interpreter and '
+                             'compare per-case timings (progress is not recorded)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Re-run every case instead of reusing cached verdicts')
+    parser.add_argument('--bench', action='store_true',
+                        help='Compare speed and memory with the reference solution on '
+                             'scaled inputs (progress is not recorded)')
+    parser.add_argument('--repeat', type=int, metavar='N',
+                        help='With --bench, timed runs per input (default 5)')
+    parser.add_argument('--warmup', type=int, metavar='N',
+                        help='With --bench, untimed runs per input first (default 1)')
+    parser.add_argument('--scale', metavar='FACTORS',
+                        help='With --bench, comma-separated size factors for generated '
+                             'cases (default 1,4)')
     args = parser.parse_args()
+    config = load_project_config(get_leetvibe_dir())
 
     # Determine if target is a quiz ID or file path
     target_path = Path(args.target)
@@ -201,12 +519,21 @@ def main():
             print(f"Check .leetvibe/solutions/ for available quizzes", file=sys.stderr)
             sys.exit(1)
 
-    # Parse test cases from solution file comments
+    # Load test cases (sidecar file, falling back to solution file comments)
     test_cases = parse_test_cases_from_solution(solution_path)
 
     if not test_cases:
         print(f"Error: Could not parse test cases from {solution_path}", file=sys.stderr)
-        print(f"Test cases should be in comments like: # TEST:001:{{...}}", file=sys.stderr)
+        print(f"Test cases should be in .leetvibe/tests/{{id}}.jsonl or in comments like: # TEST:001:{{...}}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.bench:
+        run_bench(solution_path, test_cases, args, config)
+
+    # Expand generator specs (stress cases) into concrete inputs
+    expand_error = expand_generated_cases(solution_path, test_cases)
+    if expand_error:
+        print(f"Error: {expand_error}", file=sys.stderr)
         sys.exit(1)
 
     # Extract quiz ID and concept from filename
@@ -214,46 +541,91 @@ def main():
     quiz_id = filename_parts[0]
     concept = filename_parts[1] if len(filename_parts) > 1 else "unknown"
 
-    # Run the solution
-    print(f"\n  LeetVibe Quiz {quiz_id}: {concept.replace('_', ' ').title()}")
-    print(f"  {'=' * 50}\n")
+    total = len(test_cases['test_cases'])
 
-    result = run_solution(solution_path, test_cases)
+    if args.compare_interpreters:
+        if solution_path.suffix.lower() != '.py':
+            print("Error: --compare-interpreters only applies to Python solutions", file=sys.stderr)
+            sys.exit(1)
+        from runners.python_runner import find_interpreters
+        interpreters = find_interpreters(config.get('python_interpreters'))
+        if not interpreters:
+            print("Error: No Python interpreters found", file=sys.stderr)
+            sys.exit(1)
+        comparison = compare_interpreters(solution_path, test_cases, interpreters)
+        if args.json:
+            print(json.dumps({'interpreters': [{
+                'interpreter': c['interpreter'],
+                'version': c['version'],
+                'passed': c['result'].passed,
+                'total': c['result'].total,
+                'compile_error': c['result'].compile_error,
+                'times_ms': [r.execution_time_ms for r in c['result'].results],
+            } for c in comparison]}, indent=2))
+        else:
+            print(f"\n  LeetVibe Quiz {quiz_id}: {concept.replace('_', ' ').title()}")
+            print(f"  {'=' * 50}\n")
+            print(format_interpreter_comparison(comparison, total))
+            print()
+        sys.exit(0 if all(c['result'].all_passed for c in comparison) else 1)
+
+    # Run the solution, reusing cached verdicts unless asked not to
+    options = {'python': args.python or config.get('python')}
+
+    def run(on_result=None):
+        if args.no_cache:
+            return run_solution(solution_path, test_cases, on_result=on_result, options=options), 0
+        return run_solution_cached(solution_path, test_cases, on_result=on_result, options=options)
+
+    if args.json and args.stream:
+        emit_event('start', quiz_id=quiz_id, concept=concept, total=total)
+        result, cached = run(lambda index, r: emit_event('case', index=index, **result_to_dict(r)))
+    elif args.json:
+        result, cached = run()
+    else:
+        print(f"\n  LeetVibe Quiz {quiz_id}: {concept.replace('_', ' ').title()}")
+        print(f"  {'=' * 50}\n")
+        progress = ProgressLine(total)
+        result, cached = run(progress.update)
+        progress.clear()
+
+    summary = {
+        'total': result.total,
+        'passed': result.passed,
+        'failed': result.failed,
+        'score': result.score,
+        'all_passed': result.all_passed,
+        'compile_error': result.compile_error,
+        'cached': cached,
+    }
 
-    if args.json:
-        output = {
-            'total': result.total,
-            'passed': result.passed,
-            'failed': result.failed,
-            'score': result.score,
-            'all_passed': result.all_passed,
-            'compile_error': result.compile_error,
-            'results': [
-                {
-                    'passed': r.passed,
-                    'input': r.input_data,
-                    'expected': r.expected,
-                    'actual': r.actual,
-                    'error': r.error,
-                    'time_ms': r.execution_time_ms
-                }
-                for r in result.results
-            ]
-        }
-        print(json.dumps(output, indent=2))
+    if args.json and args.stream:
+        emit_event('end', **summary)
+    elif args.json:
+        write_json_report(summary, result.results)
     else:
         # Get the runner to format results
-        ext = solution_path.suffix.lower()
-        runner_class = RUNNER_MAP.get(ext, PythonRunner)
+        # Formatting is shared by all runners; unsupported files fall back to Python's
+        spec = registry.find_runner(solution_path.suffix) or registry.RUNNERS['python']
+        runner_class = registry.load_runner_class(spec)
         runner = runner_class(solution_path, test_cases)
         print(runner.format_results(result))
+        if cached:
+            print(f"\n  ({cached} of {result.total} cases reused from cache; --no-cache to re-run)")
+
+    # Record the attempt in the project's quiz manifest
+    if solution_path.parent.name == 'solutions' and not result.compile_error:
+        total_time = sum(r.execution_time_ms for r in result.results)
+        record_submission(solution_path.parent.parent.absolute(), solution_path,
+                          result.score, result.all_passed, total_time)
 
     # If all tests passed, mark as complete
     if result.all_passed:
         mark_quiz_complete(quiz_id, concept, result.score)
-        print(f"\n  [COMPLETE] Quiz {quiz_id} marked as done!")
-        print(f"  Progress saved to ~/.leetvibe/learning-history.json\n")
-    else:
+        if not args.json:
+            print(f"\n  [COMPLETE] Quiz {quiz_id} marked as done!")
+            print(f"  Progress saved to ~/.leetvibe/learning-history.json\n")
+    elif not args.json:
         print(f"\n  [INCOMPLETE] {result.failed} test(s) failed. Keep trying!\n")
 
     # Exit with appropriate code
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Randomized Testing for LeetVibe
+
+Runs a quiz solution and the quiz's hidden reference solution
+(.leetvibe/reference/{same filename}) on random inputs until they disagree,
+to catch the off-by-one bugs a handful of hand-written cases miss:
+
+    leetvibe fuzz 003
+
+Inputs come from the quiz's own generator specs (its generated test cases,
+see generators.py), redrawn with a fresh seed and small random sizes for
+every case. Cases are handed out in chunks to one worker per core: Python
+solutions run in warm workers (see PythonRunner), batch runners run a whole
+chunk in one harness process. Inputs the reference rejects (it raises) are
+taken to be outside the problem's constraints and skipped.
+
+At the first divergence the input is shrunk, first by regenerating it with
+smaller sizes and then by dropping array elements, keeping each step that
+still diverges, and the smallest failing input is reported with the seed
+that reproduces it. The run ends after --time seconds (or --cases cases)
+and reports throughput and how busy the workers were.
+
+Fuzzing does not record progress.
+
+Usage:
+    python fuzz.py <quiz_id | solution_file> [--time SECONDS] [--cases N] [--seed N]
+                   [--max-size N] [--jobs N] [--batch N] [--python INTERPRETER] [--json]
+"""
+
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from check_solution import (
+    find_reference_solution, find_solution_file, get_leetvibe_dir,
+    parse_test_cases_from_solution,
+)
+from generators import SIZE_FIELDS, generate_input, is_generated
+import metrics
+from project_config import load_project_config
+from runners import registry
+from runners.base_runner import TestResult, preview
+
+# Defaults for a run: wall-clock budget, largest size drawn, cases per chunk
+DEFAULT_SECONDS = 10.0
+DEFAULT_MAX_SIZE = 12
+DEFAULT_BATCH = 64
+
+# Argument types whose elements can be dropped without breaking the
+# generator's guarantees (sortedness, uniqueness, rectangular rows)
+REMOVABLE_TYPES = ('int_array', 'sorted_array', 'float_array', 'string', 'string_array', 'matrix')
+
+# Most candidates tried per shrinking pass
+MAX_SHRINK_CANDIDATES = 512
+
+
+def fuzz_templates(test_cases: dict) -> list[dict]:
+    """The quiz's generated test cases, whose specs random inputs are drawn from."""
+    return [tc for tc in test_cases['test_cases'] if is_generated(tc)]
+
+
+def fuzz_case(templates: list[dict], seed: int, max_size: int) -> dict:
+    """
+    The generated test case for one seed: a random template with every size
+    field redrawn between 1 and max_size (or the template's own size, if
+    smaller), expanded with the same seed.
+    """
+    rng = random.Random(seed)
+    template = templates[rng.randrange(len(templates))]
+    specs = []
+    for arg_spec in template['generate']:
+        resized = dict(arg_spec)
+        for name, default in SIZE_FIELDS.get(arg_spec.get('type'), {}).items():
+            resized[name] = rng.randint(1, max(1, min(max_size, arg_spec.get(name, default))))
+        if arg_spec.get('type') == 'graph' and 'edges' in arg_spec:
+            resized['edges'] = rng.randint(0, 2 * resized['nodes'])
+        specs.append(resized)
+    return {'generate': specs, 'seed': seed}
+
+
+class RunnerPair:
+    """
+    The solution and the reference, each compiled once, running chunk after
+    chunk of cases. Runners with the warm_worker capability get their own
+    warm worker, shared by both. fork() gives another thread a pair of its
+    own on the same build.
+    """
+
+    def __init__(self, solution_path: Path, reference_path: Path, test_cases: dict, options: dict):
+        spec = registry.find_runner(solution_path.suffix)
+        if spec is None:
+            raise ValueError(f"Unsupported file extension: {solution_path.suffix.lower()}")
+        self.worker = None
+        options = {**options, 'jobs': 1, 'echo_actual': True}
+        if spec.supports(registry.WARM_WORKER):
+            from runners.python_runner import DEFAULT_INTERPRETER, WarmPythonWorker
+            self.worker = WarmPythonWorker(options.get('python') or DEFAULT_INTERPRETER)
+            options['worker'] = self.worker
+
+        # One side after the other: the second build reuses the first's
+        # precompiled header instead of racing it into the cache
+        self.runners = []
+        try:
+            for label, path in (('Reference solution', reference_path), ('Your solution', solution_path)):
+                runner = registry.load_runner_class(spec)(path, test_cases, options)
+                self.runners.append(runner)
+                compiled, error = (False, runner.config_error) if runner.config_error else runner.compile()
+                if not compiled:
+                    raise ValueError(f"{label} failed to compile: {error}")
+        except BaseException:
+            self.close()
+            raise
+        self.reference, self.solution = self.runners
+
+    def fork(self) -> 'RunnerPair':
+        """A pair for another thread, running this pair's build with its own warm worker."""
+        pair = copy.copy(self)
+        overrides = {}
+        if self.worker:
+            from runners.python_runner import WarmPythonWorker
+            pair.worker = overrides['worker'] = WarmPythonWorker(self.worker.interpreter)
+        pair.runners = [runner.fork(**overrides) for runner in self.runners]
+        pair.reference, pair.solution = pair.runners
+        return pair
+
+    def run(self, inputs: list[list]) -> list[tuple[TestResult, TestResult | None]]:
+        """
+        Run the reference on inputs, then the solution on the inputs the
+        reference accepted, checked against the reference's outputs.
+
+        Returns one (reference result, solution result) per input; the
+        solution result is None when the reference rejected the input.
+        """
+        references = self.reference.run_cases([{'input': args, 'expected': None} for args in inputs])
+        accepted = [k for k, r in enumerate(references) if not r.error]
+        results = self.solution.run_cases([{'input': inputs[k], 'expected': references[k].actual}
+                                           for k in accepted])
+        pairs = [(r, None) for r in references]
+        for k, result in zip(accepted, results):
+            pairs[k] = (references[k], result)
+        return pairs
+
+    def close(self) -> None:
+        for runner in self.runners:
+            runner.cleanup()
+        if self.worker:
+            self.worker.close()
+
+
+def open_pairs(solution_path: Path, reference_path: Path, test_cases: dict, options: dict,
+               jobs: int) -> list[RunnerPair]:
+    """
+    One RunnerPair per worker thread. Each side is compiled once; the
+    other pairs are forks that only start their own harness processes.
+    """
+    first = RunnerPair(solution_path, reference_path, test_cases, options)
+    return [first] + [first.fork() for _ in range(jobs - 1)]
+
+
+def _first_divergence(pair: RunnerPair, candidates: list) -> tuple[int, TestResult, TestResult] | None:
+    """(index, reference result, solution result) of the first candidate input that diverges."""
+    if not candidates:
+        return None
+    for k, (reference, result) in enumerate(pair.run(candidates)):
+        if result is not None and not result.passed:
+            return k, reference, result
+    return None
+
+
+def _smaller_specs(case: dict) -> list[tuple[dict, list]]:
+    """The case regenerated with one size field made smaller, smallest first."""
+    candidates = []
+    for i, arg_spec in enumerate(case['generate']):
+        for name, default in SIZE_FIELDS.get(arg_spec.get('type'), {}).items():
+            size = arg_spec.get(name, default)
+            for smaller in sorted({1, 2, size // 4, size // 2, size - 1}):
+                if not 1 <= smaller < size:
+                    continue
+                specs = [dict(s) for s in case['generate']]
+                specs[i][name] = smaller
+                candidate = {**case, 'generate': specs}
+                try:
+                    candidates.append((candidate, generate_input(candidate)))
+                except (ValueError, TypeError):
+                    continue
+    return candidates
+
+
+def _smaller_inputs(case: dict, args: list) -> list[list]:
+    """The input with a run of elements dropped from one array argument, biggest runs first."""
+    candidates = []
+    for i, arg_spec in enumerate(case['generate']):
+        if arg_spec.get('type') not in REMOVABLE_TYPES or i >= len(args):
+            continue
+        value = args[i]
+        if not isinstance(value, (list, str)):
+            continue
+        chunk = len(value) // 2
+        while chunk >= 1:
+            for start in range(0, len(value), chunk):
+                smaller = list(args)
+                smaller[i] = value[:start] + value[start + chunk:]
+                candidates.append(smaller)
+            chunk //= 2
+    return candidates[:MAX_SHRINK_CANDIDATES]
+
+
+def shrink(pair: RunnerPair, case: dict, args: list) -> dict:
+    """
+    Shrink a diverging input: regenerate it with smaller sizes while it still
+    diverges, then drop array elements while it still diverges. Each pass
+    runs all of its candidates as one chunk and keeps the first that diverges.
+
+    Returns {'input', 'reference', 'result', 'steps'} for the smallest input found.
+    """
+    found = _first_divergence(pair, [args])
+    if found is None:
+        # Flaky: the solution agreed on a re-run
+        return {'input': args, 'reference': None, 'result': None, 'steps': 0}
+    _, reference, result = found
+    steps = 0
+
+    while True:
+        candidates = _smaller_specs(case)
+        found = _first_divergence(pair, [candidate_args for _, candidate_args in candidates])
+        if found is None:
+            break
+        k, reference, result = found
+        case, args = candidates[k]
+        steps += 1
+
+    while True:
+        candidates = _smaller_inputs(case, args)
+        found = _first_divergence(pair, candidates)
+        if found is None:
+            break
+        k, reference, result = found
+        args = candidates[k]
+        steps += 1
+
+    return {'input': args, 'reference': reference, 'result': result, 'steps': steps}
+
+
+def fuzz(pairs: list[RunnerPair], test_cases: dict, seed: int,
+         max_seconds: float | None = DEFAULT_SECONDS, max_cases: int | None = None,
+         max_size: int = DEFAULT_MAX_SIZE, batch: int = DEFAULT_BATCH, on_progress=None) -> dict:
+    """
+    Fuzz until the first divergence, max_seconds or max_cases. Case n uses
+    seed + n. Each of pairs is driven by its own worker thread.
+    on_progress, if given, is called with (cases checked, seconds elapsed).
+
+    Returns a report with 'cases', 'rejected', 'seconds', 'cases_per_sec',
+    'workers', 'utilization' (fraction of worker time spent running cases)
+    and 'divergence' (None, or the failing case before shrinking).
+
+    Raises:
+        ValueError: if the quiz has no generator specs
+    """
+    templates = fuzz_templates(test_cases)
+    if not templates:
+        raise ValueError("The quiz has no generated test cases to draw random inputs from")
+
+    lock = threading.Lock()
+    stop = threading.Event()
+    state = {'next': 0, 'checked': 0, 'rejected': 0, 'busy': 0.0}
+    divergences = []
+    start = time.monotonic()
+
+    def claim() -> range | None:
+        with lock:
+            if stop.is_set() or (max_seconds is not None and time.monotonic() - start >= max_seconds):
+                return None
+            first = state['next']
+            count = batch if max_cases is None else min(batch, max_cases - first)
+            if count <= 0:
+                return None
+            state['next'] += count
+            return range(first, first + count)
+
+    def work(pair: RunnerPair) -> None:
+        try:
+            while (indices := claim()) is not None:
+                cases, rejected = [], 0
+                for index in indices:
+                    case = fuzz_case(templates, seed + index, max_size)
+                    try:
+                        cases.append((index, case, generate_input(case)))
+                    except (ValueError, TypeError):
+                        rejected += 1
+
+                busy_start = time.perf_counter()
+                outcomes = pair.run([args for _, _, args in cases])
+                busy = time.perf_counter() - busy_start
+
+                checked = rejected
+                for (index, case, args), (_, result) in zip(cases, outcomes):
+                    checked += 1
+                    if result is None:
+                        rejected += 1
+                    elif not result.passed:
+                        with lock:
+                            divergences.append((index, case, args))
+                        stop.set()
+                        break
+                with lock:
+                    state['checked'] += checked
+                    state['rejected'] += rejected
+                    state['busy'] += busy
+                    checked_total = state['checked']
+                if on_progress:
+                    on_progress(checked_total, time.monotonic() - start)
+        except BaseException:
+            stop.set()
+            raise
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(pairs)) as pool:
+            futures = [pool.submit(work, pair) for pair in pairs]
+            for future in futures:
+                future.result()
+    except KeyboardInterrupt:
+        stop.set()
+
+    seconds = time.monotonic() - start
+    divergence = None
+    if divergences:
+        index, case, args = min(divergences, key=lambda d: d[0])
+        divergence = {'seed': seed + index, 'case': case, 'input': args}
+    return {
+        'seed': seed,
+        'max_size': max_size,
+        'cases': state['checked'],
+        'rejected': state['rejected'],
+        'seconds': seconds,
+        'cases_per_sec': state['checked'] / seconds if seconds > 0 else 0.0,
+        'workers': len(pairs),
+        'utilization': min(1.0, state['busy'] / (seconds * len(pairs))) if seconds > 0 else 0.0,
+        'divergence': divergence,
+    }
+
+
+def print_progress(cases: int, seconds: float) -> None:
+    """Overwrite the terminal line with the running case count and rate."""
+    rate = cases / seconds if seconds > 0 else 0.0
+    sys.stdout.write(f"\r  {cases:,} cases  ({rate:,.0f} cases/sec)\033[K")
+    sys.stdout.flush()
+
+
+def format_report(report: dict, quiz_id: str) -> str:
+    """Render a fuzz report: throughput, then the shrunk divergence if any."""
+    workers = f"{report['workers']} worker{'s' if report['workers'] != 1 else ''}"
+    throughput = (f"{report['cases']:,} cases in {report['seconds']:.1f} s "
+                  f"({report['cases_per_sec']:,.0f} cases/sec, {workers} {report['utilization']:.0%} busy)")
+    lines = []
+    divergence = report['divergence']
+    if divergence is None:
+        lines.append(f"  No divergence from the reference: {throughput}")
+    else:
+        lines.append(f"  Divergence from the reference after {throughput}")
+    if report['rejected']:
+        lines.append(f"  {report['rejected']:,} inputs were skipped because the reference rejected them")
+    if divergence is None:
+        return '\n'.join(lines)
+
+    shrunk = divergence.get('shrunk') or {}
+    lines += ["", f"  Input:     {preview(shrunk.get('input', divergence['input']))}"]
+    if shrunk.get('steps'):
+        original = sum(len(arg) for arg in divergence['input'] if isinstance(arg, (list, str)))
+        lines[-1] += f"   (shrunk in {shrunk['steps']} steps from size {original})"
+    reference, result = shrunk.get('reference'), shrunk.get('result')
+    if reference is not None and result is not None:
+        lines.append(f"  Reference: {preview(reference.actual)}")
+        if result.error:
+            lines.append(f"  Error:     {result.error.strip().splitlines()[-1]}")
+        else:
+            lines.append(f"  Yours:     {preview(result.actual)}")
+            if result.mismatch:
+                lines.append(f"  Mismatch:  {result.mismatch}")
+    else:
+        lines.append("  (the solution agreed with the reference when the input was re-run)")
+    reproduce = f"leetvibe fuzz {quiz_id} --seed {divergence['seed']} --cases 1"
+    if report['max_size'] != DEFAULT_MAX_SIZE:
+        reproduce += f" --max-size {report['max_size']}"
+    lines.append(f"  Reproduce: {reproduce}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fuzz a LeetVibe solution against its reference')
+    parser.add_argument('target', help='Quiz ID (e.g., 001) or path to solution file')
+    parser.add_argument('--time', type=float, metavar='SECONDS',
+                        help=f'Stop after this many seconds (default {DEFAULT_SECONDS:g}, '
+                             f'or no limit with --cases)')
+    parser.add_argument('--cases', type=int, metavar='N', help='Stop after this many cases')
+    parser.add_argument('--seed', type=int, help='Seed of the first case (default: random)')
+    parser.add_argument('--max-size', type=int, default=DEFAULT_MAX_SIZE, metavar='N',
+                        help=f'Largest array, string, tree or graph size drawn (default {DEFAULT_MAX_SIZE})')
+    parser.add_argument('--jobs', type=int, metavar='N', help='Worker threads (default: one per core)')
+    parser.add_argument('--batch', type=int, default=DEFAULT_BATCH, metavar='N',
+                        help=f'Cases per chunk handed to a worker (default {DEFAULT_BATCH})')
+    parser.add_argument('--python', metavar='INTERPRETER',
+                        help='Interpreter for Python solutions (e.g. pypy3, python3.12)')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+    config = load_project_config(get_leetvibe_dir())
+
+    # Thousands of fuzz cases would swamp the submit timings in `leetvibe perf`
+    os.environ[metrics.METRICS_ENV] = '0'
+
+    solution_path = Path(args.target)
+    if not solution_path.exists():
+        quiz_id = f"{int(args.target):03d}" if args.target.isdigit() else args.target
+        solution_path = find_solution_file(quiz_id)
+        if not solution_path:
+            print(f"Error: No solution file found for quiz {quiz_id}", file=sys.stderr)
+            sys.exit(1)
+
+    reference_path = find_reference_solution(solution_path)
+    if not reference_path:
+        print(f"Error: No reference solution at .leetvibe/reference/{solution_path.name}",
+              file=sys.stderr)
+        sys.exit(1)
+    test_cases = parse_test_cases_from_solution(solution_path)
+    if not test_cases:
+        print(f"Error: Could not parse test cases from {solution_path}", file=sys.stderr)
+        sys.exit(1)
+    if not fuzz_templates(test_cases):
+        print("Error: The quiz has no generated test cases to draw random inputs from",
+              file=sys.stderr)
+        sys.exit(1)
+    if args.batch < 1 or args.max_size < 1 or (args.jobs is not None and args.jobs < 1):
+        print("Error: --batch, --max-size and --jobs must be at least 1", file=sys.stderr)
+        sys.exit(1)
+
+    seed = args.seed if args.seed is not None else random.randrange(1 << 31)
+    jobs = args.jobs or os.cpu_count() or 1
+    on_progress = print_progress if not args.json and sys.stdout.isatty() else None
+    if not args.json:
+        filename_parts = solution_path.stem.split('-', 1)
+        concept = filename_parts[1] if len(filename_parts) > 1 else "unknown"
+        print(f"\n  LeetVibe Quiz {filename_parts[0]}: {concept.replace('_', ' ').title()}")
+        print(f"  {'=' * 50}\n")
+        print(f"  Fuzzing against {reference_path} (seed {seed}, {jobs} worker{'s' if jobs != 1 else ''})\n")
+
+    pairs = []
+    try:
+        pairs = open_pairs(solution_path, reference_path, test_cases,
+                           {'python': args.python or config.get('python')}, jobs)
+        report = fuzz(pairs, test_cases, seed,
+                      max_seconds=args.time if args.time is not None or args.cases else DEFAULT_SECONDS,
+                      max_cases=args.cases, max_size=args.max_size, batch=args.batch,
+                      on_progress=on_progress)
+        if on_progress:
+            sys.stdout.write("\r\033[K")
+        divergence = report['divergence']
+        if divergence:
+            divergence['shrunk'] = shrink(pairs[0], divergence['case'], divergence['input'])
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        for pair in pairs:
+            pair.close()
+
+    if args.json:
+        if divergence:
+            shrunk = divergence.pop('shrunk')
+            reference, result = shrunk['reference'], shrunk['result']
+            divergence['shrunk'] = {
+                'input': shrunk['input'],
+                'steps': shrunk['steps'],
+                'expected': reference.actual if reference else None,
+                'actual': result.actual if result else None,
+                'error': result.error if result else None,
+                'mismatch': result.mismatch if result else None,
+            }
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_report(report, solution_path.stem.split('-', 1)[0]))
+        print()
+    sys.exit(1 if report['divergence'] else 0)
+
+
+if __name__ == '__main__':
+    main()
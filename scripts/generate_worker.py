@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Quiz Generation Worker for LeetVibe
+
+Drains .leetvibe/pending/ without a Claude session: pending requests are
+grouped by language, batched several concepts per model call, and generated
+with bounded concurrency. Failed requests are retried with exponential
+backoff. Solution files are written atomically and their test cases are
+imported into the sidecar store, then the pending request is removed.
+
+Backends are pluggable: a backend is a callable taking a list of pending
+requests and returning {quiz_id: {"solution": str, "reference": str | None}}
+for the requests it managed to generate. Built-in backends:
+
+    claude   generate with the `claude` CLI (default)
+    stub     deterministic placeholder quiz, no model call (for tests)
+
+Any other value is imported as "module:function".
+
+Usage:
+    python generate_worker.py [--backend claude] [--jobs 4] [--batch-size 3]
+                              [--retries 3] [--no-bank] [--json]
+"""
+
+import argparse
+import importlib
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+import quiz_bank
+from pending_queue import CLAIM_SUFFIX, list_pending
+from quiz_bank import fulfill_from_bank, solution_filename, write_quiz
+from runners.registry import LANGUAGE_EXTENSIONS
+
+# Claims older than this (seconds) belong to a dead worker and are reclaimed
+CLAIM_TIMEOUT_SECONDS = 600
+
+# Model call timeout (seconds)
+GENERATE_TIMEOUT_SECONDS = 300
+
+# Backoff before retry n is RETRY_BASE_DELAY * 2**n seconds, plus jitter
+RETRY_BASE_DELAY = 1.0
+
+# Authoring guidelines shared with the /leetvibe:generate command
+GENERATE_COMMAND_PATH = Path(__file__).parent.parent / 'commands' / 'generate.md'
+
+Backend = Callable[[list[dict]], dict]
+
+BACKENDS: dict[str, Backend] = {}
+
+
+def register_backend(name: str):
+    """Decorator registering a generation backend under a name."""
+    def decorator(func):
+        BACKENDS[name] = func
+        return func
+    return decorator
+
+
+def get_leetvibe_dir() -> Path:
+    """Get the .leetvibe directory in the current project."""
+    cwd = os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd())
+    return Path(cwd) / '.leetvibe'
+
+
+def get_backend(name: str) -> Backend:
+    """Look up a registered backend, or import one given as "module:function"."""
+    if name in BACKENDS:
+        return BACKENDS[name]
+    if ':' not in name:
+        raise ValueError(f"Unknown backend: {name}")
+    module_name, attr = name.split(':', 1)
+    return getattr(importlib.import_module(module_name), attr)
+
+
+# ---------------------------------------------------------------- backends
+
+def _authoring_guidelines() -> str:
+    """The quiz format sections of commands/generate.md."""
+    try:
+        text = GENERATE_COMMAND_PATH.read_text()
+    except IOError:
+        return ''
+    start = text.find('## Quiz Generation Guidelines')
+    end = text.find('## Output\n')
+    return text[start:end].strip() if start != -1 else ''
+
+
+def build_prompt(requests: list[dict]) -> str:
+    """Prompt asking for one quiz per request, all in the same language."""
+    sections = []
+    for request in requests:
+        sections.append(f"""### Quiz {request['quiz_id']}: {request['concept']}
+Language: {request.get('language', 'python')}
+Solution file: {solution_filename(request)}
+Source that used the concept ({request.get('source_file', 'unknown')}):
+```
+{request.get('source_code', '')}
+```""")
+
+    return f"""Generate {len(requests)} LeetVibe quiz(zes). For each request below,
+analyze how the concept was used, then write a SIMILAR but ISOLATED
+LeetCode-style problem as a complete solution file in the request's language.
+
+{_authoring_guidelines()}
+
+{chr(10).join(sections)}
+
+Return ONLY a JSON array with one object per quiz:
+[{{"quiz_id": "007", "solution": "<full solution file>", "reference": "<full reference solution, or null>"}}]
+Include "reference" when some test case omits "expected", is generated, or has a
+"max_ms" or "max_mb" limit (`leetvibe submit --bench` and `leetvibe fuzz` test the user
+against it); otherwise use null."""
+
+
+def _parse_quiz_array(response: str) -> dict:
+    """Extract {quiz_id: quiz} from the JSON array in a model response."""
+    start = response.find('[')
+    end = response.rfind(']') + 1
+    if start == -1 or end <= start:
+        return {}
+    try:
+        quizzes = json.loads(response[start:end])
+    except json.JSONDecodeError:
+        return {}
+    return {
+        str(q['quiz_id']): {'solution': q['solution'], 'reference': q.get('reference')}
+        for q in quizzes
+        if isinstance(q, dict) and q.get('quiz_id') and isinstance(q.get('solution'), str)
+    }
+
+
+@register_backend('claude')
+def claude_backend(requests: list[dict]) -> dict:
+    """Generate a batch of quizzes with one `claude` CLI call."""
+    result = subprocess.run(
+        ['claude', '-p', build_prompt(requests), '--output-format', 'text'],
+        capture_output=True,
+        text=True,
+        timeout=GENERATE_TIMEOUT_SECONDS,
+        cwd=os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd())
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"claude exited with {result.returncode}")
+    return _parse_quiz_array(result.stdout)
+
+
+# Placeholder quiz (sum of a list) per language, used by the stub backend
+STUB_TEMPLATES = {
+    '.py': '''"""
+LEETVIBE QUIZ {quiz_id}: {title}
+
+PROBLEM:
+Return the sum of the numbers in the list.
+
+When ready, run: /leetvibe:submit {quiz_id}
+"""
+
+# TEST:{quiz_id}:{{"input": [[1, 2, 3]], "expected": 6}}
+# TEST:{quiz_id}:{{"input": [[]], "expected": 0}}
+
+def solve(nums: list) -> int:
+    pass
+''',
+    '.ts': '''/*
+ * LEETVIBE QUIZ {quiz_id}: {title}
+ *
+ * PROBLEM:
+ * Return the sum of the numbers in the array.
+ */
+
+// TEST:{quiz_id}:{{"input": [[1, 2, 3]], "expected": 6}}
+// TEST:{quiz_id}:{{"input": [[]], "expected": 0}}
+
+function solve(nums: number[]): number {{
+    return 0;
+}}
+''',
+    '.js': '''/*
+ * LEETVIBE QUIZ {quiz_id}: {title}
+ *
+ * PROBLEM:
+ * Return the sum of the numbers in the array.
+ */
+
+// TEST:{quiz_id}:{{"input": [[1, 2, 3]], "expected": 6}}
+// TEST:{quiz_id}:{{"input": [[]], "expected": 0}}
+
+function solve(nums) {{
+    return 0;
+}}
+''',
+    '.cpp': '''/*
+ * LEETVIBE QUIZ {quiz_id}: {title}
+ *
+ * PROBLEM:
+ * Return the sum of the numbers in the vector.
+ */
+
+// TEST:{quiz_id}:{{"input": [[1, 2, 3]], "expected": 6}}
+// TEST:{quiz_id}:{{"input": [[]], "expected": 0}}
+
+int solve(vector<int>& nums) {{
+    return 0;
+}}
+''',
+    '.swift': '''/*
+ * LEETVIBE QUIZ {quiz_id}: {title}
+ *
+ * PROBLEM:
+ * Return the sum of the numbers in the array.
+ */
+
+// TEST:{quiz_id}:{{"input": [[1, 2, 3]], "expected": 6}}
+// TEST:{quiz_id}:{{"input": [[]], "expected": 0}}
+
+func solve(_ nums: [Int]) -> Int {{
+    return 0
+}}
+''',
+    '.kt': '''/*
+ * LEETVIBE QUIZ {quiz_id}: {title}
+ *
+ * PROBLEM:
+ * Return the sum of the numbers in the list.
+ */
+
+// TEST:{quiz_id}:{{"input": [[1, 2, 3]], "expected": 6}}
+// TEST:{quiz_id}:{{"input": [[]], "expected": 0}}
+
+fun solve(nums: List<Int>): Int {{
+    return 0
+}}
+''',
+}
+
+
+@register_backend('stub')
+def stub_backend(requests: list[dict]) -> dict:
+    """Deterministic placeholder quizzes, no model call."""
+    quizzes = {}
+    for request in requests:
+        ext = LANGUAGE_EXTENSIONS.get(request.get('language'), '.py')
+        title = request['concept'].replace('_', ' ').title()
+        quizzes[request['quiz_id']] = {
+            'solution': STUB_TEMPLATES[ext].format(quiz_id=request['quiz_id'], title=title),
+            'reference': None,
+        }
+    return quizzes
+
+
+# Placeholder quizzes must never be served from the bank
+stub_backend.bankable = False
+
+
+# ---------------------------------------------------------------- queue
+
+def claim_pending(pending_dir: Path) -> list[tuple[Path, dict]]:
+    """
+    Claim every pending request, in queue priority order, by renaming it to
+    *.json.working, so concurrent workers never generate the same quiz.
+    Stale claims left by a worker that died are taken over.
+    """
+    claimed = []
+    now = time.time()
+    rank = {entry['file']: i for i, entry in enumerate(list_pending(pending_dir.parent))}
+    candidates = list(pending_dir.glob('*.json')) + list(pending_dir.glob(f'*.json{CLAIM_SUFFIX}'))
+    request_name = lambda p: p.name[:-len(CLAIM_SUFFIX)] if p.name.endswith(CLAIM_SUFFIX) else p.name
+    candidates.sort(key=lambda p: (rank.get(request_name(p), len(rank)), p.name))
+    for path in candidates:
+        if path.name.endswith(CLAIM_SUFFIX):
+            try:
+                if now - path.stat().st_mtime < CLAIM_TIMEOUT_SECONDS:
+                    continue
+            except FileNotFoundError:
+                continue
+            claim_path = path
+            os.utime(claim_path)
+        else:
+            claim_path = path.with_name(path.name + CLAIM_SUFFIX)
+            try:
+                os.rename(path, claim_path)
+            except FileNotFoundError:
+                continue  # another worker got it first
+        try:
+            with open(claim_path, 'r') as f:
+                request = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            release_claim(claim_path)
+            continue
+        claimed.append((claim_path, request))
+    return claimed
+
+
+def release_claim(claim_path: Path) -> None:
+    """Return a claimed request to the pending queue."""
+    try:
+        os.rename(claim_path, claim_path.with_name(claim_path.name[:-len(CLAIM_SUFFIX)]))
+    except FileNotFoundError:
+        pass
+
+
+def make_batches(claimed: list[tuple[Path, dict]], batch_size: int) -> list[list[tuple[Path, dict]]]:
+    """
+    Group claimed requests by language into batches of at most batch_size,
+    keeping queue order within a language.
+    """
+    by_language = {}
+    for item in claimed:
+        by_language.setdefault(item[1].get('language', 'python'), []).append(item)
+
+    batches = []
+    for items in by_language.values():
+        for i in range(0, len(items), batch_size):
+            batches.append(items[i:i + batch_size])
+    return batches
+
+
+def process_batch(leetvibe_dir: Path, backend: Backend, batch: list[tuple[Path, dict]],
+                  retries: int, use_bank: bool = True) -> list[dict]:
+    """
+    Generate one batch, retrying the requests that are still missing with
+    exponential backoff. Returns one outcome dict per request.
+    """
+    use_bank = use_bank and getattr(backend, 'bankable', True)
+    remaining = list(batch)
+    outcomes = []
+    errors = {}
+
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(RETRY_BASE_DELAY * 2 ** (attempt - 1) * (1 + random.random()))
+        try:
+            quizzes = backend([request for _, request in remaining])
+        except Exception as e:
+            for _, request in remaining:
+                errors[request['quiz_id']] = str(e) or type(e).__name__
+            continue
+
+        still_missing = []
+        for claim_path, request in remaining:
+            quiz = quizzes.get(request['quiz_id'])
+            if quiz is None:
+                errors[request['quiz_id']] = "backend returned no quiz"
+                still_missing.append((claim_path, request))
+                continue
+            try:
+                solution_path = write_quiz(leetvibe_dir, request, quiz)
+            except (ValueError, OSError) as e:
+                errors[request['quiz_id']] = str(e)
+                still_missing.append((claim_path, request))
+                continue
+            if use_bank:
+                quiz_bank.deposit(request['concept'], request.get('language', 'python'),
+                                  request['quiz_id'], quiz['solution'], quiz.get('reference'),
+                                  request.get('difficulty'))
+            claim_path.unlink(missing_ok=True)
+            outcomes.append({'quiz_id': request['quiz_id'], 'concept': request['concept'],
+                             'file': str(solution_path), 'source': 'generated', 'error': None})
+        remaining = still_missing
+        if not remaining:
+            break
+
+    for claim_path, request in remaining:
+        release_claim(claim_path)
+        outcomes.append({'quiz_id': request['quiz_id'], 'concept': request['concept'],
+                         'file': None, 'source': None, 'error': errors.get(request['quiz_id'])})
+    return outcomes
+
+
+def drain_pending(leetvibe_dir: Path, backend: Backend, jobs: int = 4,
+                  batch_size: int = 3, retries: int = 3, use_bank: bool = True) -> list[dict]:
+    """
+    Fulfil every pending request, from the quiz bank when possible and by
+    generation otherwise; returns one outcome per request.
+    """
+    pending_dir = leetvibe_dir / 'pending'
+    if not pending_dir.exists():
+        return []
+
+    outcomes = []
+    to_generate = []
+    for claim_path, request in claim_pending(pending_dir):
+        solution_path = fulfill_from_bank(leetvibe_dir, request) if use_bank else None
+        if solution_path:
+            claim_path.unlink(missing_ok=True)
+            outcomes.append({'quiz_id': request['quiz_id'], 'concept': request['concept'],
+                             'file': str(solution_path), 'source': 'bank', 'error': None})
+        else:
+            to_generate.append((claim_path, request))
+
+    batches = make_batches(to_generate, max(1, batch_size))
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = [pool.submit(process_batch, leetvibe_dir, backend, batch, retries, use_bank)
+                   for batch in batches]
+        for future in as_completed(futures):
+            outcomes.extend(future.result())
+    return sorted(outcomes, key=lambda o: o['quiz_id'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate LeetVibe quizzes for pending requests')
+    parser.add_argument('--backend', default='claude',
+                        help='Backend name (claude, stub) or module:function')
+    parser.add_argument('--jobs', type=int, default=4, help='Concurrent backend calls')
+    parser.add_argument('--batch-size', type=int, default=3,
+                        help='Concepts (same language) generated per backend call')
+    parser.add_argument('--retries', type=int, default=3, help='Retries per request')
+    parser.add_argument('--no-bank', action='store_true',
+                        help='Always generate; do not use or fill the global quiz bank')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+
+    try:
+        backend = get_backend(args.backend)
+    except (ValueError, ImportError, AttributeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    outcomes = drain_pending(get_leetvibe_dir(), backend, args.jobs, args.batch_size,
+                             args.retries, use_bank=not args.no_bank)
+    failed = [o for o in outcomes if o['error']]
+
+    if args.json:
+        print(json.dumps(outcomes, indent=2))
+    elif not outcomes:
+        print("No pending quiz requests found.")
+    else:
+        print("\nGenerated Quizzes")
+        print("=================\n")
+        for outcome in outcomes:
+            title = outcome['concept'].replace('_', ' ').title()
+            print(f"[{outcome['quiz_id']}] {title}")
+            if outcome['error']:
+                print(f"     Failed: {outcome['error']} (left in .leetvibe/pending/)")
+            else:
+                origin = " (from quiz bank)" if outcome['source'] == 'bank' else ""
+                print(f"     File: {outcome['file']}{origin}")
+        print(f"\n{len(outcomes) - len(failed)} quizzes generated.", end='')
+        print(f" {len(failed)} failed." if failed else '')
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
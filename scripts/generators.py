@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Test Case Generators for LeetVibe
+
+Expands generator specs declared in TEST comments into concrete inputs, so
+quizzes can carry large stress cases without pasting them into the solution
+file the user edits.
+
+A generated test case looks like:
+    # TEST:001:{"generate": [{"type": "int_array", "size": 100000, "min": -1000, "max": 1000}, {"type": "int", "min": 0, "max": 50}], "seed": 7}
+
+Each entry in "generate" produces one positional argument. Expansion is
+deterministic for a given spec (including its seed), so expanded inputs are
+cached on disk by spec hash. If the case has no "expected" value, it is
+computed by running the quiz's reference solution, when one is provided.
+"""
+
+import hashlib
+import json
+import random
+import string
+from pathlib import Path
+from typing import Any, Callable
+
+# Default seed when a spec does not declare one
+DEFAULT_SEED = 0
+
+
+def _int(rng: random.Random, spec: dict) -> int:
+    return rng.randint(spec.get('min', 0), spec.get('max', 100))
+
+
+def _float(rng: random.Random, spec: dict) -> float:
+    value = rng.uniform(spec.get('min', 0.0), spec.get('max', 1.0))
+    digits = spec.get('digits')
+    return round(value, digits) if digits is not None else value
+
+
+def _int_array(rng: random.Random, spec: dict) -> list[int]:
+    size = spec.get('size', 10)
+    low, high = spec.get('min', 0), spec.get('max', 100)
+    if spec.get('unique'):
+        if high - low + 1 < size:
+            raise ValueError(f"Range [{low}, {high}] too small for {size} unique values")
+        values = rng.sample(range(low, high + 1), size)
+    else:
+        values = [rng.randint(low, high) for _ in range(size)]
+    if spec.get('sorted'):
+        values.sort(reverse=spec.get('descending', False))
+    return values
+
+
+def _sorted_array(rng: random.Random, spec: dict) -> list[int]:
+    return _int_array(rng, {**spec, 'sorted': True})
+
+
+def _float_array(rng: random.Random, spec: dict) -> list[float]:
+    values = [_float(rng, spec) for _ in range(spec.get('size', 10))]
+    if spec.get('sorted'):
+        values.sort()
+    return values
+
+
+def _string(rng: random.Random, spec: dict) -> str:
+    alphabet = spec.get('alphabet', string.ascii_lowercase)
+    return ''.join(rng.choice(alphabet) for _ in range(spec.get('size', 10)))
+
+
+def _string_array(rng: random.Random, spec: dict) -> list[str]:
+    item = {**spec, 'size': spec.get('length', 5)}
+    return [_string(rng, item) for _ in range(spec.get('size', 10))]
+
+
+def _matrix(rng: random.Random, spec: dict) -> list[list[int]]:
+    row = {**spec, 'size': spec.get('cols', 10)}
+    return [_int_array(rng, row) for _ in range(spec.get('rows', 10))]
+
+
+def _tree(rng: random.Random, spec: dict) -> list[int | None]:
+    """Random binary tree in LeetCode level-order form (None for gaps)."""
+    size = spec.get('size', 10)
+    if size == 0:
+        return []
+    low, high = spec.get('min', 0), spec.get('max', 100)
+
+    # Grow the tree by attaching each new node to a random free child slot
+    children: list[list[int | None]] = [[None, None]]
+    free_slots = [(0, 0), (0, 1)]
+    for node in range(1, size):
+        slot = rng.randrange(len(free_slots))
+        free_slots[slot], free_slots[-1] = free_slots[-1], free_slots[slot]
+        parent, side = free_slots.pop()
+        children[parent][side] = node
+        children.append([None, None])
+        free_slots.extend([(node, 0), (node, 1)])
+
+    values = [rng.randint(low, high) for _ in range(size)]
+    if spec.get('bst'):
+        # In-order traversal receives the sorted values
+        ordered = sorted(values)
+        stack, node, position = [], 0, 0
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = children[node][0]
+            node = stack.pop()
+            values[node] = ordered[position]
+            position += 1
+            node = children[node][1]
+
+    # Serialize breadth-first, then drop trailing gaps
+    output: list[int | None] = []
+    queue: list[int | None] = [0]
+    for node in queue:
+        if node is None:
+            output.append(None)
+            continue
+        output.append(values[node])
+        queue.extend(children[node])
+    while output and output[-1] is None:
+        output.pop()
+    return output
+
+
+def _graph(rng: random.Random, spec: dict) -> list[list[int]]:
+    """Random edge list over nodes 0..n-1."""
+    nodes = spec.get('nodes', 10)
+    directed = spec.get('directed', False)
+    weighted = spec.get('weighted', False)
+    low, high = spec.get('min_weight', 1), spec.get('max_weight', 100)
+
+    edges: set[tuple[int, int]] = set()
+    if spec.get('connected', True) and nodes > 1:
+        # Random spanning tree first so every node is reachable
+        order = list(range(nodes))
+        rng.shuffle(order)
+        for i in range(1, nodes):
+            edges.add((order[rng.randrange(i)], order[i]))
+
+    max_edges = nodes * (nodes - 1) // (1 if directed else 2)
+    target = min(spec.get('edges', nodes), max_edges)
+    while len(edges) < target:
+        u, v = rng.randrange(nodes), rng.randrange(nodes)
+        if u == v:
+            continue
+        if not directed and ((v, u) in edges):
+            continue
+        edges.add((u, v))
+
+    result = [[u, v] for u, v in sorted(edges)]
+    if weighted:
+        for edge in result:
+            edge.append(rng.randint(low, high))
+    return result
+
+
+def _constant(rng: random.Random, spec: dict) -> Any:
+    return spec.get('value')
+
+
+GENERATORS: dict[str, Callable[[random.Random, dict], Any]] = {
+    'int': _int,
+    'float': _float,
+    'int_array': _int_array,
+    'sorted_array': _sorted_array,
+    'float_array': _float_array,
+    'string': _string,
+    'string_array': _string_array,
+    'matrix': _matrix,
+    'tree': _tree,
+    'graph': _graph,
+    'constant': _constant,
+}
+
+
+# Size fields of each generator type and their defaults, scaled by scale_case
+SIZE_FIELDS: dict[str, dict[str, int]] = {
+    'int_array': {'size': 10},
+    'sorted_array': {'size': 10},
+    'float_array': {'size': 10},
+    'string': {'size': 10},
+    'string_array': {'size': 10},
+    'matrix': {'rows': 10, 'cols': 10},
+    'tree': {'size': 10},
+    'graph': {'nodes': 10},
+}
+
+
+def is_generated(test_case: dict) -> bool:
+    """Check whether a test case is a generator spec rather than literal input."""
+    return 'generate' in test_case and 'input' not in test_case
+
+
+def spec_hash(spec: Any) -> str:
+    """Stable hash of a generator spec (or any JSON value)."""
+    canonical = json.dumps(spec, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def generate_input(test_case: dict) -> list:
+    """Expand a generated test case into its positional argument list."""
+    rng = random.Random(test_case.get('seed', DEFAULT_SEED))
+    args = []
+    for arg_spec in test_case['generate']:
+        kind = arg_spec.get('type')
+        if kind not in GENERATORS:
+            raise ValueError(f"Unknown generator type: {kind}")
+        args.append(GENERATORS[kind](rng, arg_spec))
+    return args
+
+
+def scale_case(test_case: dict, factor: float) -> dict:
+    """
+    A copy of a generated test case with each argument's size multiplied by
+    factor. Matrices grow by sqrt(factor) per side and graphs keep their
+    edge-to-node ratio, so every argument holds about factor times the data.
+    Scalar arguments (int, float, constant) are left alone.
+    """
+    scaled_specs = []
+    for arg_spec in test_case['generate']:
+        fields = SIZE_FIELDS.get(arg_spec.get('type'), {})
+        per_field = factor ** 0.5 if len(fields) == 2 else factor
+        scaled = dict(arg_spec)
+        for name, default in fields.items():
+            scaled[name] = max(1, round(arg_spec.get(name, default) * per_field))
+        if arg_spec.get('type') == 'graph' and 'edges' in arg_spec:
+            scaled['edges'] = max(1, round(arg_spec['edges'] * factor))
+        scaled_specs.append(scaled)
+    return {**test_case, 'generate': scaled_specs}
+
+
+def get_cache_dir(leetvibe_dir: Path) -> Path:
+    """Directory holding expanded generator output."""
+    return leetvibe_dir / 'cache' / 'generated'
+
+
+def load_cached(cache_dir: Path, key: str) -> Any:
+    """Load a cached value, or None if it is missing or unreadable."""
+    path = cache_dir / f'{key}.json'
+    if path.exists():
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            pass
+    return None
+
+
+def save_cached(cache_dir: Path, key: str, value: Any) -> None:
+    """Write a cached value atomically."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f'{key}.json'
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(value, f, separators=(',', ':'))
+    tmp_path.replace(path)
+
+
+def generator_spec(test_case: dict) -> dict:
+    """The part of a generated test case that determines its input."""
+    return {'generate': test_case['generate'], 'seed': test_case.get('seed', DEFAULT_SEED)}
+
+
+def expand_input(test_case: dict, cache_dir: Path) -> list:
+    """Expand a generated test case's input, using the on-disk cache."""
+    key = spec_hash(generator_spec(test_case))
+    cached = load_cached(cache_dir, key)
+    if cached is not None:
+        return cached
+    args = generate_input(test_case)
+    save_cached(cache_dir, key, args)
+    return args
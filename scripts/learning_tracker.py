@@ -137,27 +137,17 @@ def get_pending_quizzes() -> list[dict]:
 
 
 def get_available_quizzes() -> list[dict]:
-    """Get list of generated quizzes."""
-    leetvibe_dir = get_leetvibe_dir()
-    quizzes_dir = leetvibe_dir / 'quizzes'
-
-    if not quizzes_dir.exists():
-        return []
-
-    quizzes = []
-    for quiz_file in sorted(quizzes_dir.glob('*.md')):
-        quiz_id = quiz_file.stem.split('-')[0]
-        concept = '-'.join(quiz_file.stem.split('-')[1:])
-
-        # Check if solution exists
-        solutions_dir = leetvibe_dir / 'solutions'
-        solution_exists = any(solutions_dir.glob(f'{quiz_id}-*')) if solutions_dir.exists() else False
-
-        quizzes.append({
-            'id': quiz_id,
-            'concept': concept,
-            'file': str(quiz_file),
-            'solution_exists': solution_exists,
-        })
-
-    return quizzes
+    """Get list of generated quizzes (from the quiz manifest)."""
+    from quiz_manifest import load_manifest
+
+    manifest = load_manifest(get_leetvibe_dir())
+    return [
+        {
+            'id': quiz['id'],
+            'concept': quiz['concept'],
+            'file': str(get_leetvibe_dir() / 'solutions' / quiz['file']),
+            'status': quiz['status'],
+            'best_score': quiz['best_score'],
+        }
+        for quiz in sorted(manifest['quizzes'].values(), key=lambda q: q['id'])
+    ]
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+LeetVibe Command Line Interface
+
+Single entry point behind the `leetvibe` command. Each subcommand lives in
+its own module, which is imported only when that subcommand runs, so
+`leetvibe list` and shell completion never load the language runners and
+`leetvibe submit` loads only the runner for the solution's language.
+
+This module itself imports nothing beyond os and sys at startup; see
+`leetvibe self-check` for the measured startup budget.
+
+Usage:
+    leetvibe submit <id> [--json] [--stream] [--python INTERPRETER] [--compare-interpreters]
+                    [--bench [--repeat N] [--warmup N] [--scale FACTORS]]
+    leetvibe watch <id> [--python INTERPRETER]
+    leetvibe fuzz <id> [--time SECONDS] [--cases N] [--seed N] [--max-size N] [--jobs N] [--json]
+    leetvibe list [--json] [--all]
+    leetvibe stats [--json] [--all]
+    leetvibe skip <id>
+    leetvibe pending [--json]
+    leetvibe generate [--backend NAME] [--jobs N] [--batch-size N] [--retries N] [--no-bank] [--json]
+    leetvibe bank [--json]
+    leetvibe projects [--json]
+    leetvibe perf [--json] [--since HOURS] [--prometheus PATH]
+    leetvibe analyzer [--json] | leetvibe analyzer reset
+    leetvibe completion bash|zsh
+    leetvibe self-check [--budget MS] [--runs N]
+
+Shell completion:
+    eval "$(leetvibe completion bash)"     # in ~/.bashrc
+    eval "$(leetvibe completion zsh)"      # in ~/.zshrc
+"""
+
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Add parent directory to path for imports
+sys.path.insert(0, SCRIPTS_DIR)
+
+# name: (module, leading args, aliases, flags, help)
+COMMANDS = {
+    'submit': ('check_solution', [], ['s'],
+               ['--json', '--stream', '--python', '--compare-interpreters', '--no-cache',
+                '--bench', '--repeat', '--warmup', '--scale'],
+               'Submit and test a quiz solution'),
+    'watch': ('watch', [], ['w'], ['--python'],
+              'Re-run a quiz\'s tests on every save'),
+    'fuzz': ('fuzz', [], [], ['--time', '--cases', '--seed', '--max-size', '--jobs', '--batch',
+                              '--python', '--json'],
+             'Test a quiz solution on random inputs against its reference'),
+    'list': ('quiz_manifest', ['list'], ['ls'], ['--json', '--all'],
+             'List available quizzes (--all: outstanding in every project)'),
+    'stats': ('quiz_manifest', ['stats'], [], ['--json', '--all'],
+              'Show learning progress (--all: every project)'),
+    'skip': ('quiz_manifest', ['skip'], [], [],
+             'Skip a quiz'),
+    'pending': ('pending_queue', ['list'], ['p'], ['--json'],
+                'List pending quiz requests by priority'),
+    'generate': ('generate_worker', [], ['gen'],
+                 ['--backend', '--jobs', '--batch-size', '--retries', '--no-bank', '--json'],
+                 'Generate quizzes for pending requests'),
+    'bank': ('quiz_bank', ['list'], [], ['--json'],
+             'List quizzes in the global quiz bank'),
+    'projects': ('project_registry', ['projects'], [], ['--json'],
+                 'List projects with LeetVibe quizzes'),
+    'perf': ('metrics', ['report'], [], ['--json', '--since', '--prometheus'],
+             'Show time spent per phase (p50/p95/p99)'),
+    'analyzer': ('analyzer_breaker', [], [], ['status', 'reset', '--json'],
+                 'Show or reset the concept analyzer circuit breaker'),
+    'runners': ('runners.registry', [], [], ['--json'],
+                'List language runners, their capabilities and missing tools'),
+}
+
+# Subcommands whose positional argument is a quiz ID
+QUIZ_ID_COMMANDS = ('submit', 'watch', 'fuzz', 'skip')
+
+# Commands handled here rather than by a module
+BUILTIN_COMMANDS = {
+    'completion': 'Print a shell completion script (bash or zsh)',
+    'self-check': 'Check that CLI startup stays within its time budget',
+}
+
+# Wall-clock budget for `leetvibe list`, `leetvibe help` and a completion
+# request, including interpreter startup
+STARTUP_BUDGET_MS = 150
+
+# Modules that must not be imported by the fast paths
+HEAVY_MODULE_PREFIXES = ('runners', 'check_solution', 'generate_worker', 'generators', 'bench', 'fuzz')
+
+BASH_COMPLETION = '''\
+_leetvibe() {
+    local IFS=$'\\n'
+    COMPREPLY=($(leetvibe __complete "${COMP_WORDS[@]:1:COMP_CWORD}" 2>/dev/null))
+}
+complete -o default -F _leetvibe leetvibe
+'''
+
+ZSH_COMPLETION = '''\
+_leetvibe() {
+    local -a candidates
+    candidates=("${(@f)$(leetvibe __complete "${(@)words[2,CURRENT]}" 2>/dev/null)}")
+    compadd -a candidates
+}
+compdef _leetvibe leetvibe
+'''
+
+
+def resolve_command(name: str) -> str | None:
+    """Map a subcommand name or alias to its canonical name."""
+    if name in COMMANDS or name in BUILTIN_COMMANDS:
+        return name
+    for command, (_, _, aliases, _, _) in COMMANDS.items():
+        if name in aliases:
+            return command
+    return None
+
+
+def print_help() -> None:
+    print("")
+    print("  LeetVibe - Learn while you vibe code")
+    print("")
+    print("  Usage:")
+    for name, (_, _, _, _, summary) in COMMANDS.items():
+        usage = f"{name} <id>" if name in QUIZ_ID_COMMANDS else name
+        print(f"    leetvibe {usage:<16}{summary}")
+    for name, summary in BUILTIN_COMMANDS.items():
+        print(f"    leetvibe {name:<16}{summary}")
+    print("")
+    print("  Examples:")
+    print("    leetvibe submit 002")
+    print("    leetvibe submit .leetvibe/solutions/002-memoization.ts")
+    print('    eval "$(leetvibe completion bash)"')
+    print("")
+
+
+def quiz_ids() -> list[str]:
+    """Quiz IDs in the current project, from one listing of the solutions directory."""
+    project_dir = os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd())
+    try:
+        names = os.listdir(os.path.join(project_dir, '.leetvibe', 'solutions'))
+    except OSError:
+        return []
+    return sorted({name.split('-', 1)[0] for name in names
+                   if '-' in name and not name.startswith('.')})
+
+
+def complete(words: list[str]) -> list[str]:
+    """
+    Completion candidates for the last (partial) word, given the words
+    typed after `leetvibe`.
+    """
+    current = words[-1] if words else ''
+    if len(words) <= 1:
+        candidates = list(COMMANDS) + list(BUILTIN_COMMANDS)
+    else:
+        command = resolve_command(words[0])
+        if command == 'completion':
+            candidates = ['bash', 'zsh'] if len(words) == 2 else []
+        elif command in COMMANDS:
+            candidates = list(COMMANDS[command][3])
+            if command in QUIZ_ID_COMMANDS and not current.startswith('-'):
+                positional = [w for w in words[1:-1] if not w.startswith('-')]
+                candidates = quiz_ids() if not positional else []
+        else:
+            candidates = []
+    return [c for c in candidates if c.startswith(current)]
+
+
+def print_completion(shell: str) -> None:
+    scripts = {'bash': BASH_COMPLETION, 'zsh': ZSH_COMPLETION}
+    if shell not in scripts:
+        print("Usage: leetvibe completion bash|zsh", file=sys.stderr)
+        sys.exit(1)
+    print(scripts[shell], end='')
+
+
+def measure_startup(args: list[str], runs: int) -> tuple[float, list[str]]:
+    """
+    Run the CLI in a fresh interpreter `runs` times.
+
+    Returns:
+        (median wall time in ms, heavy modules it imported)
+    """
+    import subprocess
+    import time
+
+    command = [sys.executable, os.path.abspath(__file__), *args]
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+
+    # -X importtime logs every imported module to stderr
+    traced = subprocess.run([sys.executable, '-X', 'importtime', *command[1:]],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    heavy = []
+    for line in traced.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            module = line.rsplit('|', 1)[1].strip()
+            if module.startswith(HEAVY_MODULE_PREFIXES):
+                heavy.append(module)
+    return times[len(times) // 2], heavy
+
+
+def self_check(argv: list[str]) -> None:
+    """Check the fast paths against STARTUP_BUDGET_MS; exit 1 if any is over."""
+    budget = STARTUP_BUDGET_MS
+    runs = 5
+    if '--budget' in argv:
+        budget = float(argv[argv.index('--budget') + 1])
+    if '--runs' in argv:
+        runs = max(1, int(argv[argv.index('--runs') + 1]))
+
+    probes = [
+        ('help', ['help']),
+        ('completion', ['__complete', 'submit', '']),
+        ('list', ['list']),
+    ]
+    print(f"\n  LeetVibe CLI startup (median of {runs}, budget {budget:.0f} ms)")
+    print(f"  {'=' * 50}\n")
+    ok = True
+    for label, args in probes:
+        median_ms, heavy = measure_startup(args, runs)
+        passed = median_ms <= budget and not heavy
+        ok = ok and passed
+        print(f"  [{'PASS' if passed else 'FAIL'}] {label:<12} {median_ms:7.1f} ms")
+        if heavy:
+            print(f"         imported: {', '.join(sorted(set(heavy)))}")
+    print()
+    sys.exit(0 if ok else 1)
+
+
+def main():
+    argv = sys.argv[1:]
+    name = argv[0] if argv else 'help'
+
+    if name == '__complete':
+        print('\n'.join(complete(argv[1:])))
+        return
+
+    command = resolve_command(name)
+    if command is None:
+        print_help()
+        sys.exit(0 if name in ('help', '--help', '-h') else 1)
+    if command == 'completion':
+        print_completion(argv[1] if len(argv) > 1 else '')
+        return
+    if command == 'self-check':
+        self_check(argv[1:])
+        return
+
+    import importlib
+
+    module_name, leading, _, _, _ = COMMANDS[command]
+    module = importlib.import_module(module_name)
+    sys.argv = [f'leetvibe {command}', *leading, *argv[1:]]
+    module.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Local Metrics for LeetVibe
+
+Timing spans for the PostToolUse hook and the submit pipeline, kept on this
+machine only. Spans are buffered in memory and appended to
+~/.leetvibe/metrics/spans.jsonl once per process (at exit), one line each:
+
+    {"name": "compile", "ms": 412.3, "ts": 1760000000.1, "labels": {"language": "cpp"}}
+
+Recorded spans:
+    hook            whole hook invocation          analyze    analyzer call
+    history.load    learning history read          history.save    history write
+    run             all tests of one submit        compile    compile step
+    case            one test case's execution      compare    output comparison
+
+The file is rotated when it reaches MAX_BYTES, keeping BACKUP_COUNT older
+files. Set LEETVIBE_METRICS=0 to turn recording off.
+
+Usage:
+    python metrics.py report [--json] [--since HOURS] [--prometheus PATH]
+
+--prometheus writes the report as a Prometheus textfile (for node_exporter's
+textfile collector) instead of printing it.
+"""
+
+import atexit
+import fcntl
+import json
+import math
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Environment variable that turns recording off when set to 0
+METRICS_ENV = 'LEETVIBE_METRICS'
+
+# Rotate the spans file at this size, keeping this many older files
+MAX_BYTES = 4 * 1024 * 1024
+BACKUP_COUNT = 3
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+_buffer: list[dict] = []
+_flush_registered = False
+
+
+def get_metrics_dir() -> Path:
+    """Directory holding the local metrics files."""
+    return Path.home() / '.leetvibe' / 'metrics'
+
+
+def get_spans_path() -> Path:
+    return get_metrics_dir() / 'spans.jsonl'
+
+
+def enabled() -> bool:
+    return os.environ.get(METRICS_ENV, '1') != '0'
+
+
+def record(name: str, ms: float, **labels) -> None:
+    """Record a span that has already been timed."""
+    global _flush_registered
+    if not enabled():
+        return
+    span_record = {'name': name, 'ms': round(ms, 3), 'ts': round(time.time(), 3)}
+    if labels:
+        span_record['labels'] = labels
+    _buffer.append(span_record)
+    if not _flush_registered:
+        atexit.register(flush)
+        _flush_registered = True
+
+
+@contextmanager
+def span(name: str, **labels):
+    """Time the enclosed block, including when it raises or exits."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, (time.perf_counter() - start) * 1000, **labels)
+
+
+def _rotate(spans_path: Path) -> None:
+    for n in range(BACKUP_COUNT - 1, 0, -1):
+        older = spans_path.with_name(f'{spans_path.name}.{n}')
+        if older.exists():
+            os.replace(older, spans_path.with_name(f'{spans_path.name}.{n + 1}'))
+    os.replace(spans_path, spans_path.with_name(f'{spans_path.name}.1'))
+
+
+def flush() -> None:
+    """Append buffered spans to the spans file; metrics never fail the caller."""
+    if not _buffer:
+        return
+    lines = ''.join(json.dumps(s) + '\n' for s in _buffer)
+    _buffer.clear()
+    spans_path = get_spans_path()
+    try:
+        spans_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(spans_path.with_name('spans.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                if spans_path.exists() and spans_path.stat().st_size >= MAX_BYTES:
+                    _rotate(spans_path)
+                with open(spans_path, 'a') as f:
+                    f.write(lines)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+    except OSError:
+        pass
+
+
+def load_spans(since_hours: float | None = None) -> list[dict]:
+    """Spans from the current and rotated files, oldest first."""
+    spans_path = get_spans_path()
+    paths = [spans_path.with_name(f'{spans_path.name}.{n}') for n in range(BACKUP_COUNT, 0, -1)]
+    paths.append(spans_path)
+    cutoff = time.time() - since_hours * 3600 if since_hours else 0
+    spans = []
+    for path in paths:
+        try:
+            with open(path, 'r') as f:
+                for line in f:
+                    try:
+                        span_record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # partial line from an interrupted write
+                    if span_record.get('ts', 0) >= cutoff:
+                        spans.append(span_record)
+        except FileNotFoundError:
+            continue
+    return spans
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(spans: list[dict]) -> list[dict]:
+    """Count, total and p50/p95/p99 per (span name, labels)."""
+    groups: dict[tuple, list[float]] = {}
+    for span_record in spans:
+        labels = tuple(sorted(span_record.get('labels', {}).items()))
+        groups.setdefault((span_record['name'], labels), []).append(span_record['ms'])
+
+    summaries = []
+    for (name, labels), values in sorted(groups.items()):
+        values.sort()
+        summaries.append({
+            'name': name,
+            'labels': dict(labels),
+            'count': len(values),
+            'total_ms': sum(values),
+            **{f'p{round(q * 100)}': percentile(values, q) for q in QUANTILES},
+        })
+    return summaries
+
+
+def format_prometheus(summaries: list[dict]) -> str:
+    """Render summaries in the Prometheus text exposition format."""
+    metric = 'leetvibe_phase_duration_seconds'
+    lines = [
+        f'# HELP {metric} Time spent in each LeetVibe phase, from local spans.',
+        f'# TYPE {metric} summary',
+    ]
+    for s in summaries:
+        label_pairs = [('phase', s['name'])] + sorted(s['labels'].items())
+        labels = ','.join(f'{k}="{v}"' for k, v in label_pairs)
+        for q in QUANTILES:
+            value = s[f'p{round(q * 100)}'] / 1000
+            lines.append(f'{metric}{{{labels},quantile="{q}"}} {value:.6f}')
+        lines.append(f'{metric}_sum{{{labels}}} {s["total_ms"] / 1000:.6f}')
+        lines.append(f'{metric}_count{{{labels}}} {s["count"]}')
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus(summaries: list[dict], output_path: Path) -> None:
+    """Write a textfile atomically so the collector never reads a partial file."""
+    partial = output_path.with_name(f'.{output_path.name}.{os.getpid()}.tmp')
+    with open(partial, 'w') as f:
+        f.write(format_prometheus(summaries))
+    os.replace(partial, output_path)
+
+
+def print_report(summaries: list[dict], since_hours: float | None) -> None:
+    title = "LeetVibe Performance" + (f" (last {since_hours:g}h)" if since_hours else "")
+    print(f"\n  {title}")
+    print(f"  {'=' * len(title)}\n")
+    if not summaries:
+        print("  No spans recorded yet. Edit some code or run `leetvibe submit`.\n")
+        return
+    print(f"  {'Phase':<28} {'Count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'Total s':>9}")
+    for s in summaries:
+        label = s['name'] + (f" [{', '.join(str(v) for v in s['labels'].values())}]" if s['labels'] else '')
+        print(f"  {label:<28} {s['count']:>6} {s['p50']:>9.1f} {s['p95']:>9.1f} "
+              f"{s['p99']:>9.1f} {s['total_ms'] / 1000:>9.2f}")
+    print()
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] != 'report':
+        print(__doc__.strip().split('Usage:')[1].strip(), file=sys.stderr)
+        sys.exit(1)
+
+    args = sys.argv[2:]
+    since_hours = None
+    if '--since' in args:
+        position = args.index('--since')
+        since_hours = float(args[position + 1]) if position + 1 < len(args) else None
+
+    summaries = summarize(load_spans(since_hours))
+
+    if '--prometheus' in args:
+        position = args.index('--prometheus')
+        if position + 1 >= len(args):
+            print("Usage: metrics.py report --prometheus PATH", file=sys.stderr)
+            sys.exit(1)
+        write_prometheus(summaries, Path(args[position + 1]))
+        print(f"Wrote {len(summaries)} phase summaries to {args[position + 1]}")
+    elif '--json' in args:
+        print(json.dumps(summaries, indent=2))
+    else:
+        print_report(summaries, since_hours)
+
+
+if __name__ == '__main__':
+    main()
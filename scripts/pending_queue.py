@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Pending Quiz Request Queue for LeetVibe
+
+Keeps the quiz requests in .leetvibe/pending/ deduplicated by (concept,
+language) and ordered by priority, and indexes them in
+.leetvibe/pending-queue.json so listing the queue is a single read instead
+of opening every request file.
+
+Each request stays in its own .leetvibe/pending/{id}-{concept}.json file
+(the format /leetvibe:generate and generate_worker.py consume). The index
+holds, per (concept, language):
+
+    quiz_id, concept, language, file, priority, times_seen, first_seen, last_seen
+
+Queue order: explicit priority first, then concepts seen most often, then
+most recently. Seeing a queued concept again bumps it instead of queueing a
+duplicate; a concept that already has a solution file is not queued again.
+
+The index is derived data: entries whose request file was removed (e.g. by
+/leetvibe:generate) are dropped, and request files missing from the index are
+read once and added.
+
+Usage:
+    python pending_queue.py list [--json]
+"""
+
+import fcntl
+import json
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+INDEX_FILENAME = 'pending-queue.json'
+INDEX_VERSION = 1
+
+# Pending request files may be claimed by generate_worker.py under this suffix
+CLAIM_SUFFIX = '.working'
+
+# Longest source snapshot kept with a request
+SOURCE_SNAPSHOT_CHARS = 3000
+
+
+def get_pending_dir(leetvibe_dir: Path) -> Path:
+    """Directory holding pending request files."""
+    return leetvibe_dir / 'pending'
+
+
+def get_index_path(leetvibe_dir: Path) -> Path:
+    """Path to the pending queue index."""
+    return leetvibe_dir / INDEX_FILENAME
+
+
+def queue_key(concept: str, language: str) -> str:
+    return f"{concept}:{language}"
+
+
+def sort_key(entry: dict) -> tuple:
+    """Queue order: highest priority, then most seen, then most recent first."""
+    return (-entry.get('priority', 0), -entry.get('times_seen', 1),
+            _negated(entry.get('last_seen', '')), entry['quiz_id'])
+
+
+def _negated(timestamp: str) -> tuple:
+    # ISO timestamps sort lexically; invert each character to sort descending
+    return tuple(-ord(c) for c in timestamp)
+
+
+@contextmanager
+def _locked(leetvibe_dir: Path):
+    """Serialize read-modify-write of the index across processes."""
+    leetvibe_dir.mkdir(parents=True, exist_ok=True)
+    with open(leetvibe_dir / f'{INDEX_FILENAME}.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _read_index(leetvibe_dir: Path) -> dict:
+    try:
+        with open(get_index_path(leetvibe_dir), 'r') as f:
+            index = json.load(f)
+        if index.get('version') == INDEX_VERSION:
+            return index
+    except (json.JSONDecodeError, IOError, AttributeError):
+        pass
+    return {'version': INDEX_VERSION, 'requests': {}}
+
+
+def _write_index(leetvibe_dir: Path, index: dict) -> None:
+    index_path = get_index_path(leetvibe_dir)
+    partial = index_path.with_name(f'.{index_path.name}.{os.getpid()}.tmp')
+    with open(partial, 'w') as f:
+        json.dump(index, f, indent=2)
+    os.replace(partial, index_path)
+
+
+def _reconcile(leetvibe_dir: Path, index: dict) -> bool:
+    """
+    Sync the index with the request files on disk using one directory
+    listing. Returns True if the index changed.
+    """
+    pending_dir = get_pending_dir(leetvibe_dir)
+    try:
+        names = set(os.listdir(pending_dir))
+    except FileNotFoundError:
+        names = set()
+
+    changed = False
+    requests = index['requests']
+    for key, entry in list(requests.items()):
+        if entry['file'] not in names and entry['file'] + CLAIM_SUFFIX not in names:
+            del requests[key]
+            changed = True
+
+    indexed = {entry['file'] for entry in requests.values()}
+    for name in sorted(names):
+        if not name.endswith('.json') or name in indexed:
+            continue
+        try:
+            with open(pending_dir / name, 'r') as f:
+                request = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            continue
+        key = queue_key(request.get('concept', ''), request.get('language', 'python'))
+        if key in requests:
+            continue  # duplicate written by an older version; the indexed one wins
+        requests[key] = _entry_for(request, name)
+        changed = True
+    return changed
+
+
+def _entry_for(request: dict, filename: str) -> dict:
+    timestamp = request.get('timestamp') or datetime.now().isoformat()
+    return {
+        'quiz_id': request.get('quiz_id', ''),
+        'concept': request.get('concept', ''),
+        'language': request.get('language', 'python'),
+        'file': filename,
+        'source_file': request.get('source_file'),
+        'priority': request.get('priority', 0),
+        'times_seen': request.get('times_seen', 1),
+        'first_seen': timestamp,
+        'last_seen': timestamp,
+    }
+
+
+def find_existing_solution(leetvibe_dir: Path, concept: str, extensions: list[str]) -> str | None:
+    """Quiz ID of an already generated solution for a concept, if any."""
+    solutions_dir = leetvibe_dir / 'solutions'
+    if not solutions_dir.exists():
+        return None
+    for path in solutions_dir.glob(f'*-{concept}.*'):
+        if path.suffix.lower() in extensions:
+            return path.stem.split('-')[0]
+    return None
+
+
+def max_queued_id(leetvibe_dir: Path) -> int:
+    """Highest quiz ID held by a pending request (0 if none)."""
+    max_id = 0
+    for entry in list_pending(leetvibe_dir):
+        try:
+            max_id = max(max_id, int(entry['quiz_id']))
+        except ValueError:
+            pass
+    return max_id
+
+
+def enqueue(leetvibe_dir: Path, concept: str, language: str, quiz_id: str,
+            source_file: str, source_code: str, priority: int = 0,
+            extensions: list[str] = None) -> tuple[str, bool]:
+    """
+    Queue a quiz request unless (concept, language) is already queued or
+    already has a solution file (extensions: that language's file
+    extensions). A repeat sighting of a queued concept bumps it instead.
+
+    Returns:
+        (quiz_id, created): the ID that will hold the quiz (the existing one
+        for a duplicate) and whether a new request was written
+    """
+    with _locked(leetvibe_dir):
+        index = _read_index(leetvibe_dir)
+        _reconcile(leetvibe_dir, index)
+        now = datetime.now().isoformat()
+        key = queue_key(concept, language)
+
+        entry = index['requests'].get(key)
+        if entry:
+            entry['times_seen'] += 1
+            entry['last_seen'] = now
+            entry['priority'] = max(entry.get('priority', 0), priority)
+            _write_index(leetvibe_dir, index)
+            return entry['quiz_id'], False
+
+        existing_id = find_existing_solution(leetvibe_dir, concept, extensions or [])
+        if existing_id:
+            _write_index(leetvibe_dir, index)
+            return existing_id, False
+
+        request = {
+            "concept": concept,
+            "quiz_id": quiz_id,
+            "source_file": source_file,
+            "source_code": source_code[:SOURCE_SNAPSHOT_CHARS],
+            "language": language,
+            "priority": priority,
+            "timestamp": now,
+        }
+        pending_dir = get_pending_dir(leetvibe_dir)
+        pending_dir.mkdir(parents=True, exist_ok=True)
+        filename = f"{quiz_id}-{concept}.json"
+        with open(pending_dir / filename, 'w') as f:
+            json.dump(request, f, indent=2)
+
+        index['requests'][key] = _entry_for(request, filename)
+        _write_index(leetvibe_dir, index)
+        return quiz_id, True
+
+
+def touch(leetvibe_dir: Path, concept: str, language: str) -> bool:
+    """Record another sighting of a queued concept. Returns False if it isn't queued."""
+    if not get_index_path(leetvibe_dir).exists():
+        return False
+    with _locked(leetvibe_dir):
+        index = _read_index(leetvibe_dir)
+        entry = index['requests'].get(queue_key(concept, language))
+        if not entry:
+            return False
+        entry['times_seen'] += 1
+        entry['last_seen'] = datetime.now().isoformat()
+        _write_index(leetvibe_dir, index)
+        return True
+
+
+def remove(leetvibe_dir: Path, concept: str, language: str) -> None:
+    """Drop a request from the queue and delete its file."""
+    with _locked(leetvibe_dir):
+        index = _read_index(leetvibe_dir)
+        entry = index['requests'].pop(queue_key(concept, language), None)
+        if entry:
+            pending_dir = get_pending_dir(leetvibe_dir)
+            (pending_dir / entry['file']).unlink(missing_ok=True)
+            (pending_dir / (entry['file'] + CLAIM_SUFFIX)).unlink(missing_ok=True)
+        _write_index(leetvibe_dir, index)
+
+
+def list_pending(leetvibe_dir: Path) -> list[dict]:
+    """Queued requests (index entries, not full requests) in priority order."""
+    if not get_pending_dir(leetvibe_dir).exists():
+        return []
+    with _locked(leetvibe_dir):
+        index = _read_index(leetvibe_dir)
+        if _reconcile(leetvibe_dir, index):
+            _write_index(leetvibe_dir, index)
+    return sorted(index['requests'].values(), key=sort_key)
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] != 'list':
+        print(__doc__.strip().split('Usage:')[1].strip(), file=sys.stderr)
+        sys.exit(1)
+
+    cwd = os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd())
+    entries = list_pending(Path(cwd) / '.leetvibe')
+
+    if '--json' in sys.argv[2:]:
+        print(json.dumps(entries, indent=2))
+        return
+
+    print("\n  Pending Quiz Requests")
+    print("  =====================\n")
+    if not entries:
+        print("  No pending quiz requests.\n")
+        return
+    for entry in entries:
+        concept = entry['concept'].replace('_', ' ')
+        seen = f"seen {entry['times_seen']}x" if entry['times_seen'] > 1 else "seen once"
+        print(f"  [{entry['quiz_id']}] {concept:<24} {entry['language']:<11} {seen}, "
+              f"last {entry['last_seen'][:16].replace('T', ' ')}")
+    print(f"\n  {len(entries)} pending. Run /leetvibe:generate or `leetvibe generate`.\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Project Configuration for LeetVibe
+
+Optional per-project settings in .leetvibe/config.json, for example:
+
+    {
+        "python": "pypy3",
+        "python_interpreters": ["python3.11", "python3.12", "pypy3"]
+    }
+
+python               Interpreter used to run Python solutions (default: python3)
+python_interpreters  Interpreters compared by `leetvibe submit --compare-interpreters`
+                     (default: every known interpreter found on PATH)
+"""
+
+import json
+from pathlib import Path
+
+CONFIG_FILENAME = 'config.json'
+
+
+def get_config_path(leetvibe_dir: Path) -> Path:
+    """Get path to a project's config file."""
+    return leetvibe_dir / CONFIG_FILENAME
+
+
+def load_project_config(leetvibe_dir: Path) -> dict:
+    """Load a project's config; a missing or unreadable file means no settings."""
+    config_path = get_config_path(leetvibe_dir)
+    if not config_path.exists():
+        return {}
+    try:
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return {}
+    return config if isinstance(config, dict) else {}
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Project Registry for LeetVibe
+
+Quizzes live in each project's .leetvibe/ while learning history is global.
+To show outstanding quizzes across every project without searching the
+filesystem for .leetvibe directories, the hook records each project it sees
+in ~/.leetvibe/projects.json, along with a cached summary of that project's
+quiz manifest.
+
+Each cached summary is tagged with the mtimes of the project's manifest
+(.leetvibe/index.json) and solutions directory. Reading the registry costs
+two stats per project; a project's manifest is only reloaded when one of
+those mtimes has changed. Projects whose .leetvibe directory is gone are
+dropped.
+
+Usage:
+    python project_registry.py list [--json]
+    python project_registry.py stats [--json]
+    python project_registry.py projects [--json]
+"""
+
+import fcntl
+import json
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+import quiz_manifest
+
+REGISTRY_VERSION = 1
+
+
+def get_registry_path() -> Path:
+    """Path to the global project registry."""
+    return Path.home() / '.leetvibe' / 'projects.json'
+
+
+@contextmanager
+def _locked():
+    """Serialize read-modify-write of the registry across processes."""
+    registry_path = get_registry_path()
+    registry_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(registry_path.with_name('projects.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _read() -> dict:
+    try:
+        with open(get_registry_path(), 'r') as f:
+            registry = json.load(f)
+        if registry.get('version') == REGISTRY_VERSION:
+            return registry
+    except (json.JSONDecodeError, IOError, AttributeError):
+        pass
+    return {'version': REGISTRY_VERSION, 'projects': {}}
+
+
+def _write(registry: dict) -> None:
+    registry_path = get_registry_path()
+    partial = registry_path.with_name(f'.{registry_path.name}.{os.getpid()}.tmp')
+    with open(partial, 'w') as f:
+        json.dump(registry, f, indent=2)
+    os.replace(partial, registry_path)
+
+
+def _mtime(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def _project_key(leetvibe_dir: Path) -> str:
+    return str(leetvibe_dir.absolute().parent)
+
+
+def register(leetvibe_dir: Path) -> bool:
+    """
+    Record a project's .leetvibe directory. Cheap when the project is already
+    known (one read, no write). Returns True if the project was new.
+    """
+    key = _project_key(leetvibe_dir)
+    if key in _read()['projects']:
+        return False
+    with _locked():
+        registry = _read()
+        if key in registry['projects']:
+            return False
+        registry['projects'][key] = {
+            'registered': datetime.now().isoformat(),
+            'manifest_mtime': None,
+            'solutions_mtime': None,
+            'summary': None,
+            'quizzes': [],
+        }
+        _write(registry)
+    return True
+
+
+def _cached_quiz(quiz: dict) -> dict:
+    return {field: quiz.get(field) for field in ('id', 'concept', 'language', 'status', 'best_score')}
+
+
+def refresh(leetvibe_dir: Path | None = None) -> list[dict]:
+    """
+    Bring every registered project's cached summary up to date.
+
+    Args:
+        leetvibe_dir: The current project's .leetvibe directory, registered
+            first if it exists
+
+    Returns:
+        One {'path', 'summary', 'quizzes'} per project, sorted by path
+    """
+    if leetvibe_dir is not None and leetvibe_dir.exists():
+        register(leetvibe_dir)
+
+    with _locked():
+        registry = _read()
+        changed = False
+        for key in list(registry['projects']):
+            project = registry['projects'][key]
+            project_dir = Path(key) / '.leetvibe'
+            if not project_dir.is_dir():
+                del registry['projects'][key]
+                changed = True
+                continue
+
+            manifest_path = quiz_manifest.get_manifest_path(project_dir)
+            solutions_mtime = _mtime(project_dir / 'solutions')
+            if (project['summary'] is not None
+                    and project['manifest_mtime'] == _mtime(manifest_path)
+                    and project['solutions_mtime'] == solutions_mtime):
+                continue
+
+            manifest = quiz_manifest.load_manifest(project_dir)
+            project['summary'] = quiz_manifest.summarize(manifest)
+            project['quizzes'] = [_cached_quiz(q) for q in
+                                  sorted(manifest['quizzes'].values(), key=lambda q: q['id'])]
+            project['manifest_mtime'] = _mtime(manifest_path)
+            project['solutions_mtime'] = solutions_mtime
+            changed = True
+
+        if changed:
+            _write(registry)
+
+    return [{'path': key, 'summary': project['summary'], 'quizzes': project['quizzes']}
+            for key, project in sorted(registry['projects'].items())]
+
+
+def total_summary(projects: list[dict]) -> dict:
+    """Quiz counts summed over projects, with the average best score of completed quizzes."""
+    totals = {'projects': len(projects), 'total': 0, 'not_started': 0,
+              'attempted': 0, 'completed': 0, 'skipped': 0}
+    score_sum = 0.0
+    for project in projects:
+        summary = project['summary']
+        for field in ('total', 'not_started', 'attempted', 'completed', 'skipped'):
+            totals[field] += summary[field]
+        score_sum += summary['average_score'] * summary['completed']
+    totals['average_score'] = score_sum / totals['completed'] if totals['completed'] else 0
+    return totals
+
+
+def _display_path(path: str) -> str:
+    home = str(Path.home())
+    return '~' + path[len(home):] if path.startswith(home + os.sep) else path
+
+
+def print_all_list(projects: list[dict]) -> None:
+    print("\n  LeetVibe Quizzes (all projects)")
+    print("  ===============================\n")
+    outstanding = [p for p in projects if p['summary']['not_started'] + p['summary']['attempted']]
+    if not outstanding:
+        print("  No outstanding quizzes in any project.\n")
+        return
+    for project in outstanding:
+        print(f"  {_display_path(project['path'])}")
+        for q in project['quizzes']:
+            if q['status'] not in ('not_started', 'attempted'):
+                continue
+            status = quiz_manifest.STATUS_LABELS.get(q['status'], q['status'])
+            if q['best_score'] is not None:
+                status += f" ({q['best_score']:.0%})"
+            print(f"    [{q['id']}] {q['concept'].replace('_', ' '):<24} {q['language']:<11} {status}")
+        print()
+
+
+def print_all_stats(projects: list[dict]) -> None:
+    totals = total_summary(projects)
+    print("\n  LeetVibe Stats (all projects)")
+    print("  =============================\n")
+    print(f"  Projects:          {totals['projects']}")
+    print(f"  Quizzes:           {totals['total']} ({totals['completed']} completed, "
+          f"{totals['attempted']} attempted, {totals['not_started']} not started, "
+          f"{totals['skipped']} skipped)")
+    if totals['completed']:
+        print(f"  Average score:     {totals['average_score']:.0%}")
+    print()
+    for project in projects:
+        summary = project['summary']
+        print(f"  {_display_path(project['path']):<40} {summary['completed']:>3}/{summary['total']:<3} completed")
+    if projects:
+        print()
+
+
+def main():
+    commands = ('list', 'stats', 'projects')
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print(__doc__.strip().split('Usage:')[1].strip(), file=sys.stderr)
+        sys.exit(1)
+
+    command = sys.argv[1]
+    projects = refresh(quiz_manifest.get_leetvibe_dir())
+    as_json = '--json' in sys.argv[2:]
+
+    if command == 'list':
+        if as_json:
+            print(json.dumps([{'path': p['path'], 'quizzes': p['quizzes']} for p in projects], indent=2))
+        else:
+            print_all_list(projects)
+    elif command == 'stats':
+        if as_json:
+            print(json.dumps({**total_summary(projects),
+                              'by_project': {p['path']: p['summary'] for p in projects}}, indent=2))
+        else:
+            print_all_stats(projects)
+    elif as_json:
+        print(json.dumps([{'path': p['path'], **p['summary']} for p in projects], indent=2))
+    else:
+        for project in projects:
+            print(project['path'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Global Quiz Bank for LeetVibe
+
+Every generated quiz is deposited in a content-addressed bank shared by all
+projects, so a concept seen again (in another project, or after a history
+reset) gets its quiz instantly instead of waiting for generation.
+
+Layout:
+    ~/.leetvibe/bank/objects/{sha[:2]}/{sha}.json   one quiz variant
+    ~/.leetvibe/bank/index.json                     variants per (concept, language, difficulty)
+
+Quizzes are stored with their quiz ID replaced by a placeholder and re-keyed
+to the requesting project's quiz ID on withdrawal. Identical quizzes are
+stored once. When several variants exist, the least served one is handed out
+(ties broken at random), so repeats of a concept differ. fulfill_from_bank()
+writes a withdrawn quiz into a project, for the hook and the generate worker.
+
+Usage:
+    python quiz_bank.py deposit <solution_file> [--difficulty easy|medium|hard]
+    python quiz_bank.py list [--json]
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+import quiz_manifest
+from runners.registry import EXTENSION_LANGUAGES, LANGUAGE_EXTENSIONS
+from testcase_store import import_from_solution, parse_test_comments
+
+INDEX_VERSION = 1
+
+# Stands in for the quiz ID inside stored quizzes
+QUIZ_ID_PLACEHOLDER = 'LEETVIBE_QUIZ_ID'
+
+# Difficulty recorded when a quiz does not declare one
+DEFAULT_DIFFICULTY = 'unspecified'
+
+# Places a quiz ID appears in a solution file: test and comparator comments,
+# the banner and the submit instruction
+QUIZ_ID_PATTERN = r'((?:TEST|COMPARATOR):){id}(:)|(QUIZ ){id}\b|(submit ){id}\b'
+
+
+def get_bank_dir() -> Path:
+    """Directory holding the global quiz bank."""
+    return Path.home() / '.leetvibe' / 'bank'
+
+
+def entry_key(concept: str, language: str, difficulty: str) -> str:
+    return f"{concept}:{language}:{difficulty}"
+
+
+def rekey(text: str, old_id: str, new_id: str) -> str:
+    """Replace a quiz ID everywhere it appears in a quiz file."""
+    pattern = re.compile(QUIZ_ID_PATTERN.format(id=re.escape(old_id)))
+
+    def substitute(match):
+        prefix = match.group(1) or match.group(3) or match.group(4)
+        return prefix + new_id + (match.group(2) or '')
+
+    return pattern.sub(substitute, text)
+
+
+@contextmanager
+def _locked(bank_dir: Path):
+    """Serialize read-modify-write of the bank index across processes."""
+    bank_dir.mkdir(parents=True, exist_ok=True)
+    with open(bank_dir / 'index.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _read_index(bank_dir: Path) -> dict:
+    try:
+        with open(bank_dir / 'index.json', 'r') as f:
+            index = json.load(f)
+        if index.get('version') == INDEX_VERSION:
+            return index
+    except (json.JSONDecodeError, IOError, AttributeError):
+        pass
+    return {'version': INDEX_VERSION, 'entries': {}, 'variants': {}}
+
+
+def atomic_write(path: Path, content: str) -> None:
+    """Write a file so readers see either the old content or all of the new."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    with open(partial, 'w') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(partial, path)
+
+
+def _object_path(bank_dir: Path, digest: str) -> Path:
+    return bank_dir / 'objects' / digest[:2] / f'{digest}.json'
+
+
+def deposit(concept: str, language: str, quiz_id: str, solution: str,
+            reference: str | None = None, difficulty: str | None = None,
+            bank_dir: Path = None) -> str:
+    """
+    Store a quiz in the bank; depositing the same quiz again is a no-op.
+
+    Returns:
+        The quiz's content hash
+    """
+    bank_dir = bank_dir or get_bank_dir()
+    difficulty = difficulty or DEFAULT_DIFFICULTY
+    stored = {
+        'solution': rekey(solution, quiz_id, QUIZ_ID_PLACEHOLDER),
+        'reference': rekey(reference, quiz_id, QUIZ_ID_PLACEHOLDER) if reference else None,
+    }
+    digest = hashlib.sha256(json.dumps(stored, sort_keys=True).encode()).hexdigest()
+
+    with _locked(bank_dir):
+        index = _read_index(bank_dir)
+        if digest in index['variants']:
+            return digest
+
+        object_path = _object_path(bank_dir, digest)
+        if not object_path.exists():
+            atomic_write(object_path, json.dumps(stored))
+
+        key = entry_key(concept, language, difficulty)
+        index['entries'].setdefault(key, []).append(digest)
+        index['variants'][digest] = {
+            'concept': concept,
+            'language': language,
+            'difficulty': difficulty,
+            'served': 0,
+            'added': datetime.now().isoformat(),
+        }
+        atomic_write(bank_dir / 'index.json', json.dumps(index, indent=2))
+    return digest
+
+
+def withdraw(concept: str, language: str, quiz_id: str, difficulty: str | None = None,
+             bank_dir: Path = None) -> dict | None:
+    """
+    Hand out the least served variant of a quiz, re-keyed to quiz_id.
+
+    Args:
+        difficulty: Required difficulty, or None for any
+
+    Returns:
+        {'solution', 'reference', 'digest'} or None on a miss
+    """
+    bank_dir = bank_dir or get_bank_dir()
+    if not (bank_dir / 'index.json').exists():
+        return None
+
+    with _locked(bank_dir):
+        index = _read_index(bank_dir)
+        candidates = []
+        for key, digests in index['entries'].items():
+            key_concept, key_language, key_difficulty = key.split(':', 2)
+            if key_concept != concept or key_language != language:
+                continue
+            if difficulty and key_difficulty != difficulty:
+                continue
+            candidates.extend(digests)
+
+        random.shuffle(candidates)
+        candidates.sort(key=lambda d: index['variants'][d]['served'])
+        for digest in candidates:
+            try:
+                with open(_object_path(bank_dir, digest), 'r') as f:
+                    stored = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                continue
+            index['variants'][digest]['served'] += 1
+            atomic_write(bank_dir / 'index.json', json.dumps(index, indent=2))
+            return {
+                'solution': rekey(stored['solution'], QUIZ_ID_PLACEHOLDER, quiz_id),
+                'reference': (rekey(stored['reference'], QUIZ_ID_PLACEHOLDER, quiz_id)
+                              if stored.get('reference') else None),
+                'digest': digest,
+            }
+    return None
+
+
+def list_bank(bank_dir: Path = None) -> list[dict]:
+    """One summary per (concept, language, difficulty) in the bank."""
+    bank_dir = bank_dir or get_bank_dir()
+    index = _read_index(bank_dir)
+    summaries = []
+    for key, digests in sorted(index['entries'].items()):
+        concept, language, difficulty = key.split(':', 2)
+        summaries.append({
+            'concept': concept,
+            'language': language,
+            'difficulty': difficulty,
+            'variants': len(digests),
+            'served': sum(index['variants'][d]['served'] for d in digests),
+        })
+    return summaries
+
+
+def deposit_solution_file(solution_path: Path, language: str,
+                          difficulty: str | None = None) -> str:
+    """Deposit a project's quiz file (and its reference solution, if any)."""
+    quiz_id, concept = solution_path.stem.split('-', 1)
+    reference_path = solution_path.parent.parent / 'reference' / solution_path.name
+    reference = reference_path.read_text() if reference_path.exists() else None
+    return deposit(concept, language, quiz_id, solution_path.read_text(),
+                   reference=reference, difficulty=difficulty)
+
+
+def solution_filename(request: dict) -> str:
+    """Solution file name for a pending request, e.g. 007-hash_set.py."""
+    ext = LANGUAGE_EXTENSIONS.get(request.get('language'), '.py')
+    return f"{request['quiz_id']}-{request['concept']}{ext}"
+
+
+def write_quiz(leetvibe_dir: Path, request: dict, quiz: dict) -> Path:
+    """
+    Validate and write one generated quiz: solution file, optional
+    reference solution, test case sidecar and manifest entry.
+
+    Raises:
+        ValueError: if the solution has no TEST comments for its quiz ID
+    """
+    if not parse_test_comments(quiz['solution'], request['quiz_id']):
+        raise ValueError("generated solution has no TEST comments")
+
+    filename = solution_filename(request)
+    if quiz.get('reference'):
+        atomic_write(leetvibe_dir / 'reference' / filename, quiz['reference'])
+
+    solution_path = leetvibe_dir / 'solutions' / filename
+    atomic_write(solution_path, quiz['solution'])
+    import_from_solution(solution_path)
+    quiz_manifest.record_generated(leetvibe_dir, solution_path)
+    return solution_path
+
+
+def fulfill_from_bank(leetvibe_dir: Path, request: dict) -> Path | None:
+    """Write a request's quiz straight from the quiz bank; None on a miss."""
+    quiz = withdraw(request['concept'], request.get('language', 'python'),
+                    request['quiz_id'], request.get('difficulty'))
+    if not quiz:
+        return None
+    try:
+        return write_quiz(leetvibe_dir, request, quiz)
+    except (ValueError, OSError):
+        return None
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ('deposit', 'list'):
+        print(__doc__.strip().split('Usage:')[1].strip(), file=sys.stderr)
+        sys.exit(1)
+
+    if sys.argv[1] == 'deposit':
+        if len(sys.argv) < 3:
+            print("Usage: quiz_bank.py deposit <solution_file> [--difficulty LEVEL]", file=sys.stderr)
+            sys.exit(1)
+        solution_path = Path(sys.argv[2])
+        language = EXTENSION_LANGUAGES.get(solution_path.suffix.lower())
+        if not solution_path.exists() or '-' not in solution_path.stem or not language:
+            print(f"Error: {solution_path} is not a quiz solution file", file=sys.stderr)
+            sys.exit(1)
+        difficulty = None
+        if '--difficulty' in sys.argv[3:]:
+            position = sys.argv.index('--difficulty')
+            difficulty = sys.argv[position + 1] if position + 1 < len(sys.argv) else None
+        digest = deposit_solution_file(solution_path, language, difficulty)
+        print(f"Deposited {solution_path.name} ({digest[:12]})")
+        return
+
+    summaries = list_bank()
+    if '--json' in sys.argv[2:]:
+        print(json.dumps(summaries, indent=2))
+        return
+    print("\n  LeetVibe Quiz Bank")
+    print("  ==================\n")
+    if not summaries:
+        print("  The bank is empty. Generated quizzes are added automatically.\n")
+        return
+    for s in summaries:
+        print(f"  {s['concept'].replace('_', ' '):<24} {s['language']:<11} {s['difficulty']:<12} "
+              f"{s['variants']} variant(s), served {s['served']}x")
+    print()
+
+
+if __name__ == '__main__':
+    main()
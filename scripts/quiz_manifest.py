@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Quiz Manifest for LeetVibe
+
+Keeps .leetvibe/index.json up to date as quizzes are generated, submitted
+and skipped, so listing quizzes and showing stats is a single read instead of
+a scan of the solutions directory (plus the learning history) per quiz.
+
+Each quiz entry holds:
+    id, concept, language, file, status, best_score, attempts,
+    generated_at, last_submitted, last_time_ms, best_time_ms
+
+status is one of: not_started, attempted, completed, skipped.
+
+The manifest is derived data: when the solutions directory has changed
+since it was last indexed (e.g. a quiz written by /leetvibe:generate), it is
+reconciled with one directory listing; if it is missing it is rebuilt,
+taking completion and skip status from the learning history.
+
+Usage:
+    python quiz_manifest.py list [--json] [--all]
+    python quiz_manifest.py stats [--json] [--all]
+    python quiz_manifest.py skip <quiz_id>
+    python quiz_manifest.py record <solution_file>
+"""
+
+import fcntl
+import json
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from learning_tracker import get_learning_history_path, mark_quiz_skipped
+from runners.registry import EXTENSION_LANGUAGES
+
+MANIFEST_FILENAME = 'index.json'
+MANIFEST_VERSION = 1
+
+def get_leetvibe_dir() -> Path:
+    """Get the .leetvibe directory in the current project."""
+    cwd = os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd())
+    return Path(cwd) / '.leetvibe'
+
+
+def get_manifest_path(leetvibe_dir: Path) -> Path:
+    """Path to a project's quiz manifest."""
+    return leetvibe_dir / MANIFEST_FILENAME
+
+
+@contextmanager
+def _locked(leetvibe_dir: Path):
+    """Serialize read-modify-write of the manifest across processes."""
+    leetvibe_dir.mkdir(parents=True, exist_ok=True)
+    with open(leetvibe_dir / f'{MANIFEST_FILENAME}.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _read(leetvibe_dir: Path) -> dict | None:
+    try:
+        with open(get_manifest_path(leetvibe_dir), 'r') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+    except (json.JSONDecodeError, IOError, AttributeError):
+        pass
+    return None
+
+
+def _write(leetvibe_dir: Path, manifest: dict) -> None:
+    manifest_path = get_manifest_path(leetvibe_dir)
+    partial = manifest_path.with_name(f'.{manifest_path.name}.{os.getpid()}.tmp')
+    with open(partial, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(partial, manifest_path)
+
+
+def _solutions_mtime(leetvibe_dir: Path) -> int:
+    try:
+        return (leetvibe_dir / 'solutions').stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def _new_entry(quiz_id: str, concept: str, filename: str) -> dict:
+    return {
+        'id': quiz_id,
+        'concept': concept,
+        'language': EXTENSION_LANGUAGES.get(Path(filename).suffix.lower(), 'unknown'),
+        'file': filename,
+        'status': 'not_started',
+        'best_score': None,
+        'attempts': 0,
+        'generated_at': None,
+        'last_submitted': None,
+        'last_time_ms': None,
+        'best_time_ms': None,
+    }
+
+
+def _history_concepts() -> dict:
+    try:
+        with open(get_learning_history_path(), 'r') as f:
+            return json.load(f).get('concepts', {})
+    except (json.JSONDecodeError, IOError, AttributeError):
+        return {}
+
+
+def _reconcile(leetvibe_dir: Path, manifest: dict) -> bool:
+    """
+    Add quizzes whose solution file is not indexed yet and drop entries whose
+    file is gone, using one directory listing. Returns True if anything changed.
+    """
+    mtime = _solutions_mtime(leetvibe_dir)
+    if manifest.get('solutions_mtime') == mtime:
+        return False
+
+    try:
+        names = [n for n in os.listdir(leetvibe_dir / 'solutions')
+                 if '-' in n and '.' in n and not n.startswith('.')]
+    except FileNotFoundError:
+        names = []
+
+    quizzes = manifest['quizzes']
+    on_disk = {}
+    for name in names:
+        quiz_id, rest = name.split('-', 1)
+        on_disk[quiz_id] = (rest.rsplit('.', 1)[0], name)
+
+    for quiz_id in list(quizzes):
+        if quiz_id not in on_disk:
+            del quizzes[quiz_id]
+
+    history = None
+    for quiz_id, (concept, name) in on_disk.items():
+        entry = quizzes.get(quiz_id)
+        if entry and entry['file'] == name:
+            continue
+        entry = _new_entry(quiz_id, concept, name)
+        if history is None:
+            history = _history_concepts()
+        known = history.get(concept, {})
+        if known.get('quiz_completed'):
+            entry['status'] = 'completed'
+            entry['best_score'] = known.get('quiz_score')
+        elif known.get('quiz_skipped'):
+            entry['status'] = 'skipped'
+        quizzes[quiz_id] = entry
+
+    manifest['solutions_mtime'] = mtime
+    return True
+
+
+def load_manifest(leetvibe_dir: Path) -> dict:
+    """Read the manifest, reconciling it with the solutions directory if needed."""
+    manifest = _read(leetvibe_dir)
+    if manifest is not None and manifest.get('solutions_mtime') == _solutions_mtime(leetvibe_dir):
+        return manifest
+    if not (leetvibe_dir / 'solutions').exists():
+        return {'version': MANIFEST_VERSION, 'quizzes': {}}
+    with _locked(leetvibe_dir):
+        manifest = _read(leetvibe_dir) or {'version': MANIFEST_VERSION, 'quizzes': {}}
+        if _reconcile(leetvibe_dir, manifest):
+            _write(leetvibe_dir, manifest)
+    return manifest
+
+
+@contextmanager
+def _updating(leetvibe_dir: Path):
+    """Yield the reconciled manifest for modification, then save it."""
+    with _locked(leetvibe_dir):
+        manifest = _read(leetvibe_dir) or {'version': MANIFEST_VERSION, 'quizzes': {}}
+        _reconcile(leetvibe_dir, manifest)
+        yield manifest
+        _write(leetvibe_dir, manifest)
+
+
+def record_generated(leetvibe_dir: Path, solution_path: Path) -> None:
+    """Index a newly written quiz as not started."""
+    quiz_id, concept = solution_path.stem.split('-', 1)
+    with _updating(leetvibe_dir) as manifest:
+        entry = _new_entry(quiz_id, concept, solution_path.name)
+        entry['generated_at'] = datetime.now().isoformat()
+        manifest['quizzes'][quiz_id] = entry
+
+
+def record_submission(leetvibe_dir: Path, solution_path: Path, score: float,
+                      all_passed: bool, time_ms: float | None) -> None:
+    """Record a submission's score and total execution time."""
+    quiz_id, concept = solution_path.stem.split('-', 1)
+    with _updating(leetvibe_dir) as manifest:
+        entry = manifest['quizzes'].setdefault(
+            quiz_id, _new_entry(quiz_id, concept, solution_path.name))
+        entry['attempts'] += 1
+        entry['last_submitted'] = datetime.now().isoformat()
+        entry['last_time_ms'] = time_ms
+        if entry['best_score'] is None or score > entry['best_score']:
+            entry['best_score'] = score
+        if all_passed:
+            entry['status'] = 'completed'
+            if time_ms is not None and (entry['best_time_ms'] is None or time_ms < entry['best_time_ms']):
+                entry['best_time_ms'] = time_ms
+        elif entry['status'] == 'not_started':
+            entry['status'] = 'attempted'
+
+
+def record_skipped(leetvibe_dir: Path, quiz_id: str) -> dict | None:
+    """Mark a quiz as skipped. Returns its entry, or None if there is no such quiz."""
+    with _updating(leetvibe_dir) as manifest:
+        entry = manifest['quizzes'].get(quiz_id)
+        if entry:
+            entry['status'] = 'skipped'
+        return entry
+
+
+def summarize(manifest: dict) -> dict:
+    """Counts and average best score over a manifest's quizzes."""
+    quizzes = list(manifest['quizzes'].values())
+    by_status = {status: sum(1 for q in quizzes if q['status'] == status)
+                 for status in ('not_started', 'attempted', 'completed', 'skipped')}
+    scores = [q['best_score'] for q in quizzes if q['status'] == 'completed' and q['best_score'] is not None]
+    return {
+        'total': len(quizzes),
+        **by_status,
+        'average_score': sum(scores) / len(scores) if scores else 0,
+    }
+
+
+STATUS_LABELS = {
+    'not_started': 'Not started',
+    'attempted': 'Attempted',
+    'completed': 'Completed',
+    'skipped': 'Skipped',
+}
+
+
+def print_list(manifest: dict) -> None:
+    print("\n  LeetVibe Quizzes")
+    print("  ================\n")
+    quizzes = sorted(manifest['quizzes'].values(), key=lambda q: q['id'])
+    if not quizzes:
+        print("  No quizzes found. Start coding with Claude!\n")
+        return
+    for q in quizzes:
+        status = STATUS_LABELS.get(q['status'], q['status'])
+        if q['best_score'] is not None and q['status'] != 'skipped':
+            status += f" ({q['best_score']:.0%})"
+        print(f"  [{q['id']}] {q['concept'].replace('_', ' '):<24} {q['language']:<11} {status}")
+    print()
+
+
+def print_stats(summary: dict) -> None:
+    print("\n  LeetVibe Stats")
+    print("  ==============\n")
+    history = _history_concepts()
+    done = sum(1 for c in history.values() if c.get('quiz_completed'))
+    print(f"  Concepts seen:     {len(history)}")
+    print(f"  Quizzes completed: {done}")
+    if history:
+        print(f"  Progress:          {done}/{len(history)} ({100 * done // len(history)}%)")
+    if summary['total']:
+        print(f"\n  This project:      {summary['total']} quizzes, "
+              f"{summary['completed']} completed, {summary['attempted']} attempted, "
+              f"{summary['not_started']} not started, {summary['skipped']} skipped")
+        if summary['completed']:
+            print(f"  Average score:     {summary['average_score']:.0%}")
+    print()
+    if done:
+        print("  Completed:")
+        for name, data in history.items():
+            if data.get('quiz_completed'):
+                print(f"    - {name.replace('_', ' ')}: {data.get('quiz_score', 0):.0%}")
+        print()
+
+
+def main():
+    commands = ('list', 'stats', 'skip', 'record')
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print(__doc__.strip().split('Usage:')[1].strip(), file=sys.stderr)
+        sys.exit(1)
+
+    command = sys.argv[1]
+    if command in ('list', 'stats') and '--all' in sys.argv[2:]:
+        # Every registered project, from the global project registry
+        import project_registry
+        project_registry.main()
+        return
+
+    leetvibe_dir = get_leetvibe_dir()
+    as_json = '--json' in sys.argv[2:]
+
+    if command == 'list':
+        manifest = load_manifest(leetvibe_dir)
+        if as_json:
+            print(json.dumps(sorted(manifest['quizzes'].values(), key=lambda q: q['id']), indent=2))
+        else:
+            print_list(manifest)
+    elif command == 'stats':
+        summary = summarize(load_manifest(leetvibe_dir))
+        if as_json:
+            print(json.dumps(summary, indent=2))
+        else:
+            print_stats(summary)
+    elif len(sys.argv) < 3:
+        print(f"Usage: quiz_manifest.py {command} <{'quiz_id' if command == 'skip' else 'solution_file'}>",
+              file=sys.stderr)
+        sys.exit(1)
+    elif command == 'skip':
+        quiz_id = f"{int(sys.argv[2]):03d}" if sys.argv[2].isdigit() else sys.argv[2]
+        entry = record_skipped(leetvibe_dir, quiz_id)
+        if not entry:
+            print(f"Error: No quiz {quiz_id} in .leetvibe/solutions/", file=sys.stderr)
+            sys.exit(1)
+        mark_quiz_skipped(entry['concept'])
+        print(f"Skipped quiz {quiz_id}: {entry['concept'].replace('_', ' ')}")
+    else:
+        record_generated(leetvibe_dir, Path(sys.argv[2]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Result Cache for LeetVibe
+
+Per-case verdicts are cached so that resubmitting an unchanged solution, or
+one whose quiz gained a few test cases, only runs the cases whose verdict
+is not already known.
+
+A run key hashes everything besides the case itself that can change a
+verdict: the solution source, the function under test, the runner and its
+toolchain (see BaseRunner.toolchain_id), the harness code in runners/ and
+the comparator, including a custom checker's source. Each case is keyed by
+the hash of its input, expected output and any max_ms/max_mb limits; a
+generated case is keyed by its 'spec_key' (the generator spec and the source
+of its expected value, see expand_generated_cases) instead, so a large
+generated input is not hashed on every submit.
+
+Verdicts live in .leetvibe/cache/results/{solution stem}.{run key}.json.
+Saving under a new run key removes the quiz's files for older keys, so the
+cache holds one solution version per quiz. Timeouts and time limit
+failures are never cached, and neither are failing cases whose output was
+spilled to disk (see TestResult.compact); large passing outputs are cached
+as preview and digest.
+"""
+
+import functools
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from runners.base_runner import TIME_LIMIT_EXCEEDED, BaseRunner, TestResult
+
+CACHE_VERSION = 1
+
+RUNNERS_DIR = Path(__file__).parent / 'runners'
+
+# Per-case budgets that change a case's verdict
+LIMIT_FIELDS = ('max_ms', 'max_mb')
+
+
+def get_results_dir(leetvibe_dir: Path) -> Path:
+    """Directory holding cached verdicts."""
+    return leetvibe_dir / 'cache' / 'results'
+
+
+def _digest(value: Any) -> str:
+    canonical = json.dumps(value, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def harness_fingerprint() -> str:
+    """Hash of the runner and harness sources, so upgrading LeetVibe invalidates the cache."""
+    hasher = hashlib.sha256()
+    for path in sorted(p for p in RUNNERS_DIR.rglob('*') if p.is_file() and p.suffix != '.pyc'):
+        hasher.update(str(path.relative_to(RUNNERS_DIR)).encode())
+        hasher.update(path.read_bytes())
+    return hasher.hexdigest()
+
+
+def run_key(solution_path: Path, runner: BaseRunner) -> str:
+    """Hash of everything other than the test case that determines a verdict."""
+    comparator = dict(runner.comparator_spec)
+    checker = comparator.get('checker')
+    if checker:
+        try:
+            comparator['checker_source'] = hashlib.sha256(Path(checker).read_bytes()).hexdigest()
+        except OSError:
+            pass
+    return _digest({
+        'version': CACHE_VERSION,
+        'solution': hashlib.sha256(solution_path.read_bytes()).hexdigest(),
+        'function': runner.function_name,
+        'runner': type(runner).__name__,
+        'toolchain': runner.toolchain_id(),
+        'harness': harness_fingerprint(),
+        'comparator': comparator,
+    })
+
+
+def case_key(test_case: dict) -> str:
+    if 'spec_key' in test_case:
+        key = [test_case['spec_key']]
+    else:
+        key = [test_case.get('input', []), test_case.get('expected')]
+    limits = {name: test_case[name] for name in LIMIT_FIELDS if name in test_case}
+    if limits:
+        key.append(limits)
+    return _digest(key)
+
+
+def _cache_path(leetvibe_dir: Path, solution_path: Path, key: str) -> Path:
+    return get_results_dir(leetvibe_dir) / f'{solution_path.stem}.{key[:16]}.json'
+
+
+def load(leetvibe_dir: Path, solution_path: Path, key: str) -> dict:
+    """Cached verdicts for a run key, as {case key: verdict}."""
+    try:
+        with open(_cache_path(leetvibe_dir, solution_path, key), 'r') as f:
+            cached = json.load(f)
+        if cached.get('run_key') == key:
+            return cached['verdicts']
+    except (json.JSONDecodeError, IOError, AttributeError, KeyError):
+        pass
+    return {}
+
+
+def save(leetvibe_dir: Path, solution_path: Path, key: str, verdicts: dict) -> None:
+    """Write verdicts atomically and drop the quiz's entries for other run keys."""
+    path = _cache_path(leetvibe_dir, solution_path, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        with open(partial, 'w') as f:
+            json.dump({'run_key': key, 'verdicts': verdicts}, f, separators=(',', ':'))
+        os.replace(partial, path)
+        for stale in path.parent.glob(f'{solution_path.stem}.*.json'):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def to_verdict(result: TestResult) -> dict | None:
+    """The cacheable part of a result, or None if it should not be cached."""
+    # Timing depends on the machine's load, so a slow run is not remembered
+    if result.verdict == TIME_LIMIT_EXCEEDED:
+        return None
+    if result.actual_path:
+        return None
+    verdict = {
+        'passed': result.passed,
+        'actual': result.actual,
+        'error': result.error,
+        'mismatch': result.mismatch,
+        'time_ms': result.execution_time_ms,
+    }
+    if result.actual_digest:
+        verdict['actual_preview'] = result.actual_preview
+        verdict['actual_digest'] = result.actual_digest
+    if result.peak_mb is not None:
+        verdict['peak_mb'] = result.peak_mb
+    if result.limit_exceeded:
+        verdict['limit_exceeded'] = result.limit_exceeded
+    return verdict
+
+
+def from_verdict(verdict: dict, test_case: dict) -> TestResult:
+    return TestResult(
+        passed=verdict['passed'],
+        input_data=test_case.get('input', []),
+        expected=test_case.get('expected'),
+        actual=verdict.get('actual'),
+        error=verdict.get('error'),
+        execution_time_ms=verdict.get('time_ms', 0),
+        mismatch=verdict.get('mismatch'),
+        actual_preview=verdict.get('actual_preview'),
+        actual_digest=verdict.get('actual_digest'),
+        peak_mb=verdict.get('peak_mb'),
+        limit_exceeded=verdict.get('limit_exceeded'),
+    )
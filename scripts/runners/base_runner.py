@@ -5,28 +5,157 @@ Abstract base class that defines the interface for language-specific test runner
 Each runner must implement methods to compile (if needed) and run test cases.
 """
 
+import copy
+import functools
+import hashlib
 import json
+import queue
+import shutil
+import signal
 import subprocess
 import tempfile
+import threading
 import os
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
-
-
-@dataclass
+from typing import Any, Callable, Iterator
+
+import metrics
+
+from . import wire
+from .comparators import get_comparator, resolve_spec
+from .transport import input_transport
+
+
+# Outputs whose JSON form is longer than this are not kept in memory
+INLINE_ACTUAL_CHARS = 4096
+
+# Length of the previews shown in place of large values
+PREVIEW_CHARS = 200
+
+# Verdicts, as LeetCode abbreviates them
+ACCEPTED = 'AC'
+WRONG_ANSWER = 'WA'
+RUNTIME_ERROR = 'RE'
+TIME_LIMIT_EXCEEDED = 'TLE'
+MEMORY_LIMIT_EXCEEDED = 'MLE'
+
+VERDICT_NAMES = {
+    ACCEPTED: 'Accepted',
+    WRONG_ANSWER: 'Wrong Answer',
+    RUNTIME_ERROR: 'Runtime Error',
+    TIME_LIMIT_EXCEEDED: 'Time Limit Exceeded',
+    MEMORY_LIMIT_EXCEEDED: 'Memory Limit Exceeded',
+}
+
+
+def preview(value: Any, limit: int = PREVIEW_CHARS) -> str:
+    """
+    JSON form of a value, cut to limit characters. Only the prefix is
+    encoded, so previewing a huge value costs no more than a small one.
+    """
+    parts = []
+    size = 0
+    for chunk in json.JSONEncoder(default=repr).iterencode(value):
+        parts.append(chunk)
+        size += len(chunk)
+        if size > limit:
+            count = f', {len(value)} items' if isinstance(value, (list, dict)) and len(value) > 1 else ''
+            return ''.join(parts)[:limit] + f'... (truncated{count})'
+    return ''.join(parts)
+
+
+@dataclass(slots=True)
 class TestResult:
-    """Result of running a single test case."""
+    """
+    Result of running a single test case.
+
+    input_data and expected refer to the test case's own values rather than
+    copies. Large outputs are not kept (see compact): actual is then None,
+    actual_digest identifies the output and, for a failing case, actual_path
+    holds the full output on disk.
+
+    peak_mb is the memory the solution allocated during the call, for
+    runners that measure it. limit_exceeded is TIME_LIMIT_EXCEEDED or
+    MEMORY_LIMIT_EXCEEDED when the case's max_ms or max_mb was exceeded
+    (see check_limits).
+    """
     passed: bool
     input_data: Any
     expected: Any
     actual: Any
     error: str | None = None
     execution_time_ms: float = 0
+    mismatch: str | None = None
+    actual_preview: str | None = None
+    actual_digest: str | None = None
+    actual_path: str | None = None
+    peak_mb: float | None = None
+    limit_exceeded: str | None = None
 
-
-@dataclass
+    @property
+    def verdict(self) -> str:
+        """AC, WA, RE, TLE or MLE. Hitting the runner's timeout counts as TLE."""
+        if self.limit_exceeded:
+            return self.limit_exceeded
+        if self.passed:
+            return ACCEPTED
+        if self.error and self.error.startswith('Timeout'):
+            return TIME_LIMIT_EXCEEDED
+        return RUNTIME_ERROR if self.error else WRONG_ANSWER
+
+    def compact(self, spill_path: Path) -> None:
+        """
+        Drop a large output, keeping a preview and its sha256 digest. A
+        failing case's output is written to spill_path first so it can still
+        be inspected or reported in full.
+        """
+        if self.actual is None:
+            return
+        encoded = json.dumps(self.actual, default=repr)
+        if len(encoded) <= INLINE_ACTUAL_CHARS:
+            return
+        self.actual_preview = preview(self.actual)
+        self.actual_digest = hashlib.sha256(encoded.encode()).hexdigest()
+        if not self.passed:
+            spill_path.parent.mkdir(parents=True, exist_ok=True)
+            spill_path.write_text(encoded)
+            self.actual_path = str(spill_path)
+        self.actual = None
+
+    def full_actual(self) -> Any:
+        """The output, read back from disk if it was spilled."""
+        if self.actual is None and self.actual_path:
+            with open(self.actual_path, 'r') as f:
+                return json.load(f)
+        return self.actual
+
+
+def check_limits(result: TestResult, test_case: dict) -> None:
+    """
+    Fail a result that exceeded its test case's budget: max_ms against the
+    time measured inside the harness, max_mb against the peak memory the
+    solution allocated (only where the runner measures it). A case that
+    already failed with an error keeps that error.
+    """
+    if result.error:
+        return
+    max_ms = test_case.get('max_ms')
+    max_mb = test_case.get('max_mb')
+    if max_ms is not None and result.execution_time_ms > max_ms:
+        result.limit_exceeded = TIME_LIMIT_EXCEEDED
+        result.error = f"Time Limit Exceeded: {result.execution_time_ms:.1f} ms (limit {max_ms} ms)"
+    elif max_mb is not None and result.peak_mb is not None and result.peak_mb > max_mb:
+        result.limit_exceeded = MEMORY_LIMIT_EXCEEDED
+        result.error = f"Memory Limit Exceeded: {result.peak_mb:.2f} MB (limit {max_mb} MB)"
+    else:
+        return
+    result.passed = False
+
+
+@dataclass(slots=True)
 class RunResult:
     """Result of running all test cases."""
     total: int
@@ -44,6 +173,24 @@ class RunResult:
         return self.passed / self.total if self.total > 0 else 0.0
 
 
+@functools.lru_cache(maxsize=None)
+def executable_identity(name: str) -> str:
+    """
+    Real path, size and mtime of an executable on PATH ('' if missing), which
+    changes whenever the tool is upgraded or replaced.
+    """
+    path = shutil.which(name)
+    if not path:
+        return ''
+    real_path = os.path.realpath(path)
+    stat = os.stat(real_path)
+    return f'{real_path}:{stat.st_size}:{stat.st_mtime_ns}'
+
+
+class BatchError(Exception):
+    """A batched harness process failed (crash, timeout or early exit)."""
+
+
 class BaseRunner(ABC):
     """Abstract base class for language-specific test runners."""
 
@@ -53,19 +200,34 @@ class BaseRunner(ABC):
     # Memory limit (not enforced on all platforms)
     MEMORY_LIMIT_MB = 256
 
-    def __init__(self, solution_path: Path, test_cases: dict):
+    def __init__(self, solution_path: Path, test_cases: dict, options: dict = None):
         """
         Initialize the runner.
 
         Args:
             solution_path: Path to the solution file
             test_cases: Dict with 'function_name' and 'test_cases' keys
+            options: Optional runner settings, e.g. {'echo_actual': True} to
+                always return the full output even when it is large (results
+                are then not compacted)
         """
         self.solution_path = solution_path
+        self.options = options or {}
         self.function_name = test_cases.get('function_name', 'solve')
         self.test_cases = test_cases.get('test_cases', [])
         self.temp_dir = None
 
+        # Per-quiz output comparator (see runners/comparators.py); custom
+        # checker paths are relative to the .leetvibe directory
+        self.config_error = None
+        try:
+            self.comparator_spec = resolve_spec(test_cases.get('comparator'),
+                                                base_dir=solution_path.parent.parent.absolute())
+        except (ValueError, TypeError) as e:
+            self.comparator_spec = resolve_spec(None)
+            self.config_error = str(e)
+        self._comparator = None
+
     @property
     @abstractmethod
     def language(self) -> str:
@@ -78,6 +240,24 @@ class BaseRunner(ABC):
         """Return supported file extensions (e.g., ['.py'])."""
         pass
 
+    @property
+    def spill_dir(self) -> Path:
+        """
+        Where large failing outputs are written: .leetvibe/cache/actual for
+        quiz solutions, the temp directory otherwise.
+        """
+        if self.solution_path.parent.name == 'solutions':
+            return self.solution_path.parent.parent / 'cache' / 'actual'
+        return Path(tempfile.gettempdir()) / 'leetvibe-actual'
+
+    def toolchain_id(self) -> str:
+        """
+        Identity of the compiler or interpreter this runner uses, part of the
+        key for cached results (see result_cache.py). Runners override this
+        with executable_identity() of their tools.
+        """
+        return self.language
+
     @abstractmethod
     def compile(self) -> tuple[bool, str | None]:
         """
@@ -102,10 +282,70 @@ class BaseRunner(ABC):
         """
         pass
 
-    def run_all_tests(self) -> RunResult:
-        """Run all test cases and return results."""
+    def iter_results(self, test_cases: list[dict] = None) -> Iterator[TestResult]:
+        """
+        Run each test case (self.test_cases unless given) and yield its
+        result as soon as it completes.
+
+        Assumes compile() has already succeeded. Runners that can execute
+        several cases in one process should override this and still yield
+        results one at a time so callers can report progress.
+
+        With runner option "jobs" above 1, up to that many cases run at once
+        (for runners whose cases are independent processes, see
+        runners/registry.py); results are still yielded in case order.
+        """
+        cases = self.test_cases if test_cases is None else test_cases
+        jobs = self.options.get('jobs', 1)
+        if jobs > 1 and len(cases) > 1:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                yield from pool.map(self.run_test_case, cases)
+            return
+
+        for test_case in cases:
+            yield self.run_test_case(test_case)
+
+    def run_test_case(self, test_case: dict) -> TestResult:
+        """
+        Run one test case dict. Runners that measure memory override this to
+        measure only when the case has a max_mb or the measure_memory option
+        is set, so they only pay for measuring when asked.
+        """
+        return self.run_single_test(test_case.get('input', []), test_case.get('expected'))
+
+    def run_cases(self, test_cases: list[dict]) -> list[TestResult]:
+        """
+        Run more test cases on a runner whose compile() has already
+        succeeded, without compiling again (see fuzz.py). Limits are not
+        checked and results are not compacted.
+        """
+        return list(self.iter_results(test_cases))
+
+    def fork(self, **options) -> 'BaseRunner':
+        """
+        A runner sharing this one's compiled output, with the given options
+        replaced, so several threads can run cases from one compile (see
+        fuzz.py). Only the original's cleanup() removes the build.
+        """
+        forked = copy.copy(self)
+        forked.options = {**self.options, **options}
+        forked.temp_dir = None
+        return forked
+
+    def run_all_tests(self, on_result: Callable[[int, TestResult], None] = None) -> RunResult:
+        """
+        Run all test cases and return results.
+
+        Args:
+            on_result: Optional callback invoked with (index, result) as each
+                test case completes, before the full RunResult is available
+        """
         # First compile if needed
-        compile_success, compile_error = self.compile()
+        if self.config_error:
+            compile_success, compile_error = False, self.config_error
+        else:
+            with metrics.span('compile', language=self.language):
+                compile_success, compile_error = self.compile()
         if not compile_success:
             return RunResult(
                 total=len(self.test_cases),
@@ -115,13 +355,25 @@ class BaseRunner(ABC):
                 compile_error=compile_error
             )
 
-        # Run each test case
+        # Outputs spilled by an earlier run of this solution are stale now
+        compact = not self.options.get('echo_actual')
+        stem = self.solution_path.stem
+        if compact and self.spill_dir.exists():
+            for stale in self.spill_dir.glob(f'{stem}.*.json'):
+                stale.unlink(missing_ok=True)
+
+        # Run each test case, recording its own execution time; the gap
+        # between results also holds comparison and, for parallel or batch
+        # runs, other cases' work
         results = []
-        for test_case in self.test_cases:
-            input_data = test_case.get('input', [])
-            expected = test_case.get('expected')
-            result = self.run_single_test(input_data, expected)
+        for index, result in enumerate(self.iter_results()):
+            metrics.record('case', result.execution_time_ms, language=self.language)
+            check_limits(result, self.test_cases[index])
+            if compact:
+                result.compact(self.spill_dir / f'{stem}.{index + 1}.json')
             results.append(result)
+            if on_result:
+                on_result(index, result)
 
         passed = sum(1 for r in results if r.passed)
         return RunResult(
@@ -134,11 +386,30 @@ class BaseRunner(ABC):
     def cleanup(self):
         """Clean up any temporary files."""
         if self.temp_dir and os.path.exists(self.temp_dir):
-            import shutil
             shutil.rmtree(self.temp_dir, ignore_errors=True)
 
+    def _cached_build(self, artifact: Path,
+                      build: Callable[[Path], tuple[bool, str | None]]) -> tuple[bool, str | None]:
+        """
+        Build an artifact at a content-addressed cache path unless it is
+        already there. build(partial_path) writes the artifact; it is moved
+        into place only if the build succeeds.
+        """
+        if artifact.exists():
+            return True, None
+        artifact.parent.mkdir(parents=True, exist_ok=True)
+        partial = artifact.with_name(f'.{artifact.name}.{os.getpid()}.tmp')
+        try:
+            success, error = build(partial)
+            if not success or not partial.exists():
+                return False, error or "Build produced no output"
+            os.replace(partial, artifact)
+            return True, None
+        finally:
+            partial.unlink(missing_ok=True)
+
     def _run_process(self, cmd: list[str], input_data: str = None,
-                     timeout: float = None) -> tuple[str, str, int]:
+                     timeout: float = None, env: dict = None) -> tuple[str, str, int]:
         """
         Run a subprocess with timeout.
 
@@ -152,7 +423,8 @@ class BaseRunner(ABC):
                 input=input_data,
                 capture_output=True,
                 text=True,
-                timeout=timeout
+                timeout=timeout,
+                env=env
             )
             return result.stdout, result.stderr, result.returncode
         except subprocess.TimeoutExpired:
@@ -160,36 +432,210 @@ class BaseRunner(ABC):
         except Exception as e:
             return '', str(e), -1
 
+    def _run_with_input(self, cmd: list[str], input_data: Any,
+                        timeout: float = None) -> tuple[str, str, int]:
+        """
+        Run a wrapper process, delivering input_data via the input transport.
+
+        The payload is serialized once and sent over stdin, or through a
+        memory-mappable temp file when it is large (see runners.transport).
+
+        Returns:
+            Tuple of (stdout, stderr, return_code)
+        """
+        with input_transport(json.dumps(input_data), temp_dir=self.temp_dir) as transport:
+            return self._run_process(cmd, input_data=transport.stdin,
+                                     timeout=timeout, env=transport.env)
+
+    def _compare(self, expected: Any, actual: Any,
+                 input_data: Any = None) -> tuple[bool, str | None]:
+        """
+        Compare expected and actual values with the quiz's comparator.
+
+        Returns:
+            Tuple of (passed, mismatch_summary)
+        """
+        if self._comparator is None:
+            self._comparator = get_comparator(self.comparator_spec)
+        with metrics.span('compare', language=self.language):
+            return self._comparator(expected, actual, input_data)
+
+    def _stream_process_records(self, cmd: list[str], payload: str | bytes,
+                                line_timeout: float = None) -> Iterator[dict]:
+        """
+        Run a batched harness and yield its result records as they are produced.
+
+        A str payload is a JSON batch, answered with one JSON line per case;
+        a bytes payload is a binary wire batch, answered with one frame per
+        case (see runners.wire). The payload is delivered via the input
+        transport. Each record must arrive within line_timeout seconds of
+        the previous one.
+
+        Raises:
+            BatchError: on timeout, a malformed frame, or if the process
+                exits unsuccessfully
+        """
+        line_timeout = line_timeout or self.TIMEOUT_SECONDS
+        binary = isinstance(payload, bytes)
+        with input_transport(payload, temp_dir=self.temp_dir) as transport:
+            try:
+                proc = subprocess.Popen(
+                    cmd,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    env=transport.env
+                )
+            except OSError as e:
+                raise BatchError(str(e))
+
+            records = queue.Queue()
+            stderr_chunks = []
+
+            def feed():
+                data = transport.stdin
+                try:
+                    proc.stdin.write(data if isinstance(data, bytes) else data.encode('utf-8'))
+                    proc.stdin.close()
+                except OSError:
+                    pass
+
+            def pump():
+                try:
+                    if binary:
+                        while True:
+                            frame = wire.read_frame(proc.stdout)
+                            if frame is None:
+                                break
+                            records.put(wire.decode_result(frame))
+                    else:
+                        for line in proc.stdout:
+                            record = self._parse_batch_line(line.decode('utf-8', 'replace'))
+                            if record is not None:  # skip stray output from the solution
+                                records.put(record)
+                except wire.WireError as e:
+                    records.put(e)
+                records.put(None)
+
+            threads = [
+                threading.Thread(target=feed, daemon=True),
+                threading.Thread(target=pump, daemon=True),
+                threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True),
+            ]
+            for thread in threads:
+                thread.start()
+
+            try:
+                while True:
+                    try:
+                        record = records.get(timeout=line_timeout)
+                    except queue.Empty:
+                        raise BatchError(f'Timeout: exceeded {line_timeout}s')
+                    if isinstance(record, wire.WireError):
+                        raise BatchError(f"Bad result from harness: {record}")
+                    if record is None:
+                        break
+                    yield record
+
+                proc.wait()
+                threads[2].join()
+                stderr = b''.join(stderr_chunks).decode('utf-8', 'replace').strip()
+                if proc.returncode < 0:
+                    try:
+                        name = signal.Signals(-proc.returncode).name
+                    except ValueError:
+                        name = str(-proc.returncode)
+                    raise BatchError(f"Runtime error ({name})" + (f": {stderr}" if stderr else ""))
+                if proc.returncode != 0:
+                    raise BatchError(stderr or f"Runtime error (exit code {proc.returncode})")
+            finally:
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+
+    def _iter_batch(self, cmd: list[str], test_cases: list[dict] = None) -> Iterator[TestResult]:
+        """
+        Run test cases through a batched harness, one process for all cases.
+
+        The harness reads a JSON array of argument lists and writes one line
+        per case: {"ok": true, "time_ms": ..., "result": ...} (plus
+        "peak_mb" if the harness measures memory) or
+        {"ok": false, "error": "..."}. With the binary_wire option, large
+        batches use the binary wire format instead (runners.wire). If the
+        process crashes or times out, the current case fails and the
+        remaining cases run in a new process.
+        """
+        cases = self.test_cases if test_cases is None else test_cases
+        index = 0
+        while index < len(cases):
+            payload = wire.choose_batch_payload(
+                [tc.get('input', []) for tc in cases[index:]],
+                binary=bool(self.options.get('binary_wire')),
+            )
+            try:
+                for record in self._stream_process_records(cmd, payload):
+                    yield self._batch_record_result(record, cases[index])
+                    index += 1
+                    if index == len(cases):
+                        break
+                else:
+                    if index < len(cases):
+                        raise BatchError("Harness exited before reporting this test case")
+            except BatchError as e:
+                test_case = cases[index]
+                yield TestResult(
+                    passed=False,
+                    input_data=test_case.get('input', []),
+                    expected=test_case.get('expected'),
+                    actual=None,
+                    error=str(e)
+                )
+                index += 1
+
+    @staticmethod
+    def _parse_batch_line(line: str) -> dict | None:
+        """Parse one harness result line; None if it is not a result record."""
+        line = line.strip()
+        if not line.startswith('{'):
+            return None
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        return record if isinstance(record, dict) and 'ok' in record else None
+
+    def _batch_record_result(self, record: dict, test_case: dict) -> TestResult:
+        """Turn a harness result record into a TestResult."""
+        input_data = test_case.get('input', [])
+        expected = test_case.get('expected')
+        execution_time = record.get('time_ms', 0)
+        peak_mb = record.get('peak_mb')
+
+        if not record['ok']:
+            return TestResult(
+                passed=False,
+                input_data=input_data,
+                expected=expected,
+                actual=None,
+                error=record.get('error') or "Runtime error",
+                execution_time_ms=execution_time
+            )
+
+        actual = record.get('result')
+        passed, mismatch = self._compare(expected, actual, input_data)
+        return TestResult(
+            passed=passed,
+            input_data=input_data,
+            expected=expected,
+            actual=actual,
+            execution_time_ms=execution_time,
+            mismatch=mismatch,
+            peak_mb=peak_mb
+        )
+
     def _values_equal(self, expected: Any, actual: Any) -> bool:
         """Compare expected and actual values with type flexibility."""
-        # Handle None
-        if expected is None:
-            return actual is None
-
-        # Handle numeric comparison (int/float)
-        if isinstance(expected, (int, float)) and isinstance(actual, (int, float)):
-            if isinstance(expected, float) or isinstance(actual, float):
-                return abs(expected - actual) < 1e-9
-            return expected == actual
-
-        # Handle lists/arrays (order matters)
-        if isinstance(expected, list) and isinstance(actual, list):
-            if len(expected) != len(actual):
-                return False
-            return all(self._values_equal(e, a) for e, a in zip(expected, actual))
-
-        # Handle dicts
-        if isinstance(expected, dict) and isinstance(actual, dict):
-            if set(expected.keys()) != set(actual.keys()):
-                return False
-            return all(self._values_equal(expected[k], actual[k]) for k in expected)
-
-        # Handle sets (convert to sorted lists)
-        if isinstance(expected, set) and isinstance(actual, set):
-            return expected == actual
-
-        # Default comparison
-        return expected == actual
+        return self._compare(expected, actual)[0]
 
     def format_results(self, run_result: RunResult) -> str:
         """Format results for display."""
@@ -205,11 +651,17 @@ class BaseRunner(ABC):
 
         for i, result in enumerate(run_result.results, 1):
             status = "PASS" if result.passed else "FAIL"
+            if result.verdict in (TIME_LIMIT_EXCEEDED, MEMORY_LIMIT_EXCEEDED):
+                status += f" ({VERDICT_NAMES[result.verdict]})"
             lines.append(f"Test {i}: {status}")
-            lines.append(f"  Input:    {json.dumps(result.input_data)}")
-            lines.append(f"  Expected: {json.dumps(result.expected)}")
+            lines.append(f"  Input:    {preview(result.input_data)}")
+            lines.append(f"  Expected: {preview(result.expected)}")
             if not result.passed:
-                lines.append(f"  Actual:   {json.dumps(result.actual)}")
+                lines.append(f"  Actual:   {result.actual_preview or preview(result.actual)}")
+                if result.actual_path:
+                    lines.append(f"  Full:     {result.actual_path}")
+                if result.mismatch:
+                    lines.append(f"  Diff:     {result.mismatch}")
                 if result.error:
                     lines.append(f"  Error:    {result.error}")
             lines.append("")
@@ -0,0 +1,223 @@
+"""
+Output Comparators for LeetVibe
+
+Registry of comparison strategies selectable per quiz via the "comparator"
+setting in its test cases:
+
+    "comparator": "unordered"
+    "comparator": {"name": "tolerance", "abs_tol": 1e-6}
+    "comparator": {"name": "custom", "checker": "checkers/001.py"}
+
+Every comparator returns (passed, mismatch) where mismatch is a short
+human-readable summary of the first difference, or None.
+
+This module has no package-relative imports so the Python worker can load it
+directly and compare inside the solution process.
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib.util
+import json
+import math
+from pathlib import Path
+from typing import Any, Callable
+
+# Default absolute tolerance for float comparison
+FLOAT_TOLERANCE = 1e-9
+
+# Longest rendering of a value inside a mismatch summary
+SUMMARY_VALUE_CHARS = 80
+
+Comparator = Callable[[Any, Any, Any], 'tuple[bool, str | None]']
+
+COMPARATORS: dict[str, Callable[..., tuple[bool, str | None]]] = {}
+
+
+def register_comparator(name: str):
+    """Decorator registering a comparator function under a name."""
+    def decorator(func):
+        COMPARATORS[name] = func
+        return func
+    return decorator
+
+
+def _render(value: Any) -> str:
+    try:
+        text = json.dumps(value)
+    except (TypeError, ValueError):
+        text = repr(value)
+    if len(text) > SUMMARY_VALUE_CHARS:
+        text = text[:SUMMARY_VALUE_CHARS - 3] + '...'
+    return text
+
+
+def _path(path: list) -> str:
+    return ''.join(f'[{p!r}]' if isinstance(p, str) else f'[{p}]' for p in path) or 'top level'
+
+
+def _diff(expected: Any, actual: Any, path: list, abs_tol: float, rel_tol: float) -> str | None:
+    """Return a summary of the first difference between two values, or None."""
+    # Handle None
+    if expected is None:
+        if actual is None:
+            return None
+        return f"at {_path(path)}: expected null, got {_render(actual)}"
+
+    # Handle numeric comparison (int/float)
+    if (isinstance(expected, (int, float)) and isinstance(actual, (int, float))
+            and not isinstance(expected, bool) and not isinstance(actual, bool)):
+        if isinstance(expected, float) or isinstance(actual, float):
+            if math.isclose(expected, actual, rel_tol=rel_tol, abs_tol=abs_tol):
+                return None
+        elif expected == actual:
+            return None
+        return f"at {_path(path)}: expected {_render(expected)}, got {_render(actual)}"
+
+    # Handle lists/arrays (order matters); tuples count as arrays
+    if isinstance(expected, (list, tuple)) and isinstance(actual, (list, tuple)):
+        if len(expected) != len(actual):
+            return (f"at {_path(path)}: expected {len(expected)} items, "
+                    f"got {len(actual)}")
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            path.append(i)
+            difference = _diff(e, a, path, abs_tol, rel_tol)
+            path.pop()
+            if difference:
+                return difference
+        return None
+
+    # Handle dicts (non-string keys compare like their JSON form)
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        actual = {k if isinstance(k, str) else json.dumps(k): v for k, v in actual.items()}
+        if set(expected.keys()) != set(actual.keys()):
+            missing = sorted(set(expected) - set(actual))
+            extra = sorted(set(actual) - set(expected))
+            return f"at {_path(path)}: missing keys {missing}, unexpected keys {extra}"
+        for k in expected:
+            path.append(k)
+            difference = _diff(expected[k], actual[k], path, abs_tol, rel_tol)
+            path.pop()
+            if difference:
+                return difference
+        return None
+
+    # Default comparison
+    if expected == actual:
+        return None
+    return f"at {_path(path)}: expected {_render(expected)}, got {_render(actual)}"
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=repr)
+
+
+def _deep_sorted(value: Any) -> Any:
+    """Sort every list in a value (recursively) into a canonical order."""
+    if isinstance(value, (list, tuple)):
+        return sorted((_deep_sorted(v) for v in value), key=_canonical)
+    if isinstance(value, dict):
+        return {k: _deep_sorted(v) for k, v in value.items()}
+    return value
+
+
+@register_comparator('exact')
+def compare_exact(expected: Any, actual: Any, input_data: Any = None,
+                  abs_tol: float = FLOAT_TOLERANCE, rel_tol: float = 0.0) -> tuple[bool, str | None]:
+    """Structural equality; floats compared within a small tolerance."""
+    difference = _diff(expected, actual, [], abs_tol, rel_tol)
+    return difference is None, difference
+
+
+@register_comparator('tolerance')
+def compare_tolerance(expected: Any, actual: Any, input_data: Any = None,
+                      abs_tol: float = 1e-6, rel_tol: float = 1e-9) -> tuple[bool, str | None]:
+    """Like exact, but every number is compared with the given tolerances."""
+    difference = _diff(_as_floats(expected), _as_floats(actual), [], abs_tol, rel_tol)
+    return difference is None, difference
+
+
+def _as_floats(value: Any) -> Any:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int):
+        return float(value)
+    if isinstance(value, (list, tuple)):
+        return [_as_floats(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _as_floats(v) for k, v in value.items()}
+    return value
+
+
+@register_comparator('unordered')
+def compare_unordered(expected: Any, actual: Any, input_data: Any = None) -> tuple[bool, str | None]:
+    """Top-level list order is ignored (duplicates still count)."""
+    if not isinstance(expected, (list, tuple)) or not isinstance(actual, (list, tuple)):
+        return compare_exact(expected, actual)
+    return compare_exact(sorted(expected, key=_canonical), sorted(actual, key=_canonical))
+
+
+@register_comparator('multiset')
+def compare_multiset(expected: Any, actual: Any, input_data: Any = None) -> tuple[bool, str | None]:
+    """List order is ignored at every level, e.g. a set of lists."""
+    return compare_exact(_deep_sorted(expected), _deep_sorted(actual))
+
+
+def _load_checker(checker_path: str) -> Callable:
+    """The checker's check function, imported once per version of the file."""
+    return _import_checker(checker_path, Path(checker_path).stat().st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=16)
+def _import_checker(checker_path: str, mtime_ns: int) -> Callable:
+    spec = importlib.util.spec_from_file_location('leetvibe_checker', checker_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.check
+
+
+@register_comparator('custom')
+def compare_custom(expected: Any, actual: Any, input_data: Any = None,
+                   checker: str | None = None) -> tuple[bool, str | None]:
+    """
+    Delegate to a quiz-provided checker file defining
+    check(input, expected, actual) -> bool | (bool, message).
+    """
+    if not checker:
+        return False, "custom comparator requires a 'checker' path"
+    verdict = _load_checker(checker)(input_data, expected, actual)
+    if isinstance(verdict, tuple):
+        passed, message = verdict
+        return bool(passed), None if passed else message
+    return bool(verdict), None if verdict else "rejected by custom checker"
+
+
+def resolve_spec(spec: Any, base_dir: Path | None = None) -> dict:
+    """
+    Normalize a comparator spec to a dict with a 'name' key.
+
+    Relative custom checker paths are resolved against base_dir (the
+    .leetvibe directory) so the spec can be handed to a worker process.
+    """
+    if spec is None:
+        spec = {'name': 'exact'}
+    elif isinstance(spec, str):
+        spec = {'name': spec}
+    else:
+        spec = dict(spec)
+
+    if spec.get('name') not in COMPARATORS:
+        raise ValueError(f"Unknown comparator: {spec.get('name')}")
+
+    checker = spec.get('checker')
+    if checker and base_dir is not None and not Path(checker).is_absolute():
+        spec['checker'] = str(base_dir / checker)
+    return spec
+
+
+def get_comparator(spec: Any, base_dir: Path | None = None) -> Comparator:
+    """Build a comparator function (expected, actual, input_data) from a spec."""
+    options = resolve_spec(spec, base_dir)
+    func = COMPARATORS[options.pop('name')]
+    return lambda expected, actual, input_data=None: func(expected, actual, input_data, **options)
@@ -1,16 +1,77 @@
 """
 C++ Test Runner for LeetVibe
+
+Compiles the solution once together with a generated harness and runs every
+test case in a single process. Arguments are decoded straight into the
+solution function's parameter types by the bundled header-only JSON bridge
+(include/leetvibe_json.hpp), so vectors, nested vectors, strings, ints,
+doubles and more work without any manual setup. Large batches travel in the
+binary wire format instead (include/leetvibe_wire.hpp, runners/wire.py).
+
+Builds are kept fast by a precompiled harness header and a prebuilt harness
+runtime object, shared across projects under ~/.leetvibe/cache/cpp and keyed
+by compiler version, flags and harness sources, and by compiling through
+ccache or sccache when one is installed.
 """
 
-import json
+import functools
+import hashlib
+import os
+import re
 import shutil
+import subprocess
 import tempfile
-import time
-import os
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+from .base_runner import BaseRunner, TestResult, executable_identity
+
+# Bundled harness headers (leetvibe_harness.hpp, leetvibe_json.hpp)
+INCLUDE_DIR = Path(__file__).parent / 'include'
+
+# Flags used for every C++ build
+COMPILE_FLAGS = ['-std=c++17', '-O2']
+
+# Compile timeout (seconds)
+COMPILE_TIMEOUT = 60
+
+# Header included first by every harness; this is what gets precompiled
+HARNESS_HEADER = 'leetvibe_harness.hpp'
 
-from .base_runner import BaseRunner, TestResult
+# Solution-independent harness code, compiled once per cache key
+HARNESS_RUNTIME = 'leetvibe_runtime.cpp'
+
+# Shared cache for precompiled headers and harness sources
+CPP_CACHE_DIR = Path.home() / '.leetvibe' / 'cache' / 'cpp'
+
+# Compiler caches used as a launcher when available, in order of preference
+COMPILER_LAUNCHERS = ['ccache', 'sccache']
+
+# Let ccache reuse objects built against a precompiled header
+CCACHE_ENV = {'CCACHE_SLOPPINESS': 'pch_defines,time_macros,include_file_mtime,include_file_ctime'}
+
+
+@functools.lru_cache(maxsize=None)
+def compiler_version(compiler: str) -> str:
+    """Version banner of a compiler, used to key cached build artifacts."""
+    try:
+        result = subprocess.run([compiler, '--version'], capture_output=True,
+                                text=True, timeout=10)
+        return result.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def build_key(compiler: str, flags: list[str]) -> str:
+    """Cache key covering the compiler, its version, the flags and the harness sources."""
+    digest = hashlib.sha256()
+    digest.update(shutil.which(compiler).encode() if shutil.which(compiler) else compiler.encode())
+    digest.update(compiler_version(compiler).encode())
+    digest.update(' '.join(flags).encode())
+    for source in sorted(INCLUDE_DIR.iterdir()):
+        digest.update(source.name.encode())
+        digest.update(source.read_bytes())
+    return digest.hexdigest()[:16]
 
 
 class CppRunner(BaseRunner):
@@ -36,95 +97,176 @@ class CppRunner(BaseRunner):
                 return compiler
         return None
 
-    def compile(self) -> tuple[bool, str | None]:
-        """Compile the C++ solution."""
+    def toolchain_id(self) -> str:
         compiler = self._find_compiler()
-        if not compiler:
-            return False, "No C++ compiler found (clang++, g++, or c++)"
-
-        self.executable_path = Path(self.temp_dir) / 'solution'
-
-        # Create wrapper that includes the solution and test harness
-        wrapper_code = f'''
-#include <iostream>
-#include <string>
-#include <vector>
-#include <sstream>
+        return f"{executable_identity(compiler) if compiler else ''} {' '.join(COMPILE_FLAGS)}"
+
+    def _find_launcher(self) -> list[str]:
+        """Compiler cache to prefix compile commands with, if one is installed."""
+        for launcher in COMPILER_LAUNCHERS:
+            if shutil.which(launcher):
+                return [launcher]
+        return []
+
+    def _precompiled_header_flags(self, compiler: str, cache_dir: Path) -> list[str]:
+        """
+        Build (once per cache key) a precompiled harness header and return
+        the flags that make the compiler use it, or [] if it can't be built.
+
+        GCC picks up leetvibe_harness.hpp.gch from the first include
+        directory; clang takes the .pch explicitly via -include-pch.
+        """
+        is_clang = 'clang' in compiler_version(compiler).lower()
+        pch_path = cache_dir / (HARNESS_HEADER + ('.pch' if is_clang else '.gch'))
+        use_flags = ['-include-pch', str(pch_path)] if is_clang else [f'-I{cache_dir}']
+
+        if pch_path.exists():
+            return use_flags
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        partial = cache_dir / f'{pch_path.name}.{os.getpid()}.tmp'
+        _, _, returncode = self._run_process([
+            compiler,
+            *COMPILE_FLAGS,
+            '-x', 'c++-header',
+            str(INCLUDE_DIR / HARNESS_HEADER),
+            '-o', str(partial),
+        ], timeout=COMPILE_TIMEOUT)
+
+        if returncode != 0 or not partial.exists():
+            partial.unlink(missing_ok=True)
+            return []
+        os.replace(partial, pch_path)
+        return use_flags
+
+    def _call_target(self, source: str) -> str:
+        """Expression naming the function under test.
+
+        LeetCode-style solutions wrap the function in `class Solution`; the
+        harness then instantiates Solution and calls the member function.
+        """
+        if re.search(r'\b(?:class|struct)\s+Solution\b', source):
+            return f'&Solution::{self.function_name}'
+        return f'&{self.function_name}'
+
+    def _harness_source(self) -> str:
+        """Generate the harness translation unit for this solution."""
+        source = self.solution_path.read_text()
+        return f'''#include "leetvibe_harness.hpp"
+
+using namespace std;
 
 // Include the solution
 #include "{self.solution_path.absolute()}"
 
-// Simple JSON parsing for basic types
-#include <nlohmann/json.hpp>
-using json = nlohmann::json;
-
-int main(int argc, char* argv[]) {{
-    if (argc < 2) {{
-        std::cerr << "No input provided" << std::endl;
-        return 1;
-    }}
-
-    try {{
-        json input = json::parse(argv[1]);
-
-        // Call the solution function
-        auto result = {self.function_name}(input[0].get<decltype(input[0])>());
-
-        // Output result as JSON
-        json output = result;
-        std::cout << output.dump() << std::endl;
-    }} catch (const std::exception& e) {{
-        std::cerr << "Error: " << e.what() << std::endl;
-        return 1;
-    }}
-
-    return 0;
+int main() {{
+    // One generic lambda serves JSON and binary wire batches alike
+    auto call_case = [](auto& in) {{
+        return leetvibe::call({self._call_target(source)}, in);
+    }};
+    return leetvibe::run_batch(call_case, call_case);
 }}
 '''
 
-        # For simplicity, generate a self-contained wrapper without nlohmann/json dependency
-        # Use a simpler approach that handles basic types
-        simple_wrapper = f'''
-#include <iostream>
-#include <string>
-#include <vector>
-#include <sstream>
+    def _runtime_object(self, compiler: str, cache_dir: Path) -> Path | None:
+        """Build (once per cache key) the harness runtime object; None on failure."""
+        object_path = cache_dir / 'leetvibe_runtime.o'
+        if object_path.exists():
+            return object_path
 
-// Include the solution
-#include "{self.solution_path.absolute()}"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        partial = cache_dir / f'{object_path.name}.{os.getpid()}.tmp'
+        _, _, returncode = self._run_process([
+            compiler,
+            *COMPILE_FLAGS,
+            f'-I{INCLUDE_DIR}',
+            '-c', str(INCLUDE_DIR / HARNESS_RUNTIME),
+            '-o', str(partial),
+        ], timeout=COMPILE_TIMEOUT)
+
+        if returncode != 0 or not partial.exists():
+            partial.unlink(missing_ok=True)
+            return None
+        os.replace(partial, object_path)
+        return object_path
+
+    def _write_harness(self, cache_dir: Path) -> Path:
+        """
+        Write the harness source to a content-addressed path in the cache so
+        that rebuilding an unchanged solution is a compiler-cache hit.
+        """
+        source = self._harness_source()
+        digest = hashlib.sha256(source.encode()).hexdigest()[:16]
+        harness_path = cache_dir / 'harness' / f'{digest}.cpp'
+        if not harness_path.exists():
+            harness_path.parent.mkdir(parents=True, exist_ok=True)
+            partial = harness_path.with_suffix(f'.{os.getpid()}.tmp')
+            partial.write_text(source)
+            os.replace(partial, harness_path)
+        return harness_path
 
-int main(int argc, char* argv[]) {{
-    if (argc < 2) {{
-        std::cerr << "No input provided" << std::endl;
-        return 1;
-    }}
+    def compile(self) -> tuple[bool, str | None]:
+        """Compile the solution and harness into a single executable."""
+        compiler = self._find_compiler()
+        if not compiler:
+            return False, "No C++ compiler found (clang++, g++, or c++)"
 
-    // For now, this is a placeholder
-    // Full JSON parsing would require a library or custom implementation
-    std::cerr << "C++ runner requires manual test setup" << std::endl;
-    return 1;
-}}
-'''
+        cache_dir = CPP_CACHE_DIR / build_key(compiler, COMPILE_FLAGS)
+        try:
+            pch_flags = self._precompiled_header_flags(compiler, cache_dir)
+            runtime_object = self._runtime_object(compiler, cache_dir)
+            harness_path = self._write_harness(cache_dir)
+        except OSError:
+            # Unwritable cache: build from scratch in the temp directory
+            pch_flags = []
+            runtime_object = None
+            harness_path = Path(self.temp_dir) / 'harness.cpp'
+            harness_path.write_text(self._harness_source())
+
+        # Without a cached runtime object, its source is linked in directly
+        runtime_input = runtime_object or INCLUDE_DIR / HARNESS_RUNTIME
+
+        launcher = self._find_launcher()
+        env = {**os.environ, **CCACHE_ENV} if launcher == ['ccache'] else None
+        object_path = Path(self.temp_dir) / 'harness.o'
+        self.executable_path = Path(self.temp_dir) / 'solution'
 
-        wrapper_path = Path(self.temp_dir) / 'wrapper.cpp'
-        with open(wrapper_path, 'w') as f:
-            f.write(simple_wrapper)
+        def compile_object(extra_flags):
+            return self._run_process([
+                *launcher,
+                compiler,
+                *COMPILE_FLAGS,
+                *extra_flags,
+                f'-I{INCLUDE_DIR}',
+                f'-I{self.solution_path.parent}',
+                '-c', str(harness_path),
+                '-o', str(object_path),
+            ], timeout=COMPILE_TIMEOUT, env=env)
+
+        _, stderr, returncode = compile_object(pch_flags)
+        if returncode != 0 and pch_flags and 'precompiled' in stderr:
+            # Stale or incompatible PCH: rebuild without it
+            _, stderr, returncode = compile_object([])
+        if returncode != 0:
+            return False, stderr.strip() or "Compilation failed"
 
-        # Compile with common flags
-        stdout, stderr, returncode = self._run_process([
+        _, stderr, returncode = self._run_process([
             compiler,
-            '-std=c++17',
-            '-O2',
-            '-o', str(self.executable_path),
-            str(wrapper_path),
-            f'-I{self.solution_path.parent}'
-        ], timeout=30)
-
+            *COMPILE_FLAGS,
+            f'-I{INCLUDE_DIR}',
+            str(object_path),
+            str(runtime_input),
+            '-o', str(self.executable_path)
+        ], timeout=COMPILE_TIMEOUT)
         if returncode != 0:
-            return False, stderr.strip() or "Compilation failed"
+            return False, stderr.strip() or "Linking failed"
 
         return True, None
 
+    def iter_results(self, test_cases: list[dict] = None) -> Iterator[TestResult]:
+        """Run every test case in one process, yielding results as they stream in."""
+        yield from self._iter_batch([str(self.executable_path)], test_cases)
+
     def run_single_test(self, input_data: list, expected: Any) -> TestResult:
         """Run a single test case."""
         if not self.executable_path or not self.executable_path.exists():
@@ -137,42 +279,5 @@ int main(int argc, char* argv[]) {{
                 execution_time_ms=0
             )
 
-        start_time = time.time()
-
-        stdout, stderr, returncode = self._run_process([
-            str(self.executable_path),
-            json.dumps(input_data)
-        ])
-
-        execution_time = (time.time() - start_time) * 1000
-
-        if returncode != 0:
-            return TestResult(
-                passed=False,
-                input_data=input_data,
-                expected=expected,
-                actual=None,
-                error=stderr.strip() or "Runtime error",
-                execution_time_ms=execution_time
-            )
-
-        try:
-            actual = json.loads(stdout.strip())
-        except json.JSONDecodeError:
-            return TestResult(
-                passed=False,
-                input_data=input_data,
-                expected=expected,
-                actual=stdout.strip(),
-                error="Invalid output format",
-                execution_time_ms=execution_time
-            )
-
-        passed = self._values_equal(expected, actual)
-        return TestResult(
-            passed=passed,
-            input_data=input_data,
-            expected=expected,
-            actual=actual,
-            execution_time_ms=execution_time
-        )
+        test_case = {'input': input_data, 'expected': expected}
+        return next(self._iter_batch([str(self.executable_path)], [test_case]))
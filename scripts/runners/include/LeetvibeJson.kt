@@ -0,0 +1,263 @@
+// LeetVibe Kotlin test harness runtime.
+//
+// Compiled together with the generated harness (the solution plus typed
+// decode/encode code from runners/signatures.py). JSON is read and written
+// with typed calls, so no Gson, reflection or casts run per case.
+//
+// Batch protocol (same as the C++ harness): the input is a JSON array with
+// one argument list per test case, read from LEETVIBE_INPUT_FILE or stdin.
+// For each case one line is written to stdout:
+//     {"ok":true,"time_ms":0.12,"result":<json>}
+//     {"ok":false,"error":"<message>"}
+
+class LeetvibeException(message: String) : RuntimeException(message)
+
+fun <T> leetvibeRequire(value: T?, name: String): T =
+    value ?: throw LeetvibeException("missing field $name")
+
+class LeetvibeReader(private val text: String, var pos: Int = 0, private val end: Int = text.length) {
+
+    fun skipWhitespace() {
+        while (pos < end && (text[pos] == ' ' || text[pos] == '\n' || text[pos] == '\r' || text[pos] == '\t')) pos++
+    }
+
+    fun peek(): Char {
+        skipWhitespace()
+        if (pos >= end) throw LeetvibeException("unexpected end of input")
+        return text[pos]
+    }
+
+    fun expect(c: Char) {
+        if (peek() != c) throw LeetvibeException("expected '$c' at offset $pos")
+        pos++
+    }
+
+    fun beginArray() = expect('[')
+    fun endArray() = expect(']')
+    fun nextElement() = expect(',')
+
+    private fun numberToken(): String {
+        peek()
+        val start = pos
+        while (pos < end && (text[pos].isDigit() || text[pos] in "+-.eE")) pos++
+        if (pos == start) throw LeetvibeException("expected a number at offset $start")
+        return text.substring(start, pos)
+    }
+
+    fun readLong(): Long {
+        val token = numberToken()
+        token.toLongOrNull()?.let { return it }
+        val value = token.toDoubleOrNull()
+        if (value != null && value == Math.rint(value)) return value.toLong()
+        throw LeetvibeException("expected an integer, got $token")
+    }
+
+    fun readInt(): Int = readLong().toInt()
+
+    fun readDouble(): Double {
+        val token = numberToken()
+        return token.toDoubleOrNull() ?: throw LeetvibeException("expected a number, got $token")
+    }
+
+    private fun literal(word: String): Boolean {
+        if (!text.startsWith(word, pos) || pos + word.length > end) return false
+        pos += word.length
+        return true
+    }
+
+    fun readBoolean(): Boolean {
+        peek()
+        if (literal("true")) return true
+        if (literal("false")) return false
+        throw LeetvibeException("expected a boolean at offset $pos")
+    }
+
+    fun readNull(): Boolean {
+        peek()
+        return literal("null")
+    }
+
+    fun readString(): String {
+        expect('"')
+        val out = StringBuilder()
+        while (true) {
+            if (pos >= end) throw LeetvibeException("unterminated string")
+            val c = text[pos++]
+            if (c == '"') break
+            if (c != '\\') { out.append(c); continue }
+            if (pos >= end) throw LeetvibeException("unterminated string")
+            when (val e = text[pos++]) {
+                'n' -> out.append('\n')
+                't' -> out.append('\t')
+                'r' -> out.append('\r')
+                'b' -> out.append('\b')
+                'f' -> out.append('\u000C')
+                'u' -> {
+                    if (pos + 4 > end) throw LeetvibeException("bad \\u escape at offset $pos")
+                    out.append(text.substring(pos, pos + 4).toInt(16).toChar())
+                    pos += 4
+                }
+                else -> out.append(e)
+            }
+        }
+        return out.toString()
+    }
+
+    fun readChar(): Char {
+        val s = readString()
+        if (s.length != 1) throw LeetvibeException("expected a one-character string, got \"$s\"")
+        return s[0]
+    }
+
+    inline fun <T> readList(element: () -> T): ArrayList<T> {
+        beginArray()
+        val items = ArrayList<T>()
+        if (peek() == ']') { pos++; return items }
+        while (true) {
+            items.add(element())
+            if (peek() == ',') { pos++; continue }
+            endArray()
+            return items
+        }
+    }
+
+    inline fun <T> readNullable(value: () -> T): T? = if (readNull()) null else value()
+
+    inline fun readObject(field: (String) -> Unit) {
+        expect('{')
+        if (peek() == '}') { pos++; return }
+        while (true) {
+            val key = readString()
+            expect(':')
+            field(key)
+            if (peek() == ',') { pos++; continue }
+            expect('}')
+            return
+        }
+    }
+
+    fun skipValue() {
+        when (peek()) {
+            '[' -> readList { skipValue() }
+            '{' -> readObject { skipValue() }
+            '"' -> readString()
+            't', 'f' -> readBoolean()
+            'n' -> if (!readNull()) throw LeetvibeException("bad literal at offset $pos")
+            else -> numberToken()
+        }
+    }
+}
+
+class LeetvibeWriter {
+    val out = StringBuilder()
+    private val first = ArrayList<Boolean>()
+    private var afterKey = false
+
+    private fun separate() {
+        if (afterKey) { afterKey = false; return }
+        if (first.isNotEmpty()) {
+            if (!first[first.size - 1]) out.append(',')
+            first[first.size - 1] = false
+        }
+    }
+
+    fun writeNull() { separate(); out.append("null") }
+    fun writeBoolean(value: Boolean) { separate(); out.append(value) }
+    fun writeLong(value: Long) { separate(); out.append(value) }
+
+    fun writeDouble(value: Double) {
+        separate()
+        if (value.isFinite()) out.append(value) else out.append("null")
+    }
+
+    fun writeString(value: String) {
+        separate()
+        out.append('"')
+        for (c in value) {
+            when {
+                c == '"' -> out.append("\\\"")
+                c == '\\' -> out.append("\\\\")
+                c == '\n' -> out.append("\\n")
+                c == '\r' -> out.append("\\r")
+                c == '\t' -> out.append("\\t")
+                c < ' ' -> out.append(String.format("\\u%04x", c.code))
+                else -> out.append(c)
+            }
+        }
+        out.append('"')
+    }
+
+    fun beginArray() { separate(); out.append('['); first.add(true) }
+    fun endArray() { first.removeAt(first.size - 1); out.append(']') }
+    fun beginObject() { separate(); out.append('{'); first.add(true) }
+    fun endObject() { first.removeAt(first.size - 1); out.append('}') }
+
+    fun writeKey(key: String) {
+        writeString(key)
+        out.append(':')
+        afterKey = true
+    }
+
+    fun beginRecord(timeMs: Double) {
+        out.append("{\"ok\":true,\"time_ms\":").append(timeMs).append(",\"result\":")
+        afterKey = true
+    }
+
+    fun endRecord() { out.append("}\n") }
+
+    fun writeError(message: String) {
+        out.append("{\"ok\":false,\"error\":")
+        afterKey = true
+        writeString(message)
+        out.append("}\n")
+    }
+}
+
+fun leetvibeReadInput(): String {
+    // Large payloads arrive via a memory-mapped file, small ones on stdin
+    val path = System.getenv("LEETVIBE_INPUT_FILE")
+        ?: return System.`in`.readBytes().toString(Charsets.UTF_8)
+    java.nio.channels.FileChannel.open(java.nio.file.Paths.get(path)).use { channel ->
+        val buffer = channel.map(java.nio.channels.FileChannel.MapMode.READ_ONLY, 0, channel.size())
+        return Charsets.UTF_8.decode(buffer).toString()
+    }
+}
+
+/** Run every case in the batch through callCase, one result line per case. */
+fun leetvibeRunBatch(callCase: (LeetvibeReader, LeetvibeWriter) -> Unit) {
+    val input = leetvibeReadInput()
+
+    // Split the batch into per-case ranges first, so a bad argument in one
+    // case is reported for that case without derailing the others
+    val cases = ArrayList<Pair<Int, Int>>()
+    val batch = LeetvibeReader(input)
+    batch.beginArray()
+    if (batch.peek() != ']') {
+        while (true) {
+            batch.skipWhitespace()
+            val start = batch.pos
+            batch.skipValue()
+            cases.add(Pair(start, batch.pos))
+            if (batch.peek() == ',') { batch.pos++; continue }
+            break
+        }
+    }
+
+    // Anything the solution prints goes to stderr so it cannot be mistaken
+    // for a result line
+    val results = java.io.PrintStream(java.io.FileOutputStream(java.io.FileDescriptor.out), false, "UTF-8")
+    System.setOut(System.err)
+
+    for ((start, end) in cases) {
+        var w = LeetvibeWriter()
+        try {
+            callCase(LeetvibeReader(input, start, end), w)
+        } catch (e: Throwable) {
+            if (e is VirtualMachineError && e !is StackOverflowError) throw e
+            w = LeetvibeWriter()
+            w.writeError(e.toString())
+        }
+        results.print(w.out)
+        results.flush()
+    }
+}
@@ -0,0 +1,326 @@
+// LeetVibe Swift test harness runtime.
+//
+// Compiled together with the generated harness (the solution plus typed
+// decode/encode code from runners/signatures.py). JSON is read and written
+// byte by byte with typed calls, so no JSONSerialization or dynamic casts
+// run per case.
+//
+// Batch protocol (same as the C++ harness): the input is a JSON array with
+// one argument list per test case, read from LEETVIBE_INPUT_FILE or stdin.
+// For each case one line is written to stdout:
+//     {"ok":true,"time_ms":0.12,"result":<json>}
+//     {"ok":false,"error":"<message>"}
+
+import Foundation
+
+struct LeetvibeError: Error, CustomStringConvertible {
+    let description: String
+}
+
+func leetvibeRequire<T>(_ value: T?, _ name: String) throws -> T {
+    guard let value = value else { throw LeetvibeError(description: "missing field \(name)") }
+    return value
+}
+
+func leetvibeExact<T: BinaryInteger>(_ type: T.Type, _ value: Int) throws -> T {
+    guard let converted = T(exactly: value) else {
+        throw LeetvibeError(description: "\(value) is out of range for \(T.self)")
+    }
+    return converted
+}
+
+final class LeetvibeReader {
+    let bytes: [UInt8]
+    var pos: Int
+    let end: Int
+
+    init(_ bytes: [UInt8], from start: Int = 0, to end: Int? = nil) {
+        self.bytes = bytes
+        self.pos = start
+        self.end = end ?? bytes.count
+    }
+
+    func skipWhitespace() {
+        while pos < end, bytes[pos] == 0x20 || bytes[pos] == 0x0A || bytes[pos] == 0x0D || bytes[pos] == 0x09 {
+            pos += 1
+        }
+    }
+
+    func peek() throws -> UInt8 {
+        skipWhitespace()
+        guard pos < end else { throw LeetvibeError(description: "unexpected end of input") }
+        return bytes[pos]
+    }
+
+    func expect(_ char: UInt8) throws {
+        guard try peek() == char else {
+            throw LeetvibeError(description: "expected '\(Character(UnicodeScalar(char)))' at offset \(pos)")
+        }
+        pos += 1
+    }
+
+    func beginArray() throws { try expect(UInt8(ascii: "[")) }
+    func endArray() throws { try expect(UInt8(ascii: "]")) }
+    func nextElement() throws { try expect(UInt8(ascii: ",")) }
+
+    private func numberToken() throws -> String {
+        _ = try peek()
+        let start = pos
+        while pos < end {
+            let c = bytes[pos]
+            guard (c >= 0x30 && c <= 0x39) || c == 0x2D || c == 0x2B || c == 0x2E || c == 0x65 || c == 0x45 else { break }
+            pos += 1
+        }
+        guard pos > start else { throw LeetvibeError(description: "expected a number at offset \(start)") }
+        return String(decoding: bytes[start..<pos], as: UTF8.self)
+    }
+
+    func readInt() throws -> Int {
+        let token = try numberToken()
+        if let value = Int(token) { return value }
+        if let value = Double(token), value == value.rounded() { return Int(value) }
+        throw LeetvibeError(description: "expected an integer, got \(token)")
+    }
+
+    func readDouble() throws -> Double {
+        let token = try numberToken()
+        guard let value = Double(token) else { throw LeetvibeError(description: "expected a number, got \(token)") }
+        return value
+    }
+
+    private func literal(_ text: String) -> Bool {
+        let utf8 = Array(text.utf8)
+        guard pos + utf8.count <= end, Array(bytes[pos..<pos + utf8.count]) == utf8 else { return false }
+        pos += utf8.count
+        return true
+    }
+
+    func readBool() throws -> Bool {
+        _ = try peek()
+        if literal("true") { return true }
+        if literal("false") { return false }
+        throw LeetvibeError(description: "expected a boolean at offset \(pos)")
+    }
+
+    func readNull() throws -> Bool {
+        _ = try peek()
+        return literal("null")
+    }
+
+    private func hex4() throws -> UInt32 {
+        guard pos + 4 <= end, let value = UInt32(String(decoding: bytes[pos..<pos + 4], as: UTF8.self), radix: 16) else {
+            throw LeetvibeError(description: "bad \\u escape at offset \(pos)")
+        }
+        pos += 4
+        return value
+    }
+
+    func readString() throws -> String {
+        try expect(UInt8(ascii: "\""))
+        var out = [UInt8]()
+        while true {
+            guard pos < end else { throw LeetvibeError(description: "unterminated string") }
+            let c = bytes[pos]
+            pos += 1
+            if c == UInt8(ascii: "\"") { break }
+            if c != UInt8(ascii: "\\") { out.append(c); continue }
+            guard pos < end else { throw LeetvibeError(description: "unterminated string") }
+            let e = bytes[pos]
+            pos += 1
+            switch e {
+            case UInt8(ascii: "n"): out.append(0x0A)
+            case UInt8(ascii: "t"): out.append(0x09)
+            case UInt8(ascii: "r"): out.append(0x0D)
+            case UInt8(ascii: "b"): out.append(0x08)
+            case UInt8(ascii: "f"): out.append(0x0C)
+            case UInt8(ascii: "u"):
+                var code = try hex4()
+                if code >= 0xD800 && code < 0xDC00, literal("\\u") {
+                    code = 0x10000 + ((code - 0xD800) << 10) + (try hex4() - 0xDC00)
+                }
+                let scalar = Unicode.Scalar(code) ?? "\u{FFFD}"
+                out.append(contentsOf: Array(String(Character(scalar)).utf8))
+            default: out.append(e)
+            }
+        }
+        return String(decoding: out, as: UTF8.self)
+    }
+
+    func readCharacter() throws -> Character {
+        let text = try readString()
+        guard let first = text.first, text.count == 1 else {
+            throw LeetvibeError(description: "expected a one-character string, got \"\(text)\"")
+        }
+        return first
+    }
+
+    func readArray<T>(_ element: () throws -> T) throws -> [T] {
+        try beginArray()
+        var items = [T]()
+        if try peek() == UInt8(ascii: "]") { pos += 1; return items }
+        while true {
+            items.append(try element())
+            if try peek() == UInt8(ascii: ",") { pos += 1; continue }
+            try endArray()
+            return items
+        }
+    }
+
+    func readOptional<T>(_ value: () throws -> T) throws -> T? {
+        if try readNull() { return nil }
+        return try value()
+    }
+
+    func readObject(_ field: (String) throws -> Void) throws {
+        try expect(UInt8(ascii: "{"))
+        if try peek() == UInt8(ascii: "}") { pos += 1; return }
+        while true {
+            let key = try readString()
+            try expect(UInt8(ascii: ":"))
+            try field(key)
+            if try peek() == UInt8(ascii: ",") { pos += 1; continue }
+            try expect(UInt8(ascii: "}"))
+            return
+        }
+    }
+
+    func skipValue() throws {
+        switch try peek() {
+        case UInt8(ascii: "["): _ = try readArray { try skipValue() }
+        case UInt8(ascii: "{"): try readObject { _ in try skipValue() }
+        case UInt8(ascii: "\""): _ = try readString()
+        case UInt8(ascii: "t"), UInt8(ascii: "f"): _ = try readBool()
+        case UInt8(ascii: "n"):
+            guard try readNull() else { throw LeetvibeError(description: "bad literal at offset \(pos)") }
+        default: _ = try numberToken()
+        }
+    }
+}
+
+final class LeetvibeWriter {
+    var out = [UInt8]()
+    private var first = [Bool]()
+    private var afterKey = false
+
+    private func separate() {
+        if afterKey { afterKey = false; return }
+        if let isFirst = first.last {
+            if !isFirst { out.append(UInt8(ascii: ",")) }
+            first[first.count - 1] = false
+        }
+    }
+
+    private func raw(_ text: String) { out.append(contentsOf: Array(text.utf8)) }
+
+    func writeNull() { separate(); raw("null") }
+    func writeBool(_ value: Bool) { separate(); raw(value ? "true" : "false") }
+    func writeInt(_ value: Int) { separate(); raw(String(value)) }
+
+    func writeDouble(_ value: Double) {
+        separate()
+        raw(value.isFinite ? "\(value)" : "null")
+    }
+
+    func writeString(_ value: String) {
+        separate()
+        out.append(UInt8(ascii: "\""))
+        for c in value.utf8 {
+            switch c {
+            case UInt8(ascii: "\""): raw("\\\"")
+            case UInt8(ascii: "\\"): raw("\\\\")
+            case 0x0A: raw("\\n")
+            case 0x0D: raw("\\r")
+            case 0x09: raw("\\t")
+            case 0..<0x20: raw(String(format: "\\u%04x", Int(c)))
+            default: out.append(c)
+            }
+        }
+        out.append(UInt8(ascii: "\""))
+    }
+
+    func beginArray() { separate(); out.append(UInt8(ascii: "[")); first.append(true) }
+    func endArray() { first.removeLast(); out.append(UInt8(ascii: "]")) }
+    func beginObject() { separate(); out.append(UInt8(ascii: "{")); first.append(true) }
+    func endObject() { first.removeLast(); out.append(UInt8(ascii: "}")) }
+
+    func writeKey(_ key: String) {
+        writeString(key)
+        out.append(UInt8(ascii: ":"))
+        afterKey = true
+    }
+
+    func beginRecord(_ timeMs: Double) {
+        raw("{\"ok\":true,\"time_ms\":\(timeMs),\"result\":")
+        afterKey = true
+    }
+
+    func endRecord() { raw("}\n") }
+
+    func writeError(_ message: String) {
+        raw("{\"ok\":false,\"error\":")
+        afterKey = true
+        writeString(message)
+        raw("}\n")
+    }
+}
+
+func leetvibeReadInput() -> [UInt8] {
+    // Large payloads arrive via a memory-mapped file, small ones on stdin
+    if let path = ProcessInfo.processInfo.environment["LEETVIBE_INPUT_FILE"],
+       let data = try? Data(contentsOf: URL(fileURLWithPath: path), options: .alwaysMapped) {
+        return [UInt8](data)
+    }
+    return [UInt8](FileHandle.standardInput.readDataToEndOfFile())
+}
+
+/// Run every case in the batch through callCase, one result line per case.
+func leetvibeRunBatch(_ callCase: (LeetvibeReader, LeetvibeWriter) throws -> Void) -> Int32 {
+    let input = leetvibeReadInput()
+
+    // Split the batch into per-case ranges first, so a bad argument in one
+    // case is reported for that case without derailing the others
+    var cases = [(Int, Int)]()
+    let batch = LeetvibeReader(input)
+    do {
+        try batch.beginArray()
+        if try batch.peek() != UInt8(ascii: "]") {
+            while true {
+                batch.skipWhitespace()
+                let start = batch.pos
+                try batch.skipValue()
+                cases.append((start, batch.pos))
+                if try batch.peek() == UInt8(ascii: ",") { batch.pos += 1; continue }
+                break
+            }
+        }
+    } catch {
+        FileHandle.standardError.write("\(error)\n".data(using: .utf8)!)
+        return 1
+    }
+
+    // Anything the solution prints goes to stderr so it cannot be mistaken
+    // for a result line
+    fflush(stdout)
+    let resultFd = dup(1)
+    dup2(2, 1)
+
+    for (start, end) in cases {
+        var w = LeetvibeWriter()
+        do {
+            try callCase(LeetvibeReader(input, from: start, to: end), w)
+        } catch {
+            w = LeetvibeWriter()
+            w.writeError("\(error)")
+        }
+        fflush(stdout)
+        w.out.withUnsafeBufferPointer { buffer in
+            var offset = 0
+            while offset < buffer.count {
+                let written = write(resultFd, buffer.baseAddress! + offset, buffer.count - offset)
+                if written <= 0 { break }
+                offset += written
+            }
+        }
+    }
+    return 0
+}
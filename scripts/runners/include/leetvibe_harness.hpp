@@ -0,0 +1,50 @@
+// LeetVibe C++ test harness.
+//
+// Included first by the generated harness translation unit, ahead of the
+// user's solution. Pulls in the standard headers LeetCode-style solutions
+// expect plus the JSON bridge, and provides the batch driver that runs
+// every test case in a single process.
+//
+// Batch protocol: the input is a JSON array with one argument list per test
+// case, read from LEETVIBE_INPUT_FILE or stdin. For each case one line is
+// written to stdout and flushed (peak_mb is the heap the call allocated at
+// its peak, above what was held when it started):
+//     {"ok":true,"time_ms":0.12,"peak_mb":0.5,"result":<json>}
+//     {"ok":false,"error":"<message>"}
+//
+// Large batches may instead arrive in the binary wire format (they start
+// with "LVB1", see runners/wire.py); results are then written as
+// length-prefixed binary frames.
+
+#ifndef LEETVIBE_HARNESS_HPP
+#define LEETVIBE_HARNESS_HPP
+
+#include <algorithm>
+#include <bitset>
+#include <climits>
+#include <cstdint>
+#include <deque>
+#include <functional>
+#include <iostream>
+#include <list>
+#include <numeric>
+#include <queue>
+#include <set>
+#include <stack>
+#include <string>
+#include <unordered_set>
+#include <vector>
+
+#include "leetvibe_json.hpp"
+#include "leetvibe_wire.hpp"
+
+namespace leetvibe {
+
+// Run every case in the batch through the call_case matching its format
+// (defined in leetvibe_runtime.cpp; main() passes one capture-less generic
+// lambda for both)
+int run_batch(CallResult (*json_case)(Reader&), CallResult (*wire_case)(WireReader&));
+
+}  // namespace leetvibe
+
+#endif  // LEETVIBE_HARNESS_HPP
@@ -0,0 +1,428 @@
+// LeetVibe JSON bridge for C++ solutions.
+//
+// JSON codec used by the C++ test harness: parses the batch of test inputs,
+// decodes each argument into the parameter type of the solution function,
+// and encodes the return value back to JSON. Type-independent functions are
+// only declared here and defined in leetvibe_runtime.cpp.
+//
+// Supported types: bool, integral types, float/double, char, std::string,
+// std::vector<T>, std::array<T, N>, std::pair, std::tuple, std::optional<T>
+// and string-keyed std::map / std::unordered_map, nested arbitrarily.
+
+#ifndef LEETVIBE_JSON_HPP
+#define LEETVIBE_JSON_HPP
+
+#include <array>
+#include <cerrno>
+#include <chrono>
+#include <cmath>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <fstream>
+#include <iostream>
+#include <iterator>
+#include <map>
+#include <optional>
+#include <sstream>
+#include <stdexcept>
+#include <string>
+#include <tuple>
+#include <type_traits>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+namespace leetvibe {
+
+// ---------------------------------------------------------------- parsing
+
+// Typed, streaming JSON reader: values are decoded straight from the text
+// into the solution's parameter types, with no intermediate document tree,
+// so a 10^6-element array costs about as much memory as the vector itself.
+class Reader {
+public:
+    Reader(const char* begin, const char* end) : p_(begin), end_(end) {}
+
+    [[noreturn]] void fail(const std::string& what) const {
+        throw std::runtime_error("JSON input error: " + what);
+    }
+
+    void skip_ws() {
+        while (p_ != end_ && (*p_ == ' ' || *p_ == '\n' || *p_ == '\r' || *p_ == '\t')) ++p_;
+    }
+
+    char peek() {
+        skip_ws();
+        if (p_ == end_) fail("unexpected end of input");
+        return *p_;
+    }
+
+    void expect(char c) {
+        if (peek() != c) fail(std::string("expected '") + c + "'");
+        ++p_;
+    }
+
+    // After an element: consume ',' and return true, or consume close and return false
+    bool next(char close) {
+        char c = peek();
+        ++p_;
+        if (c == ',') return true;
+        if (c == close) return false;
+        fail(std::string("expected ',' or '") + close + "'");
+    }
+
+    // Start a sequence; returns false (and consumes close) if it is empty
+    bool open(char open_char, char close_char) {
+        expect(open_char);
+        if (peek() == close_char) { ++p_; return false; }
+        return true;
+    }
+
+    bool consume(const char* literal) {
+        skip_ws();
+        size_t n = std::strlen(literal);
+        if (static_cast<size_t>(end_ - p_) >= n && std::memcmp(p_, literal, n) == 0) {
+            p_ += n;
+            return true;
+        }
+        return false;
+    }
+
+    bool at_end() { skip_ws(); return p_ == end_; }
+    const char* position() const { return p_; }
+
+    // Numeric token as text; sets is_integer when it has no fraction/exponent
+    std::string number_token(bool& is_integer);
+
+    long long integer() {
+        skip_ws();
+        // Fast path for plain integers
+        const char* q = p_;
+        bool negative = false;
+        if (q != end_ && *q == '-') { negative = true; ++q; }
+        const char* digits = q;
+        unsigned long long n = 0;
+        while (q != end_ && *q >= '0' && *q <= '9' && q - digits < 18) n = n * 10 + (*q++ - '0');
+        if (q != digits && (q == end_ || (*q != '.' && *q != 'e' && *q != 'E' && !(*q >= '0' && *q <= '9')))) {
+            p_ = q;
+            return negative ? -static_cast<long long>(n) : static_cast<long long>(n);
+        }
+        return integer_slow();
+    }
+
+    double real();
+    std::string string();
+
+    // Skip one value of any type (used to split a batch into cases)
+    void skip();
+
+private:
+    const char* p_;
+    const char* end_;
+
+    long long integer_slow();
+    unsigned hex4();
+    static void append_utf8(std::string& out, unsigned code);
+};
+
+// ---------------------------------------------------------------- decoding
+
+template <class T, class = void>
+struct Decoder;
+
+template <class T>
+T decode(Reader& in) { return Decoder<T>::read(in); }
+
+template <>
+struct Decoder<bool> {
+    static bool read(Reader& in) {
+        if (in.consume("true")) return true;
+        if (in.consume("false")) return false;
+        in.fail("expected a bool");
+    }
+};
+
+template <class T>
+struct Decoder<T, std::enable_if_t<std::is_integral_v<T> && !std::is_same_v<T, bool> && !std::is_same_v<T, char>>> {
+    static T read(Reader& in) { return static_cast<T>(in.integer()); }
+};
+
+template <class T>
+struct Decoder<T, std::enable_if_t<std::is_floating_point_v<T>>> {
+    static T read(Reader& in) { return static_cast<T>(in.real()); }
+};
+
+template <>
+struct Decoder<char> {
+    static char read(Reader& in) {
+        std::string s = in.string();
+        if (s.size() != 1) in.fail("expected a single-character string");
+        return s[0];
+    }
+};
+
+template <>
+struct Decoder<std::string> {
+    static std::string read(Reader& in) { return in.string(); }
+};
+
+template <class T>
+struct Decoder<std::vector<T>> {
+    static std::vector<T> read(Reader& in) {
+        std::vector<T> out;
+        if (!in.open('[', ']')) return out;
+        do {
+            out.push_back(decode<T>(in));
+        } while (in.next(']'));
+        return out;
+    }
+};
+
+template <class T, size_t N>
+struct Decoder<std::array<T, N>> {
+    static std::array<T, N> read(Reader& in) {
+        std::vector<T> items = decode<std::vector<T>>(in);
+        if (items.size() != N) in.fail("expected an array of " + std::to_string(N) + " items");
+        std::array<T, N> out{};
+        std::move(items.begin(), items.end(), out.begin());
+        return out;
+    }
+};
+
+template <class A, class B>
+struct Decoder<std::pair<A, B>> {
+    static std::pair<A, B> read(Reader& in) {
+        in.expect('[');
+        A first = decode<A>(in);
+        in.expect(',');
+        B second = decode<B>(in);
+        in.expect(']');
+        return {std::move(first), std::move(second)};
+    }
+};
+
+template <class... Ts>
+struct Decoder<std::tuple<Ts...>> {
+    static std::tuple<Ts...> read(Reader& in) {
+        in.expect('[');
+        bool first = true;
+        // Braced init guarantees left-to-right evaluation
+        std::tuple<Ts...> out{element<Ts>(in, first)...};
+        in.expect(']');
+        return out;
+    }
+
+    template <class T>
+    static T element(Reader& in, bool& first) {
+        if (!first) in.expect(',');
+        first = false;
+        return decode<T>(in);
+    }
+};
+
+template <class T>
+struct Decoder<std::optional<T>> {
+    static std::optional<T> read(Reader& in) {
+        if (in.consume("null")) return std::nullopt;
+        return decode<T>(in);
+    }
+};
+
+template <class M>
+M decode_map(Reader& in) {
+    M out;
+    if (!in.open('{', '}')) return out;
+    do {
+        std::string key = in.string();
+        in.expect(':');
+        out.emplace(std::move(key), decode<typename M::mapped_type>(in));
+    } while (in.next('}'));
+    return out;
+}
+
+template <class T>
+struct Decoder<std::map<std::string, T>> {
+    static std::map<std::string, T> read(Reader& in) { return decode_map<std::map<std::string, T>>(in); }
+};
+
+template <class T>
+struct Decoder<std::unordered_map<std::string, T>> {
+    static std::unordered_map<std::string, T> read(Reader& in) {
+        return decode_map<std::unordered_map<std::string, T>>(in);
+    }
+};
+
+// ---------------------------------------------------------------- encoding
+
+void encode_string(std::string& out, const std::string& s);
+
+inline void encode(std::string& out, bool b) { out += b ? "true" : "false"; }
+inline void encode(std::string& out, char c) { encode_string(out, std::string(1, c)); }
+inline void encode(std::string& out, const std::string& s) { encode_string(out, s); }
+inline void encode(std::string& out, const char* s) { encode_string(out, s); }
+
+template <class T>
+std::enable_if_t<std::is_integral_v<T> && !std::is_same_v<T, bool> && !std::is_same_v<T, char>>
+encode(std::string& out, T n) { out += std::to_string(n); }
+
+template <class T>
+std::enable_if_t<std::is_floating_point_v<T>>
+encode(std::string& out, T x) {
+    if (!std::isfinite(x)) { out += "null"; return; }
+    char buf[32];
+    std::snprintf(buf, sizeof buf, "%.17g", static_cast<double>(x));
+    out += buf;
+    // Keep a decimal point so the value reads back as a float
+    if (!std::strpbrk(buf, ".eE")) out += ".0";
+}
+
+template <class T> void encode(std::string& out, const std::optional<T>& v);
+template <class A, class B> void encode(std::string& out, const std::pair<A, B>& p);
+template <class... Ts> void encode(std::string& out, const std::tuple<Ts...>& t);
+template <class T> void encode(std::string& out, const std::map<std::string, T>& m);
+template <class T> void encode(std::string& out, const std::unordered_map<std::string, T>& m);
+template <class T> void encode(std::string& out, const std::vector<T>& v);
+template <class T, size_t N> void encode(std::string& out, const std::array<T, N>& v);
+
+template <class C>
+void encode_sequence(std::string& out, const C& items) {
+    out += '[';
+    bool first = true;
+    for (const auto& item : items) {
+        if (!first) out += ',';
+        first = false;
+        encode(out, static_cast<const typename C::value_type&>(item));
+    }
+    out += ']';
+}
+
+template <class M>
+void encode_map(std::string& out, const M& m) {
+    out += '{';
+    bool first = true;
+    for (const auto& entry : m) {
+        if (!first) out += ',';
+        first = false;
+        encode_string(out, entry.first);
+        out += ':';
+        encode(out, entry.second);
+    }
+    out += '}';
+}
+
+template <class T> void encode(std::string& out, const std::vector<T>& v) { encode_sequence(out, v); }
+template <class T, size_t N> void encode(std::string& out, const std::array<T, N>& v) { encode_sequence(out, v); }
+template <class T> void encode(std::string& out, const std::map<std::string, T>& m) { encode_map(out, m); }
+template <class T> void encode(std::string& out, const std::unordered_map<std::string, T>& m) { encode_map(out, m); }
+
+template <class T>
+void encode(std::string& out, const std::optional<T>& v) {
+    if (v) encode(out, *v); else out += "null";
+}
+
+template <class A, class B>
+void encode(std::string& out, const std::pair<A, B>& p) {
+    out += '[';
+    encode(out, p.first);
+    out += ',';
+    encode(out, p.second);
+    out += ']';
+}
+
+template <class... Ts>
+void encode(std::string& out, const std::tuple<Ts...>& t) {
+    out += '[';
+    bool first = true;
+    std::apply([&](const auto&... item) {
+        ((out += first ? "" : ",", first = false, encode(out, item)), ...);
+    }, t);
+    out += ']';
+}
+
+// ---------------------------------------------------------------- calling
+
+struct CallResult {
+    std::string encoded;  // the return value, in the batch's format
+    double time_ms;
+    double peak_mb;       // heap allocated by the call at its peak
+};
+
+// Heap accounting (leetvibe_runtime.cpp replaces the global operator new):
+// heap_mark() resets the peak to the bytes currently held and returns that
+// baseline; heap_peak_since(baseline) is the highest level reached since,
+// above the baseline
+size_t heap_mark();
+size_t heap_peak_since(size_t baseline);
+
+// Argument lists and return values for JSON batches; the binary wire
+// format provides the same four functions for WireReader
+inline void begin_arguments(Reader& in, size_t) { in.expect('['); }
+
+template <class T>
+T decode_argument(Reader& in, bool& first) {
+    if (!first) in.expect(',');
+    first = false;
+    return decode<T>(in);
+}
+
+inline void end_arguments(Reader& in, size_t count) {
+    if (in.peek() != ']') in.fail("too many arguments (expected " + std::to_string(count) + ")");
+    in.expect(']');
+}
+
+template <class T>
+void encode_result(Reader&, std::string& out, const T& value) { encode(out, value); }
+
+// Decode one case's argument list into the parameter types, call, encode
+template <class In, class F, class... A, size_t... I>
+CallResult invoke(const F& fn, In& in, std::index_sequence<I...>) {
+    begin_arguments(in, sizeof...(A));
+    bool first = true;
+    // Braced init guarantees left-to-right evaluation
+    std::tuple<std::decay_t<A>...> decoded{decode_argument<std::decay_t<A>>(in, first)...};
+    end_arguments(in, sizeof...(A));
+
+    size_t heap_baseline = heap_mark();
+    auto start = std::chrono::steady_clock::now();
+    auto result = fn(std::get<I>(decoded)...);
+    auto stop = std::chrono::steady_clock::now();
+
+    CallResult out;
+    out.peak_mb = static_cast<double>(heap_peak_since(heap_baseline)) / (1 << 20);
+    encode_result(in, out.encoded, result);
+    out.time_ms = std::chrono::duration<double, std::milli>(stop - start).count();
+    return out;
+}
+
+// Free function: int solve(std::vector<int>& nums, int k)
+template <class In, class R, class... A>
+CallResult call(R (*fn)(A...), In& in) {
+    return invoke<In, decltype(fn), A...>(fn, in, std::index_sequence_for<A...>{});
+}
+
+// LeetCode-style member function: class Solution { public: int solve(...); };
+template <class In, class C, class R, class... A>
+CallResult call(R (C::*fn)(A...), In& in) {
+    C instance;
+    auto bound = [&](auto&&... a) { return (instance.*fn)(std::forward<decltype(a)>(a)...); };
+    return invoke<In, decltype(bound), A...>(bound, in, std::index_sequence_for<A...>{});
+}
+
+template <class In, class C, class R, class... A>
+CallResult call(R (C::*fn)(A...) const, In& in) {
+    C instance;
+    auto bound = [&](auto&&... a) { return (instance.*fn)(std::forward<decltype(a)>(a)...); };
+    return invoke<In, decltype(bound), A...>(bound, in, std::index_sequence_for<A...>{});
+}
+
+// ---------------------------------------------------------------- input
+
+// Read the batch payload (JSON or binary wire format): from the file named
+// by LEETVIBE_INPUT_FILE for large inputs, otherwise from stdin (see
+// runners/transport.py).
+std::string read_input();
+
+}  // namespace leetvibe
+
+#endif  // LEETVIBE_JSON_HPP
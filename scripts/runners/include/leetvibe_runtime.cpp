@@ -0,0 +1,354 @@
+// LeetVibe C++ harness runtime.
+//
+// Out-of-line parts of the JSON bridge, the batch driver and the heap
+// accounting behind per-case memory limits. They do not
+// depend on the solution, so the runner compiles this file once per
+// toolchain, caches the object next to the precompiled harness header and
+// links it into every quiz build; only the solution-specific decoding and
+// encoding is compiled per submit.
+
+#include "leetvibe_harness.hpp"
+
+#include <atomic>
+#include <cstddef>
+#include <new>
+
+namespace leetvibe {
+
+// ---------------------------------------------------------------- parsing
+
+std::string Reader::number_token(bool& is_integer) {
+    skip_ws();
+    const char* start = p_;
+    is_integer = true;
+    if (p_ != end_ && *p_ == '-') ++p_;
+    while (p_ != end_) {
+        char c = *p_;
+        if (c >= '0' && c <= '9') { ++p_; continue; }
+        if (c == '.' || c == 'e' || c == 'E' || c == '+' || c == '-') { is_integer = false; ++p_; continue; }
+        break;
+    }
+    if (p_ == start) fail("expected a number");
+    return std::string(start, p_);
+}
+
+long long Reader::integer_slow() {
+    bool is_integer;
+    std::string text = number_token(is_integer);
+    double value = std::strtod(text.c_str(), nullptr);
+    if (!is_integer && std::floor(value) != value) fail("expected an integer, got " + text);
+    if (is_integer) {
+        errno = 0;
+        long long exact = std::strtoll(text.c_str(), nullptr, 10);
+        if (errno == 0) return exact;
+    }
+    return static_cast<long long>(value);
+}
+
+double Reader::real() {
+    bool is_integer;
+    std::string text = number_token(is_integer);
+    return std::strtod(text.c_str(), nullptr);
+}
+
+std::string Reader::string() {
+    if (peek() != '"') fail("expected a string");
+    ++p_;
+    std::string out;
+    while (true) {
+        if (p_ == end_) fail("unterminated string");
+        char c = *p_++;
+        if (c == '"') return out;
+        if (c != '\\') { out += c; continue; }
+        if (p_ == end_) fail("unterminated escape");
+        char e = *p_++;
+        switch (e) {
+            case '"': out += '"'; break;
+            case '\\': out += '\\'; break;
+            case '/': out += '/'; break;
+            case 'b': out += '\b'; break;
+            case 'f': out += '\f'; break;
+            case 'n': out += '\n'; break;
+            case 'r': out += '\r'; break;
+            case 't': out += '\t'; break;
+            case 'u': {
+                unsigned code = hex4();
+                if (code >= 0xD800 && code < 0xDC00 && end_ - p_ >= 2 && p_[0] == '\\' && p_[1] == 'u') {
+                    p_ += 2;
+                    unsigned low = hex4();
+                    code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00);
+                }
+                append_utf8(out, code);
+                break;
+            }
+            default: fail("bad escape");
+        }
+    }
+}
+
+void Reader::skip() {
+    char c = peek();
+    if (c == '"') { string(); return; }
+    if (c == '[' || c == '{') {
+        char close = c == '[' ? ']' : '}';
+        if (!open(c, close)) return;
+        do {
+            if (c == '{') { string(); expect(':'); }
+            skip();
+        } while (next(close));
+        return;
+    }
+    if (consume("true") || consume("false") || consume("null")) return;
+    bool is_integer;
+    number_token(is_integer);
+}
+
+unsigned Reader::hex4() {
+    if (end_ - p_ < 4) fail("bad unicode escape");
+    unsigned code = 0;
+    for (int i = 0; i < 4; ++i) {
+        char c = *p_++;
+        code <<= 4;
+        if (c >= '0' && c <= '9') code |= c - '0';
+        else if (c >= 'a' && c <= 'f') code |= c - 'a' + 10;
+        else if (c >= 'A' && c <= 'F') code |= c - 'A' + 10;
+        else fail("bad unicode escape");
+    }
+    return code;
+}
+
+void Reader::append_utf8(std::string& out, unsigned code) {
+    if (code < 0x80) {
+        out += static_cast<char>(code);
+    } else if (code < 0x800) {
+        out += static_cast<char>(0xC0 | (code >> 6));
+        out += static_cast<char>(0x80 | (code & 0x3F));
+    } else if (code < 0x10000) {
+        out += static_cast<char>(0xE0 | (code >> 12));
+        out += static_cast<char>(0x80 | ((code >> 6) & 0x3F));
+        out += static_cast<char>(0x80 | (code & 0x3F));
+    } else {
+        out += static_cast<char>(0xF0 | (code >> 18));
+        out += static_cast<char>(0x80 | ((code >> 12) & 0x3F));
+        out += static_cast<char>(0x80 | ((code >> 6) & 0x3F));
+        out += static_cast<char>(0x80 | (code & 0x3F));
+    }
+}
+
+// ---------------------------------------------------------------- encoding
+
+void encode_string(std::string& out, const std::string& s) {
+    out += '"';
+    for (unsigned char c : s) {
+        switch (c) {
+            case '"': out += "\\\""; break;
+            case '\\': out += "\\\\"; break;
+            case '\n': out += "\\n"; break;
+            case '\r': out += "\\r"; break;
+            case '\t': out += "\\t"; break;
+            default:
+                if (c < 0x20) {
+                    char buf[8];
+                    std::snprintf(buf, sizeof buf, "\\u%04x", c);
+                    out += buf;
+                } else {
+                    out += static_cast<char>(c);
+                }
+        }
+    }
+    out += '"';
+}
+
+// ---------------------------------------------------------------- input
+
+std::string read_input() {
+    if (const char* path = std::getenv("LEETVIBE_INPUT_FILE")) {
+        std::ifstream in(path, std::ios::binary);
+        return std::string(std::istreambuf_iterator<char>(in), std::istreambuf_iterator<char>());
+    }
+    std::ios::sync_with_stdio(false);
+    return std::string(std::istreambuf_iterator<char>(std::cin), std::istreambuf_iterator<char>());
+}
+
+// ---------------------------------------------------------------- memory
+
+// Every allocation through the global operator new carries a small header
+// recording its size, so the harness knows how much heap is held at any
+// time and the peak reached during each call.
+
+namespace {
+
+constexpr size_t HEAP_HEADER = alignof(std::max_align_t);
+
+std::atomic<size_t> heap_current{0};
+std::atomic<size_t> heap_peak{0};
+
+void* heap_allocate(size_t size) noexcept {
+    void* block = std::malloc(size + HEAP_HEADER);
+    if (!block) return nullptr;
+    *static_cast<size_t*>(block) = size;
+    size_t now = heap_current.fetch_add(size, std::memory_order_relaxed) + size;
+    size_t peak = heap_peak.load(std::memory_order_relaxed);
+    while (now > peak && !heap_peak.compare_exchange_weak(peak, now, std::memory_order_relaxed)) {}
+    return static_cast<char*>(block) + HEAP_HEADER;
+}
+
+void heap_release(void* p) noexcept {
+    if (!p) return;
+    void* block = static_cast<char*>(p) - HEAP_HEADER;
+    heap_current.fetch_sub(*static_cast<size_t*>(block), std::memory_order_relaxed);
+    std::free(block);
+}
+
+void* heap_new(size_t size) {
+    if (size == 0) size = 1;
+    while (true) {
+        if (void* p = heap_allocate(size)) return p;
+        std::new_handler handler = std::get_new_handler();
+        if (!handler) throw std::bad_alloc();
+        handler();
+    }
+}
+
+}  // namespace
+
+size_t heap_mark() {
+    size_t now = heap_current.load(std::memory_order_relaxed);
+    heap_peak.store(now, std::memory_order_relaxed);
+    return now;
+}
+
+size_t heap_peak_since(size_t baseline) {
+    size_t peak = heap_peak.load(std::memory_order_relaxed);
+    return peak > baseline ? peak - baseline : 0;
+}
+
+// ---------------------------------------------------------------- batch
+
+namespace {
+
+// JSON batch: a JSON array of argument lists in, one JSON line out per case
+int run_json_batch(const std::string& payload, CallResult (*call_case)(Reader&)) {
+    Reader batch(payload.data(), payload.data() + payload.size());
+
+    // Split the batch into per-case ranges first, so a bad argument in one
+    // case is reported for that case without derailing the others
+    std::vector<std::pair<const char*, const char*>> cases;
+    try {
+        if (batch.open('[', ']')) {
+            do {
+                batch.skip_ws();
+                const char* begin = batch.position();
+                batch.skip();
+                cases.emplace_back(begin, batch.position());
+            } while (batch.next(']'));
+        }
+    } catch (const std::exception& e) {
+        std::cerr << e.what() << std::endl;
+        return 1;
+    }
+
+    // Anything the solution prints to std::cout goes to stderr so it cannot
+    // be mistaken for a result line
+    std::cout.rdbuf(std::cerr.rdbuf());
+
+    std::string line;
+    for (const auto& range : cases) {
+        line.clear();
+        try {
+            Reader in(range.first, range.second);
+            CallResult result = call_case(in);
+            char time_buf[32];
+            std::snprintf(time_buf, sizeof time_buf, "%.6f", result.time_ms);
+            char peak_buf[32];
+            std::snprintf(peak_buf, sizeof peak_buf, "%.6f", result.peak_mb);
+            line += "{\"ok\":true,\"time_ms\":";
+            line += time_buf;
+            line += ",\"peak_mb\":";
+            line += peak_buf;
+            line += ",\"result\":";
+            line += result.encoded;
+            line += "}";
+        } catch (const std::exception& e) {
+            line += "{\"ok\":false,\"error\":";
+            encode_string(line, e.what());
+            line += "}";
+        }
+        line += '\n';
+        std::fwrite(line.data(), 1, line.size(), stdout);
+        std::fflush(stdout);
+    }
+    return 0;
+}
+
+// Binary batch: length-prefixed argument lists in, one result frame out per case
+int run_wire_batch(const std::string& payload, CallResult (*call_case)(WireReader&)) {
+    const char* p = payload.data() + sizeof WIRE_MAGIC - 1;
+    const char* end = payload.data() + payload.size();
+
+    std::vector<std::pair<const char*, const char*>> cases;
+    try {
+        WireReader header(p, end);
+        uint32_t count = header.count();
+        p += 4;
+        for (uint32_t i = 0; i < count; ++i) {
+            uint32_t length = WireReader(p, end).count();
+            p += 4;
+            if (static_cast<size_t>(end - p) < length) header.fail("truncated test case");
+            cases.emplace_back(p, p + length);
+            p += length;
+        }
+    } catch (const std::exception& e) {
+        std::cerr << e.what() << std::endl;
+        return 1;
+    }
+
+    std::cout.rdbuf(std::cerr.rdbuf());
+
+    std::string frame;
+    for (const auto& range : cases) {
+        frame.assign(4, '\0');
+        try {
+            WireReader in(range.first, range.second);
+            CallResult result = call_case(in);
+            frame += '\1';
+            wire_put(frame, result.time_ms);
+            wire_put(frame, result.peak_mb);
+            frame += result.encoded;
+        } catch (const std::exception& e) {
+            frame.resize(4);
+            frame += '\0';
+            wire_string(frame, e.what());
+        }
+        uint32_t length = static_cast<uint32_t>(frame.size() - 4);
+        std::memcpy(&frame[0], &length, 4);
+        std::fwrite(frame.data(), 1, frame.size(), stdout);
+        std::fflush(stdout);
+    }
+    return 0;
+}
+
+}  // namespace
+
+int run_batch(CallResult (*json_case)(Reader&), CallResult (*wire_case)(WireReader&)) {
+    std::string payload = read_input();
+    if (payload.compare(0, sizeof WIRE_MAGIC - 1, WIRE_MAGIC) == 0) {
+        return run_wire_batch(payload, wire_case);
+    }
+    return run_json_batch(payload, json_case);
+}
+
+}  // namespace leetvibe
+
+// Replacements for the global allocation functions; the aligned forms keep
+// their default definitions and are not counted
+void* operator new(size_t size) { return leetvibe::heap_new(size); }
+void* operator new[](size_t size) { return leetvibe::heap_new(size); }
+void* operator new(size_t size, const std::nothrow_t&) noexcept { return leetvibe::heap_allocate(size ? size : 1); }
+void* operator new[](size_t size, const std::nothrow_t&) noexcept { return leetvibe::heap_allocate(size ? size : 1); }
+void operator delete(void* p) noexcept { leetvibe::heap_release(p); }
+void operator delete[](void* p) noexcept { leetvibe::heap_release(p); }
+void operator delete(void* p, size_t) noexcept { leetvibe::heap_release(p); }
+void operator delete[](void* p, size_t) noexcept { leetvibe::heap_release(p); }
+void operator delete(void* p, const std::nothrow_t&) noexcept { leetvibe::heap_release(p); }
+void operator delete[](void* p, const std::nothrow_t&) noexcept { leetvibe::heap_release(p); }
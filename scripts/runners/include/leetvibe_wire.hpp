@@ -0,0 +1,433 @@
+// LeetVibe binary wire codec for C++ solutions.
+//
+// Binary counterpart of leetvibe_json.hpp, used when check_solution sends a
+// large batch in the binary wire format (layout documented in
+// runners/wire.py). Arguments are decoded straight into the parameter
+// types, with packed int/float arrays copied into std::vector in one pass,
+// and return values are encoded the same way.
+
+#ifndef LEETVIBE_WIRE_HPP
+#define LEETVIBE_WIRE_HPP
+
+#include <cstdint>
+#include <limits>
+
+#include "leetvibe_json.hpp"
+
+#if defined(__BYTE_ORDER__) && __BYTE_ORDER__ != __ORDER_LITTLE_ENDIAN__
+#error "the LeetVibe wire format is little-endian"
+#endif
+
+namespace leetvibe {
+
+// First bytes of a binary batch
+constexpr char WIRE_MAGIC[] = "LVB1";
+
+// ---------------------------------------------------------------- parsing
+
+class WireReader {
+public:
+    WireReader(const char* begin, const char* end) : p_(begin), end_(end) {}
+
+    [[noreturn]] void fail(const std::string& what) const {
+        throw std::runtime_error("wire input error: " + what);
+    }
+
+    // Next value's tag. Elements of a packed array have no tag of their
+    // own: they read as 'i' or 'd' followed by their 8 raw bytes.
+    char tag() {
+        if (packed_left_) { --packed_left_; return packed_; }
+        need(1);
+        return *p_++;
+    }
+
+    char peek_tag() {
+        if (packed_left_) return packed_;
+        need(1);
+        return *p_;
+    }
+
+    template <class T>
+    T raw() {
+        need(sizeof(T));
+        T value;
+        std::memcpy(&value, p_, sizeof(T));
+        p_ += sizeof(T);
+        return value;
+    }
+
+    uint32_t count() { return raw<uint32_t>(); }
+
+    // Start a list (generic or packed); returns its length
+    uint32_t begin_list() {
+        char t = tag();
+        if (t != 'l' && t != 'I' && t != 'D') fail("expected a list");
+        uint32_t n = count();
+        if (t != 'l' && n) {
+            packed_ = t == 'I' ? 'i' : 'd';
+            packed_left_ = n;
+        }
+        return n;
+    }
+
+    // Inside a packed array just started by begin_list: the kind of its
+    // elements ('i' or 'd') when all n are still unread, else 0
+    char packed(uint32_t n) const { return packed_left_ == n ? packed_ : 0; }
+
+    // Consume every remaining element of a packed array as raw bytes
+    const char* take_packed() {
+        size_t bytes = static_cast<size_t>(packed_left_) * 8;
+        packed_left_ = 0;
+        need(bytes);
+        const char* block = p_;
+        p_ += bytes;
+        return block;
+    }
+
+    long long integer() {
+        char t = tag();
+        if (t == 'i') return raw<int64_t>();
+        if (t == 'u') return static_cast<long long>(raw<uint64_t>());
+        if (t == 'd') {
+            double value = raw<double>();
+            if (std::floor(value) != value) not_integer(value);
+            return static_cast<long long>(value);
+        }
+        fail("expected an integer");
+    }
+
+    double real() {
+        char t = tag();
+        if (t == 'd') return raw<double>();
+        if (t == 'i') return static_cast<double>(raw<int64_t>());
+        if (t == 'u') return static_cast<double>(raw<uint64_t>());
+        fail("expected a number");
+    }
+
+    std::string string() {
+        if (tag() != 's') fail("expected a string");
+        return key();
+    }
+
+    // Object key: a string without a tag
+    std::string key() {
+        uint32_t n = count();
+        need(n);
+        std::string out(p_, n);
+        p_ += n;
+        return out;
+    }
+
+    bool boolean() {
+        char t = tag();
+        if (t == 'T') return true;
+        if (t == 'F') return false;
+        fail("expected a bool");
+    }
+
+    bool consume_null() {
+        if (peek_tag() != 'N') return false;
+        ++p_;
+        return true;
+    }
+
+    bool at_end() const { return p_ == end_ && !packed_left_; }
+
+    [[noreturn]] void not_integer(double value) const {
+        char buf[32];
+        std::snprintf(buf, sizeof buf, "%.17g", value);
+        fail(std::string("expected an integer, got ") + buf);
+    }
+
+private:
+    const char* p_;
+    const char* end_;
+    char packed_ = 0;
+    uint32_t packed_left_ = 0;
+
+    void need(size_t n) const {
+        if (static_cast<size_t>(end_ - p_) < n) fail("unexpected end of input");
+    }
+};
+
+// ---------------------------------------------------------------- decoding
+
+template <class T, class = void>
+struct WireDecoder;
+
+template <class T>
+T wire_decode(WireReader& in) { return WireDecoder<T>::read(in); }
+
+template <>
+struct WireDecoder<bool> {
+    static bool read(WireReader& in) { return in.boolean(); }
+};
+
+template <class T>
+struct WireDecoder<T, std::enable_if_t<std::is_integral_v<T> && !std::is_same_v<T, bool> && !std::is_same_v<T, char>>> {
+    static T read(WireReader& in) { return static_cast<T>(in.integer()); }
+};
+
+template <class T>
+struct WireDecoder<T, std::enable_if_t<std::is_floating_point_v<T>>> {
+    static T read(WireReader& in) { return static_cast<T>(in.real()); }
+};
+
+template <>
+struct WireDecoder<char> {
+    static char read(WireReader& in) {
+        std::string s = in.string();
+        if (s.size() != 1) in.fail("expected a single-character string");
+        return s[0];
+    }
+};
+
+template <>
+struct WireDecoder<std::string> {
+    static std::string read(WireReader& in) { return in.string(); }
+};
+
+template <class T>
+constexpr bool is_wire_number_v = std::is_arithmetic_v<T> && !std::is_same_v<T, bool> && !std::is_same_v<T, char>;
+
+template <class T>
+struct WireDecoder<std::vector<T>> {
+    static std::vector<T> read(WireReader& in) {
+        uint32_t n = in.begin_list();
+        std::vector<T> out;
+        if constexpr (is_wire_number_v<T>) {
+            if (char kind = in.packed(n)) {
+                const char* block = in.take_packed();
+                out.resize(n);
+                if ((kind == 'i' && std::is_integral_v<T> && std::is_signed_v<T> && sizeof(T) == 8) ||
+                    (kind == 'd' && std::is_same_v<T, double>)) {
+                    std::memcpy(out.data(), block, static_cast<size_t>(n) * 8);
+                } else if (kind == 'i') {
+                    for (uint32_t i = 0; i < n; ++i) {
+                        int64_t value;
+                        std::memcpy(&value, block + static_cast<size_t>(i) * 8, 8);
+                        out[i] = static_cast<T>(value);
+                    }
+                } else {
+                    for (uint32_t i = 0; i < n; ++i) {
+                        double value;
+                        std::memcpy(&value, block + static_cast<size_t>(i) * 8, 8);
+                        if (std::is_integral_v<T> && std::floor(value) != value) in.not_integer(value);
+                        out[i] = static_cast<T>(value);
+                    }
+                }
+                return out;
+            }
+        }
+        out.reserve(n);
+        for (uint32_t i = 0; i < n; ++i) out.push_back(wire_decode<T>(in));
+        return out;
+    }
+};
+
+template <class T, size_t N>
+struct WireDecoder<std::array<T, N>> {
+    static std::array<T, N> read(WireReader& in) {
+        std::vector<T> items = wire_decode<std::vector<T>>(in);
+        if (items.size() != N) in.fail("expected an array of " + std::to_string(N) + " items");
+        std::array<T, N> out{};
+        std::move(items.begin(), items.end(), out.begin());
+        return out;
+    }
+};
+
+template <class A, class B>
+struct WireDecoder<std::pair<A, B>> {
+    static std::pair<A, B> read(WireReader& in) {
+        if (in.begin_list() != 2) in.fail("expected a pair");
+        A first = wire_decode<A>(in);
+        B second = wire_decode<B>(in);
+        return {std::move(first), std::move(second)};
+    }
+};
+
+template <class... Ts>
+struct WireDecoder<std::tuple<Ts...>> {
+    static std::tuple<Ts...> read(WireReader& in) {
+        if (in.begin_list() != sizeof...(Ts)) in.fail("expected a tuple of " + std::to_string(sizeof...(Ts)) + " items");
+        // Braced init guarantees left-to-right evaluation
+        return std::tuple<Ts...>{wire_decode<Ts>(in)...};
+    }
+};
+
+template <class T>
+struct WireDecoder<std::optional<T>> {
+    static std::optional<T> read(WireReader& in) {
+        if (in.consume_null()) return std::nullopt;
+        return wire_decode<T>(in);
+    }
+};
+
+template <class M>
+M wire_decode_map(WireReader& in) {
+    if (in.tag() != 'm') in.fail("expected an object");
+    uint32_t n = in.count();
+    M out;
+    for (uint32_t i = 0; i < n; ++i) {
+        std::string key = in.key();
+        out.emplace(std::move(key), wire_decode<typename M::mapped_type>(in));
+    }
+    return out;
+}
+
+template <class T>
+struct WireDecoder<std::map<std::string, T>> {
+    static std::map<std::string, T> read(WireReader& in) { return wire_decode_map<std::map<std::string, T>>(in); }
+};
+
+template <class T>
+struct WireDecoder<std::unordered_map<std::string, T>> {
+    static std::unordered_map<std::string, T> read(WireReader& in) {
+        return wire_decode_map<std::unordered_map<std::string, T>>(in);
+    }
+};
+
+// ---------------------------------------------------------------- encoding
+
+template <class T>
+void wire_put(std::string& out, T value) {
+    out.append(reinterpret_cast<const char*>(&value), sizeof value);
+}
+
+inline void wire_string(std::string& out, const std::string& s) {
+    out += 's';
+    wire_put(out, static_cast<uint32_t>(s.size()));
+    out += s;
+}
+
+inline void wire_encode(std::string& out, bool b) { out += b ? 'T' : 'F'; }
+inline void wire_encode(std::string& out, char c) { wire_string(out, std::string(1, c)); }
+inline void wire_encode(std::string& out, const std::string& s) { wire_string(out, s); }
+inline void wire_encode(std::string& out, const char* s) { wire_string(out, s); }
+
+template <class T>
+std::enable_if_t<std::is_integral_v<T> && !std::is_same_v<T, bool> && !std::is_same_v<T, char>>
+wire_encode(std::string& out, T n) {
+    if constexpr (std::is_unsigned_v<T> && sizeof(T) == 8) {
+        if (n > static_cast<uint64_t>(std::numeric_limits<int64_t>::max())) {
+            out += 'u';
+            wire_put(out, static_cast<uint64_t>(n));
+            return;
+        }
+    }
+    out += 'i';
+    wire_put(out, static_cast<int64_t>(n));
+}
+
+template <class T>
+std::enable_if_t<std::is_floating_point_v<T>>
+wire_encode(std::string& out, T x) {
+    // Same as JSON, where non-finite numbers become null
+    if (!std::isfinite(x)) { out += 'N'; return; }
+    out += 'd';
+    wire_put(out, static_cast<double>(x));
+}
+
+template <class T> void wire_encode(std::string& out, const std::optional<T>& v);
+template <class A, class B> void wire_encode(std::string& out, const std::pair<A, B>& p);
+template <class... Ts> void wire_encode(std::string& out, const std::tuple<Ts...>& t);
+template <class T> void wire_encode(std::string& out, const std::map<std::string, T>& m);
+template <class T> void wire_encode(std::string& out, const std::unordered_map<std::string, T>& m);
+template <class T> void wire_encode(std::string& out, const std::vector<T>& v);
+template <class T, size_t N> void wire_encode(std::string& out, const std::array<T, N>& v);
+
+// Numeric sequences go out packed unless an element needs its own tag
+// (non-finite floats, unsigned values above the int64 range)
+template <class C>
+bool wire_encode_packed(std::string& out, const C& items) {
+    using T = typename C::value_type;
+    if constexpr (is_wire_number_v<T>) {
+        for (const auto& item : items) {
+            if constexpr (std::is_floating_point_v<T>) {
+                if (!std::isfinite(item)) return false;
+            } else if constexpr (std::is_unsigned_v<T> && sizeof(T) == 8) {
+                if (item > static_cast<uint64_t>(std::numeric_limits<int64_t>::max())) return false;
+            }
+        }
+        out += std::is_floating_point_v<T> ? 'D' : 'I';
+        wire_put(out, static_cast<uint32_t>(items.size()));
+        if constexpr (std::is_same_v<T, double> || (std::is_integral_v<T> && std::is_signed_v<T> && sizeof(T) == 8)) {
+            out.append(reinterpret_cast<const char*>(items.data()), items.size() * 8);
+        } else {
+            for (const auto& item : items) {
+                if constexpr (std::is_floating_point_v<T>) wire_put(out, static_cast<double>(item));
+                else wire_put(out, static_cast<int64_t>(item));
+            }
+        }
+        return true;
+    }
+    return false;
+}
+
+template <class C>
+void wire_encode_sequence(std::string& out, const C& items) {
+    if (wire_encode_packed(out, items)) return;
+    out += 'l';
+    wire_put(out, static_cast<uint32_t>(items.size()));
+    for (const auto& item : items) wire_encode(out, static_cast<const typename C::value_type&>(item));
+}
+
+template <class M>
+void wire_encode_map(std::string& out, const M& m) {
+    out += 'm';
+    wire_put(out, static_cast<uint32_t>(m.size()));
+    for (const auto& entry : m) {
+        wire_put(out, static_cast<uint32_t>(entry.first.size()));
+        out += entry.first;
+        wire_encode(out, entry.second);
+    }
+}
+
+template <class T> void wire_encode(std::string& out, const std::vector<T>& v) { wire_encode_sequence(out, v); }
+template <class T, size_t N> void wire_encode(std::string& out, const std::array<T, N>& v) { wire_encode_sequence(out, v); }
+template <class T> void wire_encode(std::string& out, const std::map<std::string, T>& m) { wire_encode_map(out, m); }
+template <class T> void wire_encode(std::string& out, const std::unordered_map<std::string, T>& m) { wire_encode_map(out, m); }
+
+template <class T>
+void wire_encode(std::string& out, const std::optional<T>& v) {
+    if (v) wire_encode(out, *v); else out += 'N';
+}
+
+template <class A, class B>
+void wire_encode(std::string& out, const std::pair<A, B>& p) {
+    out += 'l';
+    wire_put(out, static_cast<uint32_t>(2));
+    wire_encode(out, p.first);
+    wire_encode(out, p.second);
+}
+
+template <class... Ts>
+void wire_encode(std::string& out, const std::tuple<Ts...>& t) {
+    out += 'l';
+    wire_put(out, static_cast<uint32_t>(sizeof...(Ts)));
+    std::apply([&](const auto&... item) { (wire_encode(out, item), ...); }, t);
+}
+
+// ---------------------------------------------------------------- calling
+
+// Argument lists and return values for invoke() in leetvibe_json.hpp
+inline void begin_arguments(WireReader& in, size_t count) {
+    uint32_t n = in.begin_list();
+    if (n != count) {
+        in.fail("expected " + std::to_string(count) + " arguments, got " + std::to_string(n));
+    }
+}
+
+template <class T>
+T decode_argument(WireReader& in, bool&) { return wire_decode<T>(in); }
+
+inline void end_arguments(WireReader& in, size_t) {
+    if (!in.at_end()) in.fail("trailing data after the arguments");
+}
+
+template <class T>
+void encode_result(WireReader&, std::string& out, const T& value) { wire_encode(out, value); }
+
+}  // namespace leetvibe
+
+#endif  // LEETVIBE_WIRE_HPP
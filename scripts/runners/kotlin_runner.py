@@ -1,15 +1,37 @@
 """
 Kotlin Test Runner for LeetVibe
+
+Compiles the solution once with kotlinc, together with a harness generated
+from the function's signature (see runners/signatures.py) and the JSON
+runtime in include/LeetvibeJson.kt, and runs every test case in a single
+JVM. Arguments are decoded straight into the parameter types (IntArray,
+List<List<Int>>, String, data classes, ...), so functions may take several
+arguments and no Gson or casts are needed.
+
+Builds are cached under ~/.leetvibe/cache/kotlin, keyed by the generated
+source, the runtime and the compiler, so resubmitting an unchanged solution
+skips kotlinc entirely.
 """
 
-import json
+import hashlib
 import shutil
 import tempfile
-import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+from .base_runner import BaseRunner, TestResult, executable_identity
+from .signatures import (
+    SignatureError, kotlin_call_case, kotlin_struct_codecs, parse_kotlin_signature,
+)
+
+# JSON reader/writer and batch driver compiled into every harness
+RUNTIME_PATH = Path(__file__).parent / 'include' / 'LeetvibeJson.kt'
+
+# Compile timeout (seconds)
+COMPILE_TIMEOUT = 120
 
-from .base_runner import BaseRunner, TestResult
+# Shared cache for compiled harnesses
+KOTLIN_CACHE_DIR = Path.home() / '.leetvibe' / 'cache' / 'kotlin'
 
 
 class KotlinRunner(BaseRunner):
@@ -28,97 +50,65 @@ class KotlinRunner(BaseRunner):
         self.temp_dir = tempfile.mkdtemp()
         self.jar_path = None
 
-    def _find_kotlin(self) -> tuple[str, str] | None:
-        """Find Kotlin compiler and runner."""
-        kotlinc = shutil.which('kotlinc')
-        kotlin = shutil.which('kotlin')
-        if kotlinc and kotlin:
-            return kotlinc, kotlin
-        return None
+    def toolchain_id(self) -> str:
+        return f"{executable_identity('kotlinc')} {executable_identity('java')}"
 
-    def compile(self) -> tuple[bool, str | None]:
-        """Compile Kotlin to JAR."""
-        kt = self._find_kotlin()
-        if not kt:
-            return False, "Kotlin compiler not found (kotlinc)"
+    def _harness_source(self) -> str:
+        """The solution followed by the generated decode/call/encode code."""
+        solution = self.solution_path.read_text()
+        signature = parse_kotlin_signature(solution, self.function_name)
+        return f'''{solution}
+
+// ---- LeetVibe harness (generated from the signature of {self.function_name}) ----
 
-        kotlinc, _ = kt
-        self.jar_path = Path(self.temp_dir) / 'solution.jar'
-
-        # Read the solution
-        with open(self.solution_path, 'r') as f:
-            solution_code = f.read()
-
-        # Create wrapper with main function
-        wrapper = f'''
-import com.google.gson.Gson
-
-{solution_code}
-
-fun main(args: Array<String>) {{
-    val gson = Gson()
-    val input = gson.fromJson(args[0], List::class.java)
-
-    // Call the solution function
-    val result = when (input.size) {{
-        1 -> {{
-            val arg = input[0]
-            when (arg) {{
-                is Number -> {self.function_name}(arg.toInt())
-                is String -> {self.function_name}(arg)
-                is List<*> -> {self.function_name}(arg.map {{ (it as Number).toInt() }})
-                else -> throw IllegalArgumentException("Unsupported type")
-            }}
-        }}
-        else -> throw IllegalArgumentException("Multiple args not supported")
-    }}
-
-    println(gson.toJson(result))
+{kotlin_struct_codecs(signature.structs)}
+fun leetvibeCallCase(r: LeetvibeReader, w: LeetvibeWriter) {{
+{kotlin_call_case(signature)}
 }}
-'''
 
-        wrapper_path = Path(self.temp_dir) / 'Wrapper.kt'
-        with open(wrapper_path, 'w') as f:
-            f.write(wrapper)
-
-        # Try to compile (might fail if Gson not available)
-        stdout, stderr, returncode = self._run_process([
-            kotlinc,
-            '-include-runtime',
-            '-d', str(self.jar_path),
-            str(wrapper_path)
-        ], timeout=60)
-
-        if returncode != 0:
-            # Try simpler version without Gson
-            simple_wrapper = f'''
-{solution_code}
-
-fun main(args: Array<String>) {{
-    // Simple single-int argument support
-    val input = args[0].trim('[', ']').toIntOrNull()
-    if (input != null) {{
-        val result = {self.function_name}(input)
-        println(result)
-    }} else {{
-        System.err.println("Only integer inputs supported in simple mode")
-    }}
+fun main() {{
+    leetvibeRunBatch(::leetvibeCallCase)
 }}
 '''
-            with open(wrapper_path, 'w') as f:
-                f.write(simple_wrapper)
 
-            stdout, stderr, returncode = self._run_process([
-                kotlinc,
-                '-include-runtime',
-                '-d', str(self.jar_path),
-                str(wrapper_path)
-            ], timeout=60)
+    def compile(self) -> tuple[bool, str | None]:
+        """Compile the solution and harness to a JAR, reusing a cached build when possible."""
+        kotlinc = shutil.which('kotlinc')
+        if not kotlinc:
+            return False, "Kotlin compiler not found (kotlinc)"
+        if not shutil.which('java'):
+            return False, "Java runtime not found (java)"
+        try:
+            source = self._harness_source()
+        except SignatureError as e:
+            return False, f"Cannot generate a test harness: {e}"
 
-            if returncode != 0:
-                return False, stderr.strip() or "Kotlin compilation failed"
+        digest = hashlib.sha256()
+        for part in (source, RUNTIME_PATH.read_text(), self.toolchain_id()):
+            digest.update(part.encode())
+        self.jar_path = KOTLIN_CACHE_DIR / f'{digest.hexdigest()[:16]}.jar'
 
-        return True, None
+        wrapper_path = Path(self.temp_dir) / 'Wrapper.kt'
+        wrapper_path.write_text(source)
+
+        def build(output: Path) -> tuple[bool, str | None]:
+            # kotlinc picks the output format from the extension
+            jar = output.with_name(output.name + '.jar')
+            _, stderr, returncode = self._run_process([
+                kotlinc, '-nowarn', '-include-runtime',
+                '-d', str(jar),
+                str(RUNTIME_PATH), str(wrapper_path),
+            ], timeout=COMPILE_TIMEOUT)
+            if returncode == 0 and jar.exists():
+                jar.replace(output)
+            jar.unlink(missing_ok=True)
+            return returncode == 0, stderr.strip() or "Kotlin compilation failed"
+
+        return self._cached_build(self.jar_path, build)
+
+    def iter_results(self, test_cases: list[dict] = None) -> Iterator[TestResult]:
+        """Run every test case in one JVM, yielding results as they stream in."""
+        yield from self._iter_batch(['java', '-jar', str(self.jar_path)], test_cases)
 
     def run_single_test(self, input_data: list, expected: Any) -> TestResult:
         """Run a single test case."""
@@ -132,53 +122,5 @@ fun main(args: Array<String>) {{
                 execution_time_ms=0
             )
 
-        kt = self._find_kotlin()
-        if not kt:
-            return TestResult(
-                passed=False,
-                input_data=input_data,
-                expected=expected,
-                actual=None,
-                error="Kotlin runtime not found",
-                execution_time_ms=0
-            )
-
-        _, kotlin = kt
-        start_time = time.time()
-
-        stdout, stderr, returncode = self._run_process([
-            'java', '-jar', str(self.jar_path), json.dumps(input_data)
-        ])
-
-        execution_time = (time.time() - start_time) * 1000
-
-        if returncode != 0:
-            return TestResult(
-                passed=False,
-                input_data=input_data,
-                expected=expected,
-                actual=None,
-                error=stderr.strip() or "Runtime error",
-                execution_time_ms=execution_time
-            )
-
-        try:
-            actual = json.loads(stdout.strip())
-        except json.JSONDecodeError:
-            output = stdout.strip()
-            try:
-                actual = int(output)
-            except ValueError:
-                try:
-                    actual = float(output)
-                except ValueError:
-                    actual = output
-
-        passed = self._values_equal(expected, actual)
-        return TestResult(
-            passed=passed,
-            input_data=input_data,
-            expected=expected,
-            actual=actual,
-            execution_time_ms=execution_time
-        )
+        test_case = {'input': input_data, 'expected': expected}
+        return next(self._iter_batch(['java', '-jar', str(self.jar_path)], [test_case]))
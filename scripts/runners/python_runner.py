@@ -1,14 +1,140 @@
 """
 Python Test Runner for LeetVibe
+
+The interpreter is selectable (runner option "python", e.g. "pypy3" or
+"python3.12"); python3 is used by default. With runner option "worker" (a
+WarmPythonWorker), cases run in a long-lived worker instead of a fresh
+interpreter per case.
 """
 
 import json
+import os
+import queue
+import shutil
+import subprocess
 import tempfile
+import threading
 import time
 from pathlib import Path
 from typing import Any
 
-from .base_runner import BaseRunner, TestResult
+import metrics
+
+from .base_runner import BaseRunner, BatchError, TestResult, executable_identity
+
+# Worker script that loads the solution, runs one case and compares in-process
+WORKER_PATH = Path(__file__).parent / 'python_worker.py'
+
+# Interpreter used when none is selected
+DEFAULT_INTERPRETER = 'python3'
+
+# Where syntax checks write their bytecode, so solution directories stay clean
+PYCACHE_PREFIX = Path(tempfile.gettempdir()) / 'leetvibe-pycache'
+
+# Interpreters looked for on PATH when comparing interpreters
+KNOWN_INTERPRETERS = [
+    'python3', 'python3.9', 'python3.10', 'python3.11', 'python3.12',
+    'python3.13', 'python3.14', 'pypy3',
+]
+
+# Prints e.g. "CPython 3.12.1" and the real path of the interpreter binary
+PROBE_SNIPPET = (
+    'import os, platform, sys; '
+    'print(platform.python_implementation(), platform.python_version()); '
+    'print(os.path.realpath(sys.executable))'
+)
+
+
+def probe_interpreter(interpreter: str) -> tuple[str, str] | None:
+    """(version label, real executable path) of an interpreter, or None if it can't run."""
+    if not shutil.which(interpreter):
+        return None
+    try:
+        result = subprocess.run([interpreter, '-c', PROBE_SNIPPET],
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or len(lines) != 2:
+        return None
+    return lines[0], lines[1]
+
+
+def find_interpreters(candidates: list[str] = None) -> list[tuple[str, str]]:
+    """
+    (interpreter, version label) for each of candidates (default:
+    KNOWN_INTERPRETERS) that runs, skipping names that resolve to an
+    interpreter already listed (aliases, pyenv shims).
+    """
+    found = []
+    seen = set()
+    for interpreter in candidates or KNOWN_INTERPRETERS:
+        probe = probe_interpreter(interpreter)
+        if not probe or probe[1] in seen:
+            continue
+        seen.add(probe[1])
+        found.append((interpreter, probe[0]))
+    return found
+
+
+class WarmPythonWorker:
+    """
+    A python_worker.py --serve process kept alive across runs, so repeated
+    runs (see watch.py) skip interpreter startup. The process is started on
+    first use and restarted after a crash or timeout.
+    """
+
+    def __init__(self, interpreter: str = DEFAULT_INTERPRETER):
+        self.interpreter = interpreter
+        self.proc = None
+        self.lines = None
+
+    def _start(self) -> None:
+        self.proc = subprocess.Popen(
+            [self.interpreter, str(WORKER_PATH), '--serve'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        self.lines = queue.Queue()
+
+        def pump(proc, lines):
+            for line in proc.stdout:
+                lines.put(line)
+            lines.put(None)
+
+        threading.Thread(target=pump, args=(self.proc, self.lines), daemon=True).start()
+
+    def request(self, payload: dict, timeout: float) -> dict:
+        """
+        Send one request and wait for its verdict.
+
+        Raises:
+            BatchError: if the worker crashed or did not answer within timeout
+        """
+        if self.proc is None or self.proc.poll() is not None:
+            self._start()
+        try:
+            self.proc.stdin.write(json.dumps(payload) + '\n')
+            self.proc.stdin.flush()
+            line = self.lines.get(timeout=timeout)
+        except OSError:
+            line = None
+        except queue.Empty:
+            self.close()
+            raise BatchError(f'Timeout: exceeded {timeout}s')
+        if line is None:
+            self.close()
+            raise BatchError("Runtime error (worker exited)")
+        return json.loads(line)
+
+    def close(self) -> None:
+        if self.proc is not None:
+            if self.proc.poll() is None:
+                self.proc.kill()
+            self.proc.wait()
+            self.proc = None
 
 
 class PythonRunner(BaseRunner):
@@ -22,87 +148,137 @@ class PythonRunner(BaseRunner):
     def file_extensions(self) -> list[str]:
         return [".py"]
 
+    @property
+    def interpreter(self) -> str:
+        return self.options.get('python') or DEFAULT_INTERPRETER
+
+    def toolchain_id(self) -> str:
+        return executable_identity(self.interpreter)
+
     def compile(self) -> tuple[bool, str | None]:
         """Python doesn't need compilation, just syntax check."""
-        # Do a syntax check by trying to compile the file
-        try:
-            with open(self.solution_path, 'r') as f:
-                source = f.read()
-            compile(source, str(self.solution_path), 'exec')
-            return True, None
-        except SyntaxError as e:
-            return False, f"Syntax error at line {e.lineno}: {e.msg}"
-        except Exception as e:
-            return False, str(e)
-
-    def run_single_test(self, input_data: list, expected: Any) -> TestResult:
-        """Run a single test case using Python."""
-        start_time = time.time()
+        if not shutil.which(self.interpreter):
+            return False, f"Python interpreter not found: {self.interpreter}"
 
-        # Read the solution code directly to avoid import issues with numeric filenames
-        with open(self.solution_path, 'r') as f:
-            solution_code = f.read()
+        # Check syntax with the selected interpreter, whose grammar may differ
+        # from this process's; bytecode goes to a temp prefix, not solutions/
+        env = {**os.environ, 'PYTHONPYCACHEPREFIX': str(PYCACHE_PREFIX)}
+        _, stderr, returncode = self._run_process(
+            [self.interpreter, '-m', 'py_compile', str(self.solution_path)], env=env)
+        if returncode != 0:
+            return False, stderr.strip() or "Syntax check failed"
+        return True, None
 
-        # Create a test wrapper script that includes the solution inline
-        wrapper = f'''
-import json
-import sys
+    def run_test_case(self, test_case: dict) -> TestResult:
+        """
+        Run one test case, measuring peak memory if it has a max_mb or the
+        measure_memory option is set.
+        """
+        measure_memory = test_case.get('max_mb') is not None or bool(self.options.get('measure_memory'))
+        return self.run_single_test(test_case.get('input', []), test_case.get('expected'),
+                                    measure_memory=measure_memory)
 
-# Solution code (included directly to avoid import issues)
-{solution_code}
+    def run_single_test(self, input_data: list, expected: Any,
+                        measure_memory: bool = False) -> TestResult:
+        """Run a single test case using Python.
 
-# Parse input
-input_data = json.loads(sys.argv[1])
+        The solution runs in python_worker.py, which also compares the output
+        with the quiz's comparator, so large outputs never have to be
+        serialized back to this process. With measure_memory the worker also
+        reports the call's peak memory.
+        """
+        if self.options.get('worker'):
+            return self._run_in_worker(self.options['worker'], input_data, expected, measure_memory)
 
-# Call the function
-result = {self.function_name}(*input_data)
+        start_time = time.time()
 
-# Output result as JSON
-print(json.dumps(result))
-'''
+        payload = {
+            'input': input_data,
+            'expected': expected,
+            'comparator': self.comparator_spec,
+            'echo': self.options.get('echo_actual', False),
+            'measure_memory': measure_memory,
+        }
+        stdout, stderr, returncode = self._run_with_input(
+            [self.interpreter, str(WORKER_PATH), str(self.solution_path.absolute()), self.function_name],
+            payload
+        )
 
-        # Write wrapper to temp file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(wrapper)
-            wrapper_path = f.name
+        execution_time = (time.time() - start_time) * 1000
+
+        if returncode != 0:
+            return TestResult(
+                passed=False,
+                input_data=input_data,
+                expected=expected,
+                actual=None,
+                error=stderr.strip() or "Runtime error",
+                execution_time_ms=execution_time
+            )
 
         try:
-            stdout, stderr, returncode = self._run_process(
-                ['python3', wrapper_path, json.dumps(input_data)]
+            verdict = json.loads(stdout.strip().splitlines()[-1])
+        except (json.JSONDecodeError, IndexError):
+            return TestResult(
+                passed=False,
+                input_data=input_data,
+                expected=expected,
+                actual=stdout.strip(),
+                error="Invalid output format",
+                execution_time_ms=execution_time
             )
 
-            execution_time = (time.time() - start_time) * 1000
-
-            if returncode != 0:
-                return TestResult(
-                    passed=False,
-                    input_data=input_data,
-                    expected=expected,
-                    actual=None,
-                    error=stderr.strip() or "Runtime error",
-                    execution_time_ms=execution_time
-                )
-
-            try:
-                actual = json.loads(stdout.strip())
-            except json.JSONDecodeError:
-                return TestResult(
-                    passed=False,
-                    input_data=input_data,
-                    expected=expected,
-                    actual=stdout.strip(),
-                    error="Invalid output format",
-                    execution_time_ms=execution_time
-                )
-
-            passed = self._values_equal(expected, actual)
+        # The worker compares in-process; record its comparison time here
+        if 'compare_ms' in verdict:
+            metrics.record('compare', verdict['compare_ms'], language=self.language)
+
+        return TestResult(
+            passed=verdict['passed'],
+            input_data=input_data,
+            expected=expected,
+            actual=verdict.get('actual'),
+            execution_time_ms=verdict.get('time_ms', execution_time),
+            mismatch=verdict.get('mismatch'),
+            peak_mb=verdict.get('peak_mb')
+        )
+
+    def _run_in_worker(self, worker: WarmPythonWorker, input_data: list, expected: Any,
+                       measure_memory: bool = False) -> TestResult:
+        """Run a single test case in a warm worker."""
+        start_time = time.time()
+        payload = {
+            'solution': str(self.solution_path.absolute()),
+            'function': self.function_name,
+            'input': input_data,
+            'expected': expected,
+            'comparator': self.comparator_spec,
+            'echo': self.options.get('echo_actual', False),
+            'measure_memory': measure_memory,
+        }
+        try:
+            verdict = worker.request(payload, self.TIMEOUT_SECONDS)
+        except BatchError as e:
+            verdict = {'error': str(e)}
+        execution_time = (time.time() - start_time) * 1000
+
+        if 'error' in verdict:
             return TestResult(
-                passed=passed,
+                passed=False,
                 input_data=input_data,
                 expected=expected,
-                actual=actual,
+                actual=None,
+                error=verdict['error'],
                 execution_time_ms=execution_time
             )
 
-        finally:
-            Path(wrapper_path).unlink(missing_ok=True)
+        if 'compare_ms' in verdict:
+            metrics.record('compare', verdict['compare_ms'], language=self.language)
+        return TestResult(
+            passed=verdict['passed'],
+            input_data=input_data,
+            expected=expected,
+            actual=verdict.get('actual'),
+            execution_time_ms=verdict['time_ms'],
+            mismatch=verdict.get('mismatch'),
+            peak_mb=verdict.get('peak_mb')
+        )
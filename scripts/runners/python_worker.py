@@ -0,0 +1,172 @@
+"""
+Python Worker for LeetVibe
+
+Runs one test case against a Python solution inside a single process and
+compares the output there, so only a verdict and a short mismatch summary
+have to cross the process boundary.
+
+Usage:
+    python3 python_worker.py <solution_path> <function_name>
+    python3 python_worker.py --serve
+
+The payload {"input": [...], "expected": ..., "comparator": {...}, "echo": bool,
+"measure_memory": bool} is read from the input transport (LEETVIBE_INPUT_FILE
+or stdin). One JSON line is written to stdout:
+    {"passed": bool, "mismatch": str | null, "time_ms": float, "compare_ms": float, "actual": ...}
+
+time_ms covers only the solution call, not interpreter startup or loading;
+compare_ms covers the output comparison. When the payload sets
+"measure_memory", the verdict also has "peak_mb": the memory allocated at the peak of a second,
+traced call on a copy of the input (tracing would distort time_ms).
+
+"actual" is omitted when the output holds more than ACTUAL_ECHO_LIMIT values,
+unless the payload sets "echo".
+Exceptions raised by the solution propagate (traceback on stderr, exit 1).
+
+With --serve the worker stays up (see PythonRunner's warm worker, used by
+`leetvibe watch`) and answers one request per stdin line,
+    {"solution": path, "function": name, "input": [...], "expected": ..., "comparator": {...},
+     "echo": bool, "measure_memory": bool}
+with one verdict line each. The solution is re-executed only when its source
+changes, each comparator spec is built once (a custom checker is imported
+once per version of its file), and an exception in the solution is reported as {"error": "..."}
+instead of ending the worker. Output printed by the solution goes to stderr.
+
+This file runs under whichever interpreter the user selected, so it only
+uses the standard library and comparators.py from the same directory.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import mmap
+import os
+import sys
+import time
+import tracemalloc
+import traceback
+
+from comparators import get_comparator
+
+# Environment variable naming the file that holds a large payload
+INPUT_FILE_ENV = 'LEETVIBE_INPUT_FILE'
+
+# Largest output (counted in scalar values) echoed back to the runner
+ACTUAL_ECHO_LIMIT = 4096
+
+
+def read_payload():
+    """Read the JSON payload from the memory-mapped input file or stdin."""
+    path = os.environ.get(INPUT_FILE_ENV)
+    if path:
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return json.loads(mm[:])
+    return json.loads(sys.stdin.buffer.read())
+
+
+def is_small(value) -> bool:
+    """Check whether a value holds at most ACTUAL_ECHO_LIMIT scalars, without serializing it."""
+    budget = ACTUAL_ECHO_LIMIT
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, str):
+            budget -= len(item) // 64
+        budget -= 1
+        if budget < 0:
+            return False
+    return True
+
+
+def to_json(value):
+    """json.dumps fallback for values JSON has no form for."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    return repr(value)
+
+
+def load_function(solution_path: str, function_name: str, source: str = None):
+    """Execute the solution source in a fresh namespace and return the function."""
+    if source is None:
+        with open(solution_path, 'r') as f:
+            source = f.read()
+    namespace = {'__name__': '__leetvibe_solution__', '__file__': solution_path}
+    exec(compile(source, solution_path, 'exec'), namespace)
+    return namespace[function_name]
+
+
+def peak_memory_mb(func, input_data: list) -> float:
+    """Peak memory allocated while calling the solution, in MB."""
+    tracemalloc.start()
+    try:
+        func(*input_data)
+        return tracemalloc.get_traced_memory()[1] / (1 << 20)
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(func, payload: dict, compare=None) -> dict:
+    """Call the solution on one payload and build its verdict."""
+    input_data = payload['input']
+    # Copied before the timed call, which may mutate its arguments
+    traced_input = copy.deepcopy(input_data) if payload.get('measure_memory') else None
+    start = time.perf_counter()
+    actual = func(*input_data)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if compare is None:
+        compare = get_comparator(payload.get('comparator'))
+    start = time.perf_counter()
+    passed, mismatch = compare(payload.get('expected'), actual, input_data)
+    compare_ms = (time.perf_counter() - start) * 1000
+
+    verdict = {'passed': passed, 'mismatch': mismatch, 'time_ms': elapsed_ms, 'compare_ms': compare_ms}
+    if traced_input is not None:
+        verdict['peak_mb'] = peak_memory_mb(func, traced_input)
+    if payload.get('echo') or is_small(actual):
+        verdict['actual'] = actual
+    return verdict
+
+
+def serve():
+    """Answer requests from stdin until it closes, reloading changed solutions."""
+    out = sys.stdout
+    sys.stdout = sys.stderr  # keep the solution's prints out of the verdict stream
+    loaded = {}  # (solution, function) -> (source, func)
+    comparators = {}  # comparator spec as JSON -> comparator
+    for line in sys.stdin:
+        try:
+            request = json.loads(line)
+            key = (request['solution'], request['function'])
+            with open(key[0], 'r') as f:
+                source = f.read()
+            if key not in loaded or loaded[key][0] != source:
+                loaded[key] = (source, load_function(*key, source=source))
+            spec = json.dumps(request.get('comparator'), sort_keys=True)
+            if spec not in comparators:
+                comparators[spec] = get_comparator(request.get('comparator'))
+            verdict = run_case(loaded[key][1], request, comparators[spec])
+        except Exception:
+            verdict = {'error': traceback.format_exc().strip()}
+        out.write(json.dumps(verdict, default=to_json) + '\n')
+        out.flush()
+
+
+def main():
+    if sys.argv[1:] == ['--serve']:
+        serve()
+        return
+    solution_path, function_name = sys.argv[1], sys.argv[2]
+    payload = read_payload()
+    func = load_function(solution_path, function_name)
+    sys.stdout.write(json.dumps(run_case(func, payload), default=to_json) + '\n')
+
+
+if __name__ == '__main__':
+    main()
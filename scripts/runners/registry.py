@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Runner Registry for LeetVibe
+
+Runners are declared here by language, with the file extensions they
+handle, what they can do and which tools they need, without importing them:
+a runner's module is imported only when a solution in its language is run,
+so adding a language costs nothing for the others.
+
+Capabilities:
+    compile_cache  compiled output is cached across runs
+    batch          all cases run in one process (iter_results is overridden)
+    parallel       cases run in independent processes and may run concurrently
+    warm_worker    cases can run in a long-lived worker (see watch.py)
+    binary_wire    the batch harness accepts the binary wire format (wire.py)
+
+check_solution picks the execution strategy from these: batch runners get
+one process, parallel runners get up to MAX_JOBS concurrent cases, and
+large batches go to binary_wire runners in the binary wire format.
+
+Third-party runners register through the "leetvibe.runners" entry point
+group, named by the file extension they handle (without the dot):
+
+    [project.entry-points."leetvibe.runners"]
+    go = "leetvibe_go:GoRunner"
+
+The class may set LANGUAGE, CAPABILITIES and REQUIRES attributes. Entry
+points are only scanned for extensions no built-in runner handles.
+
+Usage:
+    python registry.py [--json]
+"""
+
+import importlib
+import json
+import os
+import shutil
+import sys
+from dataclasses import dataclass, field
+
+ENTRY_POINT_GROUP = 'leetvibe.runners'
+
+COMPILE_CACHE = 'compile_cache'
+BATCH = 'batch'
+PARALLEL = 'parallel'
+WARM_WORKER = 'warm_worker'
+BINARY_WIRE = 'binary_wire'
+
+# Most cases a parallel runner runs at once
+MAX_JOBS = 8
+
+
+@dataclass(frozen=True)
+class RunnerSpec:
+    """
+    A runner declaration. requires lists the tools needed on PATH, each
+    entry a tuple of alternatives of which one is enough.
+    """
+    language: str
+    module: str
+    class_name: str
+    extensions: tuple[str, ...]
+    capabilities: frozenset = frozenset()
+    requires: tuple[tuple[str, ...], ...] = ()
+    external: bool = field(default=False, compare=False)
+
+    def supports(self, capability: str) -> bool:
+        return capability in self.capabilities
+
+    def missing_tools(self) -> list[str]:
+        """Requirements with no alternative found on PATH, as 'a or b'."""
+        return [' or '.join(options) for options in self.requires
+                if not any(shutil.which(tool) for tool in options)]
+
+
+# Quiz language per solution file extension, shared by the hook, the quiz
+# bank and the manifest. JavaScript runs on the TypeScript runner but its
+# quizzes are generated and tracked as their own language.
+EXTENSION_LANGUAGES = {
+    '.py': 'python',
+    '.ts': 'typescript', '.tsx': 'typescript',
+    '.js': 'javascript', '.jsx': 'javascript',
+    '.cpp': 'cpp', '.cc': 'cpp', '.cxx': 'cpp',
+    '.swift': 'swift',
+    '.kt': 'kotlin', '.kts': 'kotlin',
+}
+
+# Extension of new solution files per quiz language: its first one above
+LANGUAGE_EXTENSIONS = {language: ext for ext, language in reversed(EXTENSION_LANGUAGES.items())}
+
+RUNNERS: dict[str, RunnerSpec] = {}
+_BY_EXTENSION: dict[str, RunnerSpec] = {}
+_loaded_classes: dict[RunnerSpec, type] = {}
+_entry_points = None
+
+
+def register_runner(spec: RunnerSpec) -> RunnerSpec:
+    """Add a runner, replacing any existing runner for its extensions."""
+    RUNNERS[spec.language] = spec
+    for ext in spec.extensions:
+        _BY_EXTENSION[ext] = spec
+    return spec
+
+
+register_runner(RunnerSpec(
+    'python', 'runners.python_runner', 'PythonRunner', ('.py',),
+    frozenset({PARALLEL, WARM_WORKER}), (('python3',),),
+))
+register_runner(RunnerSpec(
+    'typescript', 'runners.typescript_runner', 'TypeScriptRunner', ('.ts', '.tsx', '.js', '.jsx'),
+    frozenset({PARALLEL}), (('tsx', 'ts-node', 'npx', 'bun', 'node'),),
+))
+register_runner(RunnerSpec(
+    'cpp', 'runners.cpp_runner', 'CppRunner', ('.cpp', '.cc', '.cxx'),
+    frozenset({COMPILE_CACHE, BATCH, BINARY_WIRE}), (('clang++', 'g++', 'c++'),),
+))
+register_runner(RunnerSpec(
+    'swift', 'runners.swift_runner', 'SwiftRunner', ('.swift',),
+    frozenset({COMPILE_CACHE, BATCH}), (('swiftc',),),
+))
+register_runner(RunnerSpec(
+    'kotlin', 'runners.kotlin_runner', 'KotlinRunner', ('.kt', '.kts'),
+    frozenset({COMPILE_CACHE, BATCH}), (('kotlinc',), ('java',)),
+))
+
+
+def _external_runners() -> dict[str, tuple[str, str]]:
+    """Entry point runners as {extension: (module, class)}, scanned once."""
+    global _entry_points
+    if _entry_points is None:
+        _entry_points = {}
+        try:
+            from importlib.metadata import entry_points
+            for ep in entry_points(group=ENTRY_POINT_GROUP):
+                module, _, class_name = ep.value.partition(':')
+                _entry_points['.' + ep.name.lstrip('.').lower()] = (module.strip(), class_name.strip())
+        except Exception:
+            pass
+    return _entry_points
+
+
+def find_runner(ext: str) -> RunnerSpec | None:
+    """The runner for a file extension, or None if no runner handles it."""
+    ext = ext.lower()
+    if ext in _BY_EXTENSION:
+        return _BY_EXTENSION[ext]
+    if ext not in _external_runners():
+        return None
+
+    module, class_name = _external_runners()[ext]
+    try:
+        cls = getattr(importlib.import_module(module), class_name)
+    except (ImportError, AttributeError):
+        return None
+    spec = RunnerSpec(
+        language=getattr(cls, 'LANGUAGE', ext.lstrip('.')),
+        module=module,
+        class_name=class_name,
+        extensions=(ext,),
+        capabilities=frozenset(getattr(cls, 'CAPABILITIES', ())),
+        requires=tuple(tuple(r) for r in getattr(cls, 'REQUIRES', ())),
+        external=True,
+    )
+    _BY_EXTENSION[ext] = spec
+    _loaded_classes[spec] = cls
+    return spec
+
+
+def load_runner_class(spec: RunnerSpec) -> type:
+    """Import a runner's module and return its class."""
+    if spec not in _loaded_classes:
+        _loaded_classes[spec] = getattr(importlib.import_module(spec.module), spec.class_name)
+    return _loaded_classes[spec]
+
+
+def is_supported(filename: str) -> bool:
+    return find_runner(os.path.splitext(filename)[1]) is not None
+
+
+def builtin_extensions() -> list[str]:
+    return list(_BY_EXTENSION)
+
+
+def language_extensions(language: str) -> list[str]:
+    """Solution file extensions of a quiz language."""
+    return [ext for ext, lang in EXTENSION_LANGUAGES.items() if lang == language]
+
+
+def parallel_jobs(spec: RunnerSpec, case_count: int) -> int:
+    """How many cases to run at once for a runner."""
+    if spec.supports(BATCH) or not spec.supports(PARALLEL):
+        return 1
+    return max(1, min(MAX_JOBS, os.cpu_count() or 1, case_count))
+
+
+def describe() -> list[dict]:
+    """Every known runner, built-in and entry point, with toolchain status."""
+    for ext in _external_runners():
+        find_runner(ext)
+    specs = list(dict.fromkeys(_BY_EXTENSION.values()))
+    return [{
+        'language': spec.language,
+        'extensions': list(spec.extensions),
+        'capabilities': sorted(spec.capabilities),
+        'missing': spec.missing_tools(),
+        'source': 'entry point' if spec.external else 'built-in',
+    } for spec in specs]
+
+
+def main():
+    runners = describe()
+    if '--json' in sys.argv[1:]:
+        print(json.dumps(runners, indent=2))
+        return
+
+    print("\n  LeetVibe Runners")
+    print("  ================\n")
+    for runner in runners:
+        status = f"missing {', '.join(runner['missing'])}" if runner['missing'] else 'ready'
+        print(f"  {runner['language']:<12} {' '.join(runner['extensions']):<22} {status}")
+        capabilities = ', '.join(runner['capabilities']) or 'none'
+        print(f"  {'':<12} capabilities: {capabilities} ({runner['source']})")
+    print()
+
+
+if __name__ == '__main__':
+    main()
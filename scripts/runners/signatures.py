@@ -0,0 +1,493 @@
+"""
+Function Signatures for LeetVibe Harnesses
+
+Parses the signature of the function under test from a Swift or Kotlin
+solution, along with the simple structs (Swift `struct`, Kotlin
+`data class`) it uses, and generates statically typed code that decodes
+each argument from the batch input and encodes the result. The generated
+code calls the JSON reader and writer in include/LeetvibeJson.swift and
+include/LeetvibeJson.kt, so no reflection or dynamic casts run per case.
+
+Supported types: integers, floating point, booleans, strings, characters,
+arrays and lists of any supported type (nested to any depth), optionals and
+simple structs of supported fields (JSON objects keyed by field name).
+"""
+
+import re
+from dataclasses import dataclass, field
+
+
+class SignatureError(ValueError):
+    """The function was not found or uses a type the harness cannot marshal."""
+
+
+@dataclass(frozen=True)
+class TypeRef:
+    """
+    A parsed type. kind is one of int, long, double, bool, string, char,
+    list, optional, struct or void; spelling is the type as written.
+    """
+    kind: str
+    spelling: str
+    element: 'TypeRef | None' = None
+
+
+@dataclass(frozen=True)
+class Param:
+    name: str
+    type: TypeRef
+    label: str | None = None  # Swift argument label (None for `_`)
+    inout: bool = False
+
+
+@dataclass
+class Signature:
+    name: str
+    params: list[Param]
+    returns: TypeRef
+    method_of: str | None = None  # 'Solution' for LeetCode-style classes
+    throws: bool = False
+    structs: dict[str, list[tuple[str, TypeRef]]] = field(default_factory=dict)
+
+
+def _strip_comments(source: str) -> str:
+    source = re.sub(r'/\*.*?\*/', lambda m: re.sub(r'[^\n]', ' ', m.group()), source, flags=re.S)
+    return re.sub(r'//[^\n]*', '', source)
+
+
+def _matching(source: str, start: int, open_char: str, close_char: str) -> int:
+    """Index of the bracket closing the one at start."""
+    depth = 0
+    for i in range(start, len(source)):
+        if source[i] == open_char:
+            depth += 1
+        elif source[i] == close_char:
+            depth -= 1
+            if depth == 0:
+                return i
+    raise SignatureError(f"Unbalanced '{open_char}' in signature")
+
+
+def _split_top_level(text: str, sep: str = ',') -> list[str]:
+    """Split on sep outside of (), [], <> and {}."""
+    parts, depth, current = [], 0, []
+    for ch in text:
+        if ch in '([<{':
+            depth += 1
+        elif ch in ')]>}':
+            depth -= 1
+        if ch == sep and depth == 0:
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(ch)
+    if ''.join(current).strip():
+        parts.append(''.join(current))
+    return [p.strip() for p in parts]
+
+
+# Scalar spellings per language -> kind
+SWIFT_SCALARS = {
+    'Int': 'int', 'Int32': 'int', 'Int64': 'long', 'UInt': 'int',
+    'Double': 'double', 'Float': 'double', 'CGFloat': 'double',
+    'Bool': 'bool', 'String': 'string', 'Character': 'char',
+}
+KOTLIN_SCALARS = {
+    'Int': 'int', 'Short': 'int', 'Byte': 'int', 'Long': 'long',
+    'Double': 'double', 'Float': 'double',
+    'Boolean': 'bool', 'String': 'string', 'Char': 'char',
+}
+KOTLIN_PRIMITIVE_ARRAYS = {
+    'IntArray': 'Int', 'LongArray': 'Long', 'DoubleArray': 'Double',
+    'FloatArray': 'Float', 'BooleanArray': 'Boolean', 'CharArray': 'Char',
+}
+KOTLIN_LISTS = ('List', 'MutableList', 'ArrayList', 'Array')
+
+
+def parse_swift_type(text: str, structs: set[str]) -> TypeRef:
+    text = text.strip()
+    if text.endswith('?') or text.endswith('!'):
+        return TypeRef('optional', text, parse_swift_type(text[:-1], structs))
+    if text.startswith('[') and text.endswith(']'):
+        inner = text[1:-1]
+        if len(_split_top_level(inner, ':')) > 1:
+            raise SignatureError(f"Unsupported Swift type: {text} (dictionaries)")
+        return TypeRef('list', text, parse_swift_type(inner, structs))
+    if text.startswith('Array<') and text.endswith('>'):
+        return TypeRef('list', text, parse_swift_type(text[6:-1], structs))
+    if text in SWIFT_SCALARS:
+        return TypeRef(SWIFT_SCALARS[text], text)
+    if text in ('Void', '()'):
+        return TypeRef('void', text)
+    if text in structs:
+        return TypeRef('struct', text)
+    raise SignatureError(f"Unsupported Swift type: {text}")
+
+
+def parse_kotlin_type(text: str, structs: set[str]) -> TypeRef:
+    text = text.strip()
+    if text.endswith('?'):
+        return TypeRef('optional', text, parse_kotlin_type(text[:-1], structs))
+    if text in KOTLIN_PRIMITIVE_ARRAYS:
+        return TypeRef('list', text, parse_kotlin_type(KOTLIN_PRIMITIVE_ARRAYS[text], structs))
+    generic = re.fullmatch(r'(\w+)\s*<(.+)>', text, flags=re.S)
+    if generic and generic.group(1) in KOTLIN_LISTS:
+        return TypeRef('list', text, parse_kotlin_type(generic.group(2), structs))
+    if text in KOTLIN_SCALARS:
+        return TypeRef(KOTLIN_SCALARS[text], text)
+    if text == 'Unit':
+        return TypeRef('void', text)
+    if text in structs:
+        return TypeRef('struct', text)
+    raise SignatureError(f"Unsupported Kotlin type: {text}")
+
+
+def _swift_structs(source: str) -> dict[str, list[tuple[str, str]]]:
+    """Stored properties of each struct, in declaration order (memberwise init order)."""
+    structs = {}
+    for match in re.finditer(r'\bstruct\s+(\w+)[^{]*\{', source):
+        body_end = _matching(source, match.end() - 1, '{', '}')
+        body = source[match.end():body_end]
+        fields = []
+        depth = 0
+        # Declarations end at a newline or a semicolon: struct P { let x: Int; var y: Int }
+        for statement in re.split(r'[;\n]', body):
+            if depth == 0:
+                prop = re.match(r'\s*(?:public\s+|private\s+|internal\s+)?(?:let|var)\s+(\w+)\s*:\s*([^={]+?)\s*(=.*)?$', statement)
+                if prop and '{' not in statement:
+                    fields.append((prop.group(1), prop.group(2)))
+            depth += statement.count('{') - statement.count('}')
+        structs[match.group(1)] = fields
+    return structs
+
+
+def _kotlin_structs(source: str) -> dict[str, list[tuple[str, str]]]:
+    """Primary constructor properties of each data class."""
+    structs = {}
+    for match in re.finditer(r'\bdata\s+class\s+(\w+)\s*\(', source):
+        params = source[match.end():_matching(source, match.end() - 1, '(', ')')]
+        fields = []
+        for param in _split_top_level(params):
+            prop = re.match(r'(?:@\w+\s+)*(?:val|var)\s+(\w+)\s*:\s*(.+?)\s*(=.*)?$', param, flags=re.S)
+            if not prop:
+                raise SignatureError(f"Unsupported data class parameter in {match.group(1)}: {param}")
+            fields.append((prop.group(1), prop.group(2)))
+        structs[match.group(1)] = fields
+    return structs
+
+
+def _method_of(source: str, position: int) -> str | None:
+    """'Solution' if position lies inside `class Solution { ... }`."""
+    for match in re.finditer(r'\bclass\s+Solution\b[^{]*\{', source):
+        if match.end() <= position <= _matching(source, match.end() - 1, '{', '}'):
+            return 'Solution'
+    return None
+
+
+def _resolve_structs(raw: dict, parse, roots: list[TypeRef]) -> dict[str, list[tuple[str, TypeRef]]]:
+    """Parse the fields of the structs reachable from roots (other structs may use any types)."""
+    names = set(raw)
+    resolved = {}
+    pending = list(roots)
+    while pending:
+        t = pending.pop()
+        if t.element:
+            pending.append(t.element)
+        elif t.kind == 'struct' and t.spelling not in resolved:
+            resolved[t.spelling] = [(f, parse(text, names)) for f, text in raw[t.spelling]]
+            pending.extend(ft for _, ft in resolved[t.spelling])
+    return resolved
+
+
+def parse_swift_signature(source: str, function_name: str) -> Signature:
+    """Parse `func name(...) -> T` from a Swift solution."""
+    source = _strip_comments(source)
+    match = re.search(rf'\bfunc\s+{re.escape(function_name)}\s*(?:<[^>]*>)?\s*\(', source)
+    if not match:
+        raise SignatureError(f"Function {function_name} not found")
+    close = _matching(source, match.end() - 1, '(', ')')
+    tail = re.match(r'\s*(throws\s*|rethrows\s*)?(?:->\s*([^{]+?))?\s*(?:where\b[^{]*)?\{',
+                    source[close + 1:], flags=re.S)
+    if not tail:
+        raise SignatureError(f"Could not parse the return type of {function_name}")
+
+    raw_structs = _swift_structs(source)
+    names = set(raw_structs)
+    params = []
+    for part in _split_top_level(source[match.end():close]):
+        decl = re.match(r'(?:(\w+)\s+)?(\w+)\s*:\s*(inout\s+)?(.+?)\s*(=.*)?$', part, flags=re.S)
+        if not decl:
+            raise SignatureError(f"Could not parse parameter: {part}")
+        label, name, inout, type_text = decl.group(1), decl.group(2), decl.group(3), decl.group(4)
+        if '...' in type_text:
+            raise SignatureError(f"Variadic parameters are not supported: {part}")
+        label = name if label is None else (None if label == '_' else label)
+        params.append(Param(name, parse_swift_type(type_text, names), label, bool(inout)))
+
+    returns = parse_swift_type(tail.group(2), names) if tail.group(2) else TypeRef('void', 'Void')
+    roots = [p.type for p in params] + [returns]
+    return Signature(function_name, params, returns, _method_of(source, match.start()),
+                     throws=bool(tail.group(1)),
+                     structs=_resolve_structs(raw_structs, parse_swift_type, roots))
+
+
+def parse_kotlin_signature(source: str, function_name: str) -> Signature:
+    """Parse `fun name(...): T` from a Kotlin solution."""
+    source = _strip_comments(source)
+    match = re.search(rf'\bfun\s+(?:<[^>]*>\s*)?{re.escape(function_name)}\s*\(', source)
+    if not match:
+        raise SignatureError(f"Function {function_name} not found")
+    close = _matching(source, match.end() - 1, '(', ')')
+    tail = re.match(r'\s*(?::\s*([^={]+?))?\s*[={]', source[close + 1:], flags=re.S)
+    if not tail:
+        raise SignatureError(f"Could not parse the return type of {function_name}")
+
+    raw_structs = _kotlin_structs(source)
+    names = set(raw_structs)
+    params = []
+    for part in _split_top_level(source[match.end():close]):
+        decl = re.match(r'(?:@\w+\s+)*(vararg\s+)?(\w+)\s*:\s*(.+?)\s*(=.*)?$', part, flags=re.S)
+        if not decl:
+            raise SignatureError(f"Could not parse parameter: {part}")
+        if decl.group(1):
+            raise SignatureError(f"vararg parameters are not supported: {part}")
+        params.append(Param(decl.group(2), parse_kotlin_type(decl.group(3), names)))
+
+    if tail.group(1):
+        returns = parse_kotlin_type(tail.group(1), names)
+    elif source[close + 1:].lstrip().startswith('='):
+        raise SignatureError(f"Give {function_name} an explicit return type")
+    else:
+        returns = TypeRef('void', 'Unit')
+    roots = [p.type for p in params] + [returns]
+    return Signature(function_name, params, returns, _method_of(source, match.start()),
+                     structs=_resolve_structs(raw_structs, parse_kotlin_type, roots))
+
+
+# --- Swift code generation -------------------------------------------------
+
+def swift_decode(t: TypeRef) -> str:
+    """Swift expression reading a value of type t from reader `r`."""
+    if t.kind in ('int', 'long'):
+        if t.spelling == 'Int':
+            return 'try r.readInt()'
+        # Checked, so a negative UInt or an oversized Int32 fails the case instead of trapping
+        return f'try leetvibeExact({t.spelling}.self, r.readInt())'
+    if t.kind == 'double':
+        return 'try r.readDouble()' if t.spelling == 'Double' else f'try {t.spelling}(r.readDouble())'
+    if t.kind == 'bool':
+        return 'try r.readBool()'
+    if t.kind == 'string':
+        return 'try r.readString()'
+    if t.kind == 'char':
+        return 'try r.readCharacter()'
+    if t.kind == 'list':
+        return f'try r.readArray {{ {swift_decode(t.element)} }}'
+    if t.kind == 'optional':
+        return f'try r.readOptional {{ {swift_decode(t.element)} }}'
+    if t.kind == 'struct':
+        return f'try leetvibeDecode{t.spelling}(r)'
+    raise SignatureError(f"Cannot decode {t.spelling}")
+
+
+def swift_encode(t: TypeRef, expr: str, depth: int = 0) -> str:
+    """Swift statements writing expr (of type t) to writer `w`."""
+    if t.kind in ('int', 'long'):
+        return f'w.writeInt(Int({expr}))' if t.spelling != 'Int' else f'w.writeInt({expr})'
+    if t.kind == 'double':
+        return f'w.writeDouble(Double({expr}))'
+    if t.kind == 'bool':
+        return f'w.writeBool({expr})'
+    if t.kind == 'string':
+        return f'w.writeString({expr})'
+    if t.kind == 'char':
+        return f'w.writeString(String({expr}))'
+    if t.kind == 'list':
+        item = f'e{depth}'
+        return (f'w.beginArray(); for {item} in {expr} {{ {swift_encode(t.element, item, depth + 1)} }}; '
+                f'w.endArray()')
+    if t.kind == 'optional':
+        item = f'v{depth}'
+        return (f'if let {item} = {expr} {{ {swift_encode(t.element, item, depth + 1)} }} '
+                f'else {{ w.writeNull() }}')
+    if t.kind == 'struct':
+        return f'leetvibeEncode{t.spelling}(w, {expr})'
+    if t.kind == 'void':
+        return 'w.writeNull()'
+    raise SignatureError(f"Cannot encode {t.spelling}")
+
+
+def swift_struct_codecs(structs: dict[str, list[tuple[str, TypeRef]]]) -> str:
+    """Decoder and encoder functions for each struct."""
+    blocks = []
+    for name, fields in structs.items():
+        slots = '\n'.join(
+            f'    var {f}: {t.spelling if t.kind == "optional" else t.spelling + "?"} = nil'
+            for f, t in fields
+        )
+        cases = '\n'.join(f'        case "{f}": {f} = {swift_decode(t)}' for f, t in fields)
+        args = ', '.join(
+            f'{f}: {f}' if t.kind == 'optional'
+            else f'{f}: try leetvibeRequire({f}, "{name}.{f}")'
+            for f, t in fields
+        )
+        writes = '\n'.join(f'    w.writeKey("{f}"); {swift_encode(t, "value." + f)}' for f, t in fields)
+        blocks.append(f'''func leetvibeDecode{name}(_ r: LeetvibeReader) throws -> {name} {{
+{slots}
+    try r.readObject {{ key in
+        switch key {{
+{cases}
+        default: try r.skipValue()
+        }}
+    }}
+    return {name}({args})
+}}
+
+func leetvibeEncode{name}(_ w: LeetvibeWriter, _ value: {name}) {{
+    w.beginObject()
+{writes}
+    w.endObject()
+}}
+''')
+    return '\n'.join(blocks)
+
+
+def swift_call_case(sig: Signature) -> str:
+    """
+    Body of the Swift per-case function: decode, call, encode. A void
+    function with inout parameters works in place, so its first inout
+    argument is the output.
+    """
+    lines = ['    try r.beginArray()']
+    for i, p in enumerate(sig.params):
+        if i:
+            lines.append('    try r.nextElement()')
+        keyword = 'var' if p.inout else 'let'
+        lines.append(f'    {keyword} a{i}: {p.type.spelling} = {swift_decode(p.type)}')
+    lines.append('    try r.endArray()')
+    args = ', '.join(
+        f"{p.label + ': ' if p.label else ''}{'&' if p.inout else ''}a{i}"
+        for i, p in enumerate(sig.params)
+    )
+    target = f'Solution().{sig.name}' if sig.method_of else sig.name
+    call = f"{'try ' if sig.throws else ''}{target}({args})"
+    lines.append('    let start = DispatchTime.now().uptimeNanoseconds')
+    if sig.returns.kind == 'void':
+        lines.append(f'    {call}')
+    else:
+        lines.append(f'    let result = {call}')
+    lines.append('    let elapsed = Double(DispatchTime.now().uptimeNanoseconds - start) / 1e6')
+    lines.append('    w.beginRecord(elapsed)')
+    in_place = [i for i, p in enumerate(sig.params) if p.inout]
+    if sig.returns.kind == 'void' and in_place:
+        lines.append(f"    {swift_encode(sig.params[in_place[0]].type, f'a{in_place[0]}')}")
+    else:
+        lines.append(f"    {swift_encode(sig.returns, 'result')}")
+    lines.append('    w.endRecord()')
+    return '\n'.join(lines)
+
+
+# --- Kotlin code generation ------------------------------------------------
+
+def kotlin_decode(t: TypeRef) -> str:
+    """Kotlin expression reading a value of type t from reader `r`."""
+    simple = {
+        'Int': 'r.readInt()', 'Short': 'r.readInt().toShort()', 'Byte': 'r.readInt().toByte()',
+        'Long': 'r.readLong()', 'Double': 'r.readDouble()', 'Float': 'r.readDouble().toFloat()',
+        'Boolean': 'r.readBoolean()', 'String': 'r.readString()', 'Char': 'r.readChar()',
+    }
+    if t.kind == 'list':
+        items = f'r.readList {{ {kotlin_decode(t.element)} }}'
+        if t.spelling in KOTLIN_PRIMITIVE_ARRAYS:
+            return f'{items}.to{t.spelling}()'
+        # readList builds an ArrayList, which List and MutableList accept
+        if re.match(r'Array\s*<', t.spelling):
+            return f'{items}.toTypedArray()'
+        return items
+    if t.kind == 'optional':
+        return f'r.readNullable {{ {kotlin_decode(t.element)} }}'
+    if t.kind == 'struct':
+        return f'leetvibeDecode{t.spelling}(r)'
+    if t.spelling in simple:
+        return simple[t.spelling]
+    raise SignatureError(f"Cannot decode {t.spelling}")
+
+
+def kotlin_encode(t: TypeRef, expr: str, depth: int = 0) -> str:
+    """Kotlin statements writing expr (of type t) to writer `w`."""
+    if t.kind in ('int', 'long'):
+        return f'w.writeLong({expr}.toLong())'
+    if t.kind == 'double':
+        return f'w.writeDouble({expr}.toDouble())'
+    if t.kind == 'bool':
+        return f'w.writeBoolean({expr})'
+    if t.kind == 'string':
+        return f'w.writeString({expr})'
+    if t.kind == 'char':
+        return f'w.writeString({expr}.toString())'
+    if t.kind == 'list':
+        item = f'e{depth}'
+        return (f'w.beginArray(); for ({item} in {expr}) {{ {kotlin_encode(t.element, item, depth + 1)} }}; '
+                f'w.endArray()')
+    if t.kind == 'optional':
+        item = f'v{depth}'
+        return (f'run {{ val {item} = {expr}; if ({item} == null) w.writeNull() '
+                f'else {{ {kotlin_encode(t.element, item, depth + 1)} }} }}')
+    if t.kind == 'struct':
+        return f'leetvibeEncode{t.spelling}(w, {expr})'
+    if t.kind == 'void':
+        return 'w.writeNull()'
+    raise SignatureError(f"Cannot encode {t.spelling}")
+
+
+def kotlin_struct_codecs(structs: dict[str, list[tuple[str, TypeRef]]]) -> str:
+    """Decoder and encoder functions for each data class."""
+    blocks = []
+    for name, fields in structs.items():
+        slots = '\n'.join(
+            f'    var {f}: {t.spelling if t.kind == "optional" else t.spelling + "?"} = null'
+            for f, t in fields
+        )
+        cases = '\n'.join(f'            "{f}" -> {{ {f} = {kotlin_decode(t)} }}' for f, t in fields)
+        args = ', '.join(
+            f'{f} = {f}' if t.kind == 'optional' else f'{f} = leetvibeRequire({f}, "{name}.{f}")'
+            for f, t in fields
+        )
+        writes = '\n'.join(f'    w.writeKey("{f}"); {kotlin_encode(t, "value." + f)}' for f, t in fields)
+        blocks.append(f'''fun leetvibeDecode{name}(r: LeetvibeReader): {name} {{
+{slots}
+    r.readObject {{ key ->
+        when (key) {{
+{cases}
+            else -> r.skipValue()
+        }}
+    }}
+    return {name}({args})
+}}
+
+fun leetvibeEncode{name}(w: LeetvibeWriter, value: {name}) {{
+    w.beginObject()
+{writes}
+    w.endObject()
+}}
+''')
+    return '\n'.join(blocks)
+
+
+def kotlin_call_case(sig: Signature) -> str:
+    """Body of the Kotlin per-case function: decode, call, encode."""
+    lines = ['    r.beginArray()']
+    for i, p in enumerate(sig.params):
+        if i:
+            lines.append('    r.nextElement()')
+        lines.append(f'    val a{i}: {p.type.spelling} = {kotlin_decode(p.type)}')
+    lines.append('    r.endArray()')
+    args = ', '.join(f'a{i}' for i in range(len(sig.params)))
+    target = f'Solution().{sig.name}' if sig.method_of else sig.name
+    lines.append('    val start = System.nanoTime()')
+    lines.append(f'    val result = {target}({args})')
+    lines.append('    val elapsed = (System.nanoTime() - start) / 1e6')
+    lines.append('    w.beginRecord(elapsed)')
+    lines.append(f"    {kotlin_encode(sig.returns, 'result')}")
+    lines.append('    w.endRecord()')
+    return '\n'.join(lines)
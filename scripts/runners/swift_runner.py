@@ -1,15 +1,39 @@
 """
 Swift Test Runner for LeetVibe
+
+Compiles the solution once with swiftc, together with a harness generated
+from the function's signature (see runners/signatures.py) and the JSON
+runtime in include/LeetvibeJson.swift, and runs every test case in a single
+process. Arguments are decoded straight into the parameter types, so
+functions may take several arguments of any supported type.
+
+Builds are cached under ~/.leetvibe/cache/swift, keyed by the generated
+source, the runtime and the compiler, so resubmitting an unchanged solution
+skips the compiler entirely.
 """
 
-import json
+import hashlib
 import shutil
 import tempfile
-import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+from .base_runner import BaseRunner, TestResult, executable_identity
+from .signatures import (
+    SignatureError, parse_swift_signature, swift_call_case, swift_struct_codecs,
+)
+
+# JSON reader/writer and batch driver compiled into every harness
+RUNTIME_PATH = Path(__file__).parent / 'include' / 'LeetvibeJson.swift'
+
+# Flags used for every Swift build
+COMPILE_FLAGS = ['-O']
 
-from .base_runner import BaseRunner, TestResult
+# Compile timeout (seconds)
+COMPILE_TIMEOUT = 120
+
+# Shared cache for compiled harnesses
+SWIFT_CACHE_DIR = Path.home() / '.leetvibe' / 'cache' / 'swift'
 
 
 class SwiftRunner(BaseRunner):
@@ -26,115 +50,71 @@ class SwiftRunner(BaseRunner):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.temp_dir = tempfile.mkdtemp()
+        self.executable_path = None
 
-    def compile(self) -> tuple[bool, str | None]:
-        """Swift can be run directly with 'swift' command."""
-        if not shutil.which('swift'):
-            return False, "Swift compiler not found"
-
-        # Syntax check by trying to parse
-        stdout, stderr, returncode = self._run_process([
-            'swift', '-parse', str(self.solution_path)
-        ], timeout=10)
+    def toolchain_id(self) -> str:
+        return f"{executable_identity('swiftc')} {' '.join(COMPILE_FLAGS)}"
 
-        if returncode != 0:
-            return False, stderr.strip() or "Swift syntax error"
+    def _harness_source(self) -> str:
+        """The solution followed by the generated decode/call/encode code."""
+        solution = self.solution_path.read_text()
+        signature = parse_swift_signature(solution, self.function_name)
+        return f'''import Foundation
 
-        return True, None
+{solution}
 
-    def run_single_test(self, input_data: list, expected: Any) -> TestResult:
-        """Run a single test case using Swift."""
-        start_time = time.time()
-
-        # Read the solution file
-        with open(self.solution_path, 'r') as f:
-            solution_code = f.read()
-
-        # Create wrapper script
-        wrapper = f'''
-import Foundation
-
-// Solution code
-{solution_code}
-
-// Parse command line argument as JSON
-let inputJson = CommandLine.arguments[1]
-guard let inputData = inputJson.data(using: .utf8),
-      let input = try? JSONSerialization.jsonObject(with: inputData) as? [Any] else {{
-    fputs("Failed to parse input\\n", stderr)
-    exit(1)
-}}
+// ---- LeetVibe harness (generated from the signature of {self.function_name}) ----
 
-// Call the function (assuming single argument for now)
-let result: Any
-if input.count == 1 {{
-    if let intArg = input[0] as? Int {{
-        result = {self.function_name}(intArg)
-    }} else if let strArg = input[0] as? String {{
-        result = {self.function_name}(strArg)
-    }} else if let arrArg = input[0] as? [Int] {{
-        result = {self.function_name}(arrArg)
-    }} else {{
-        fputs("Unsupported input type\\n", stderr)
-        exit(1)
-    }}
-}} else {{
-    fputs("Multiple arguments not yet supported\\n", stderr)
-    exit(1)
+{swift_struct_codecs(signature.structs)}
+func leetvibeCallCase(_ r: LeetvibeReader, _ w: LeetvibeWriter) throws {{
+{swift_call_case(signature)}
 }}
 
-// Output as JSON
-if let jsonData = try? JSONSerialization.data(withJSONObject: result),
-   let jsonString = String(data: jsonData, encoding: .utf8) {{
-    print(jsonString)
-}} else {{
-    // Handle primitive types
-    print(result)
-}}
+exit(leetvibeRunBatch(leetvibeCallCase))
 '''
 
-        wrapper_path = Path(self.temp_dir) / 'wrapper.swift'
-        with open(wrapper_path, 'w') as f:
-            f.write(wrapper)
-
+    def compile(self) -> tuple[bool, str | None]:
+        """Compile the solution and harness, reusing a cached build when possible."""
+        if not shutil.which('swiftc'):
+            return False, "Swift compiler not found (swiftc)"
         try:
-            stdout, stderr, returncode = self._run_process([
-                'swift', str(wrapper_path), json.dumps(input_data)
-            ])
-
-            execution_time = (time.time() - start_time) * 1000
-
-            if returncode != 0:
-                return TestResult(
-                    passed=False,
-                    input_data=input_data,
-                    expected=expected,
-                    actual=None,
-                    error=stderr.strip() or "Runtime error",
-                    execution_time_ms=execution_time
-                )
-
-            try:
-                actual = json.loads(stdout.strip())
-            except json.JSONDecodeError:
-                # Try parsing as a simple value
-                output = stdout.strip()
-                try:
-                    actual = int(output)
-                except ValueError:
-                    try:
-                        actual = float(output)
-                    except ValueError:
-                        actual = output
-
-            passed = self._values_equal(expected, actual)
+            source = self._harness_source()
+        except SignatureError as e:
+            return False, f"Cannot generate a test harness: {e}"
+
+        digest = hashlib.sha256()
+        for part in (source, RUNTIME_PATH.read_text(), self.toolchain_id()):
+            digest.update(part.encode())
+        self.executable_path = SWIFT_CACHE_DIR / digest.hexdigest()[:16] / 'solution'
+
+        main_path = Path(self.temp_dir) / 'main.swift'
+        main_path.write_text(source)
+
+        def build(output: Path) -> tuple[bool, str | None]:
+            _, stderr, returncode = self._run_process([
+                'swiftc', *COMPILE_FLAGS,
+                str(RUNTIME_PATH), str(main_path),
+                '-o', str(output),
+            ], timeout=COMPILE_TIMEOUT)
+            return returncode == 0, stderr.strip() or "Swift compilation failed"
+
+        return self._cached_build(self.executable_path, build)
+
+    def iter_results(self, test_cases: list[dict] = None) -> Iterator[TestResult]:
+        """Run every test case in one process, yielding results as they stream in."""
+        yield from self._iter_batch([str(self.executable_path)], test_cases)
+
+    def run_single_test(self, input_data: list, expected: Any) -> TestResult:
+        """Run a single test case."""
+        if not self.executable_path or not self.executable_path.exists():
             return TestResult(
-                passed=passed,
+                passed=False,
                 input_data=input_data,
                 expected=expected,
-                actual=actual,
-                execution_time_ms=execution_time
+                actual=None,
+                error="Compilation required first",
+                execution_time_ms=0
             )
 
-        finally:
-            wrapper_path.unlink(missing_ok=True)
+        test_case = {'input': input_data, 'expected': expected}
+        return next(self._iter_batch([str(self.executable_path)], [test_case]))
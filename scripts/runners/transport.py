@@ -0,0 +1,72 @@
+"""
+Input Transport for LeetVibe
+
+Delivers serialized test input to solution wrappers without putting it on
+the command line, where large payloads hit ARG_MAX.
+
+Small payloads are written to the child's stdin. Payloads at or above
+MMAP_THRESHOLD_BYTES are written once to a temp file whose path is passed
+in the LEETVIBE_INPUT_FILE environment variable, so the wrapper can
+memory-map it instead of pulling it through a pipe.
+
+Wrapper contract (every language):
+    if LEETVIBE_INPUT_FILE is set: read (mmap) the JSON payload from that file
+    otherwise:                     read the JSON payload from stdin
+
+Batched harnesses that support the binary wire format (runners/wire.py)
+may get that instead of JSON; it is recognised by its leading magic bytes.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+# Environment variable naming the file that holds a large payload
+INPUT_FILE_ENV = 'LEETVIBE_INPUT_FILE'
+
+# Payloads this large (in bytes) go through a file instead of stdin
+MMAP_THRESHOLD_BYTES = 1 << 20
+
+
+@dataclass
+class Transport:
+    """How a payload reaches the child process."""
+    stdin: str | bytes
+    env: dict | None = None
+    path: str | None = None
+
+
+@contextmanager
+def input_transport(payload: str | bytes, temp_dir: str | None = None,
+                    threshold: int = MMAP_THRESHOLD_BYTES) -> Iterator[Transport]:
+    """
+    Prepare a payload for delivery to a child process.
+
+    Args:
+        payload: Serialized input (JSON text, or bytes in the binary wire format)
+        temp_dir: Directory for the spill file (defaults to the system temp dir)
+        threshold: Size in bytes above which the payload is spilled to a file
+
+    Yields:
+        Transport with the stdin text and any environment overrides
+    """
+    data = payload.encode('utf-8') if isinstance(payload, str) else payload
+    if len(data) < threshold:
+        yield Transport(stdin=payload)
+        return
+
+    suffix = '.json' if isinstance(payload, str) else '.bin'
+    fd, path = tempfile.mkstemp(prefix='leetvibe-input-', suffix=suffix, dir=temp_dir)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        env = dict(os.environ)
+        env[INPUT_FILE_ENV] = path
+        yield Transport(stdin='', env=env, path=path)
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
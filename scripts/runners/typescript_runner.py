@@ -9,7 +9,8 @@ import time
 from pathlib import Path
 from typing import Any
 
-from .base_runner import BaseRunner, TestResult
+from .base_runner import BaseRunner, TestResult, executable_identity
+from .transport import INPUT_FILE_ENV
 
 
 class TypeScriptRunner(BaseRunner):
@@ -42,6 +43,10 @@ class TypeScriptRunner(BaseRunner):
             return 'node', []
         return None
 
+    def toolchain_id(self) -> str:
+        executor = self._find_executor()
+        return f"{executable_identity(executor[0])} {' '.join(executor[1])}" if executor else ''
+
     def compile(self) -> tuple[bool, str | None]:
         """TypeScript syntax check."""
         executor = self._find_executor()
@@ -80,11 +85,16 @@ class TypeScriptRunner(BaseRunner):
         # Create a test wrapper script
         # Use dynamic import for ES modules compatibility
         wrapper = f'''
+import {{ readFileSync }} from "fs";
 import {{ {self.function_name} }} from "{self.solution_path.absolute()}";
 
-const inputData = JSON.parse(process.argv[2]);
+// Large payloads arrive via a file, small ones on stdin (fd 0)
+const inputData = JSON.parse(readFileSync(process.env.{INPUT_FILE_ENV} ?? 0, "utf8"));
+// Time only the call, so per-case max_ms limits exclude startup
+const start = performance.now();
 const result = {self.function_name}(...inputData);
-console.log(JSON.stringify(result));
+const timeMs = performance.now() - start;
+console.log(JSON.stringify({{ time_ms: timeMs, result }}));
 '''
 
         # Create temp file with appropriate extension
@@ -94,8 +104,8 @@ console.log(JSON.stringify(result));
             wrapper_path = f.name
 
         try:
-            cmd = [exe] + args + [wrapper_path, json.dumps(input_data)]
-            stdout, stderr, returncode = self._run_process(cmd)
+            cmd = [exe] + args + [wrapper_path]
+            stdout, stderr, returncode = self._run_with_input(cmd, input_data)
 
             execution_time = (time.time() - start_time) * 1000
 
@@ -110,8 +120,10 @@ console.log(JSON.stringify(result));
                 )
 
             try:
-                actual = json.loads(stdout.strip())
-            except json.JSONDecodeError:
+                record = json.loads(stdout.strip().splitlines()[-1])
+                actual = record.get('result')
+                execution_time = record.get('time_ms', execution_time)
+            except (json.JSONDecodeError, IndexError, AttributeError):
                 return TestResult(
                     passed=False,
                     input_data=input_data,
@@ -121,13 +133,14 @@ console.log(JSON.stringify(result));
                     execution_time_ms=execution_time
                 )
 
-            passed = self._values_equal(expected, actual)
+            passed, mismatch = self._compare(expected, actual, input_data)
             return TestResult(
                 passed=passed,
                 input_data=input_data,
                 expected=expected,
                 actual=actual,
-                execution_time_ms=execution_time
+                execution_time_ms=execution_time,
+                mismatch=mismatch
             )
 
         finally:
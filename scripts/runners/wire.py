@@ -0,0 +1,281 @@
+"""
+Binary Wire Protocol for LeetVibe
+
+A compact, length-prefixed alternative to the JSON batch protocol, used
+between check_solution and batched harnesses (runners with the binary_wire
+capability) when a batch is large. Numeric arrays are sent as packed
+little-endian int64/float64 blocks, so a 10^6-element input costs a memcpy
+on each side instead of printing and re-parsing every number. Small batches
+keep using JSON, which stays readable for debugging; set LEETVIBE_WIRE=json
+to force JSON for every batch.
+
+All integers below are little-endian.
+
+Batch (harness input):
+    b'LVB1'  u32 case count  then per case: u32 length, value (argument list)
+
+Result frame (harness output, one per case, flushed as it completes):
+    u32 length  then  u8 1, f64 time_ms, f64 peak_mb, value   (ok)
+                or    u8 0, value                            (error message string)
+
+Value: one tag byte followed by
+    N / F / T   null / false / true
+    i           i64
+    u           u64 (integers above the i64 range)
+    d           f64
+    s           string: u32 byte length, UTF-8 bytes
+    l           list: u32 count, values
+    m           object: u32 count, then (string key, value) pairs
+    I           int array: u32 count, count x i64
+    D           float array: u32 count, count x f64
+
+The C++ side lives in include/leetvibe_wire.hpp.
+"""
+
+import json
+import os
+import struct
+import sys
+from array import array
+from typing import Any, BinaryIO
+
+# First bytes of a binary batch; a JSON batch always starts with '['
+MAGIC = b'LVB1'
+
+# Environment variable that forces a wire format ('json' or 'binary')
+WIRE_ENV = 'LEETVIBE_WIRE'
+
+# Batches whose binary encoding is at least this large (in bytes) go binary,
+# judged by a lower bound (_min_size) so small batches are never encoded twice
+BINARY_THRESHOLD_BYTES = 64 * 1024
+
+_U32 = struct.Struct('<I')
+_I64 = struct.Struct('<q')
+_U64 = struct.Struct('<Q')
+_F64 = struct.Struct('<d')
+_OK_HEADER = struct.Struct('<Bdd')
+
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+class WireError(ValueError):
+    """A value cannot be encoded, or a frame is malformed."""
+
+
+# ---------------------------------------------------------------- encoding
+
+def _packed(typecode: str, values: list) -> bytes:
+    packed = array(typecode, values)
+    if not _LITTLE_ENDIAN:
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _encode(value: Any, out: bytearray) -> None:
+    kind = type(value)
+    if value is None:
+        out += b'N'
+    elif kind is bool:
+        out += b'T' if value else b'F'
+    elif kind is int:
+        if -(1 << 63) <= value < (1 << 63):
+            out += b'i' + _I64.pack(value)
+        elif 0 <= value < (1 << 64):
+            out += b'u' + _U64.pack(value)
+        else:
+            raise WireError(f"integer out of 64-bit range: {value}")
+    elif kind is float:
+        out += b'd' + _F64.pack(value)
+    elif kind is str:
+        data = value.encode('utf-8')
+        out += b's' + _U32.pack(len(data)) + data
+    elif kind is list or kind is tuple:
+        # Homogeneous numeric lists are packed; type() keeps bools out
+        # (array('q') would silently accept them)
+        types = set(map(type, value))
+        if types == {int}:
+            try:
+                out += b'I' + _U32.pack(len(value)) + _packed('q', value)
+                return
+            except OverflowError:
+                pass
+        elif types == {float}:
+            out += b'D' + _U32.pack(len(value)) + _packed('d', value)
+            return
+        out += b'l' + _U32.pack(len(value))
+        for item in value:
+            _encode(item, out)
+    elif kind is dict:
+        out += b'm' + _U32.pack(len(value))
+        for key, item in value.items():
+            if type(key) is not str:
+                raise WireError(f"object keys must be strings, got {type(key).__name__}")
+            data = key.encode('utf-8')
+            out += _U32.pack(len(data)) + data
+            _encode(item, out)
+    else:
+        raise WireError(f"cannot encode {kind.__name__}")
+
+
+def _min_size(value: Any, limit: int) -> int:
+    """
+    A lower bound on value's encoded size, counted only until it reaches
+    limit, so sizing a large batch costs far less than encoding it.
+    """
+    kind = type(value)
+    if kind is int or kind is float:
+        return 8
+    if kind is str:
+        return 5 + len(value)
+    if kind is list or kind is tuple:
+        # Every item takes at least one byte
+        if 5 + len(value) >= limit:
+            return 5 + len(value)
+        size = 5
+        for item in value:
+            size += _min_size(item, limit - size)
+            if size >= limit:
+                break
+        return size
+    if kind is dict:
+        size = 5
+        for item in value.values():
+            size += 4 + _min_size(item, limit - size)
+            if size >= limit:
+                break
+        return size
+    return 1
+
+
+def encode(value: Any) -> bytes:
+    """Encode one value."""
+    out = bytearray()
+    _encode(value, out)
+    return bytes(out)
+
+
+def encode_batch(inputs: list[list]) -> bytes:
+    """Encode a batch of argument lists, one per test case."""
+    out = bytearray(MAGIC)
+    out += _U32.pack(len(inputs))
+    for arguments in inputs:
+        start = len(out)
+        out += b'\0\0\0\0'
+        _encode(list(arguments), out)
+        out[start:start + 4] = _U32.pack(len(out) - start - 4)
+    return bytes(out)
+
+
+def choose_batch_payload(inputs: list[list], binary: bool) -> str | bytes:
+    """
+    Serialize a batch for a harness: binary when the harness supports it
+    and the batch is large, JSON otherwise (or when LEETVIBE_WIRE=json).
+    """
+    preference = os.environ.get(WIRE_ENV, '').lower()
+    if binary and preference != 'json':
+        if preference == 'binary' or _min_size(inputs, BINARY_THRESHOLD_BYTES) >= BINARY_THRESHOLD_BYTES:
+            try:
+                return encode_batch(inputs)
+            except WireError:
+                pass
+    return json.dumps(inputs)
+
+
+# ---------------------------------------------------------------- decoding
+
+def _unpacked(typecode: str, data: memoryview) -> list:
+    packed = array(typecode)
+    packed.frombytes(data)
+    if not _LITTLE_ENDIAN:
+        packed.byteswap()
+    return packed.tolist()
+
+
+def _decode(data: memoryview, pos: int) -> tuple[Any, int]:
+    tag = data[pos]
+    pos += 1
+    if tag == 0x4E:  # N
+        return None, pos
+    if tag == 0x54:  # T
+        return True, pos
+    if tag == 0x46:  # F
+        return False, pos
+    if tag == 0x69:  # i
+        return _I64.unpack_from(data, pos)[0], pos + 8
+    if tag == 0x75:  # u
+        return _U64.unpack_from(data, pos)[0], pos + 8
+    if tag == 0x64:  # d
+        return _F64.unpack_from(data, pos)[0], pos + 8
+    if tag == 0x73:  # s
+        length = _U32.unpack_from(data, pos)[0]
+        pos += 4
+        if pos + length > len(data):
+            raise WireError("truncated string")
+        return str(data[pos:pos + length], 'utf-8'), pos + length
+    if tag == 0x49 or tag == 0x44:  # I, D
+        count = _U32.unpack_from(data, pos)[0]
+        pos += 4
+        end = pos + 8 * count
+        if end > len(data):
+            raise WireError("truncated numeric array")
+        return _unpacked('q' if tag == 0x49 else 'd', data[pos:end]), end
+    if tag == 0x6C:  # l
+        count = _U32.unpack_from(data, pos)[0]
+        pos += 4
+        items = []
+        for _ in range(count):
+            item, pos = _decode(data, pos)
+            items.append(item)
+        return items, pos
+    if tag == 0x6D:  # m
+        count = _U32.unpack_from(data, pos)[0]
+        pos += 4
+        obj = {}
+        for _ in range(count):
+            length = _U32.unpack_from(data, pos)[0]
+            pos += 4
+            key = str(data[pos:pos + length], 'utf-8')
+            obj[key], pos = _decode(data, pos + length)
+        return obj, pos
+    raise WireError(f"unknown value tag 0x{tag:02x} at offset {pos - 1}")
+
+
+def decode(data: bytes | memoryview) -> Any:
+    """Decode one value."""
+    try:
+        value, pos = _decode(memoryview(data), 0)
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise WireError(f"malformed value: {e}")
+    if pos != len(data):
+        raise WireError("trailing bytes after value")
+    return value
+
+
+def read_frame(stream: BinaryIO) -> bytes | None:
+    """Read one length-prefixed frame; None at end of stream."""
+    header = stream.read(4)
+    if not header:
+        return None
+    if len(header) < 4:
+        raise WireError("truncated frame header")
+    length = _U32.unpack(header)[0]
+    body = stream.read(length)
+    if len(body) < length:
+        raise WireError("truncated frame")
+    return body
+
+
+def decode_result(frame: bytes) -> dict:
+    """Decode a result frame into a batch record, as the JSON protocol would produce."""
+    try:
+        view = memoryview(frame)
+        if view[0] == 1:
+            _, time_ms, peak_mb = _OK_HEADER.unpack_from(view, 0)
+            result, pos = _decode(view, _OK_HEADER.size)
+            if pos != len(view):
+                raise WireError("trailing bytes after result")
+            return {'ok': True, 'time_ms': time_ms, 'peak_mb': peak_mb, 'result': result}
+        error, _ = _decode(view, 1)
+        return {'ok': False, 'error': error}
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise WireError(f"malformed result frame: {e}")
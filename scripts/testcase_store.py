@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Test Case Store for LeetVibe
+
+Stores a quiz's test cases in a sidecar file under .leetvibe/tests/ so they
+no longer have to be scraped out of the solution file on every submit, and
+so the user can edit the solution without touching the tests.
+
+Layout:
+    .leetvibe/tests/{quiz_id}.jsonl   line 1: header (function_name, count, ...)
+                                      line 2+: one test case per line
+
+Every reader needs all of a quiz's cases, so the file is read top to bottom;
+it can be written by hand.
+
+Usage:
+    python testcase_store.py import <solution_file>   # copy TEST comments to a sidecar
+    python testcase_store.py show <quiz_id> [index]
+"""
+
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+# Matches the start of an in-file test case comment (# or // style)
+TEST_COMMENT_PATTERN = r'(?:#|//)\s*TEST:{quiz_id}:\s*'
+
+# Matches a per-quiz comparator declaration, e.g. # COMPARATOR:001:"unordered"
+COMPARATOR_COMMENT_PATTERN = r'(?:#|//)\s*COMPARATOR:{quiz_id}:\s*'
+
+# Function definitions across supported languages
+FUNCTION_PATTERN = re.compile(r'(?:def|function|func|fun)\s+(\w+)\s*\(')
+
+# C/C++ function definitions: return type, name, parameters, opening brace
+C_FUNCTION_PATTERN = re.compile(
+    r'^[ \t]*(?:(?:static|inline|constexpr)\s+)*[\w:<>,\*& \t]*?[\w>\*&][ \t\*&]+(\w+)\s*'
+    r'\([^;{}]*\)\s*(?:const\s*)?\{',
+    re.MULTILINE
+)
+
+# Names the C pattern can match that are not functions under test
+C_NON_FUNCTIONS = {'main', 'if', 'for', 'while', 'switch', 'catch', 'return'}
+
+
+def get_tests_dir(leetvibe_dir: Path) -> Path:
+    """Directory holding test case sidecar files."""
+    return leetvibe_dir / 'tests'
+
+
+def _data_path(tests_dir: Path, quiz_id: str) -> Path:
+    return tests_dir / f'{quiz_id}.jsonl'
+
+
+def save_test_cases(tests_dir: Path, quiz_id: str, test_cases: dict) -> Path:
+    """
+    Write test cases to the sidecar file.
+
+    Args:
+        tests_dir: The .leetvibe/tests directory
+        quiz_id: Quiz ID (e.g. '001')
+        test_cases: Dict with 'function_name', 'test_cases' and any other
+            quiz-level settings, which are kept in the header line
+
+    Returns:
+        Path to the .jsonl file
+    """
+    tests_dir.mkdir(parents=True, exist_ok=True)
+    data_path = _data_path(tests_dir, quiz_id)
+
+    cases = test_cases.get('test_cases', [])
+    header = {k: v for k, v in test_cases.items() if k != 'test_cases'}
+    header['quiz_id'] = quiz_id
+    header['count'] = len(cases)
+
+    tmp_path = data_path.with_suffix('.jsonl.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(json.dumps(header).encode('utf-8') + b'\n')
+        for case in cases:
+            f.write(json.dumps(case, separators=(',', ':')).encode('utf-8') + b'\n')
+    tmp_path.replace(data_path)
+    return data_path
+
+
+def load_test_cases(tests_dir: Path, quiz_id: str) -> dict | None:
+    """
+    Load all test cases for a quiz from its sidecar file.
+
+    Returns:
+        Dict with 'function_name', 'test_cases' and header settings, or None
+        if there is no sidecar (or it cannot be read)
+    """
+    data_path = _data_path(tests_dir, quiz_id)
+    if not data_path.exists():
+        return None
+
+    try:
+        with open(data_path, 'rb') as f:
+            header = json.loads(f.readline())
+            cases = [json.loads(line) for line in f if line.strip()]
+    except (json.JSONDecodeError, IOError):
+        return None
+
+    header.pop('count', None)
+    header.pop('quiz_id', None)
+    return {**header, 'test_cases': cases}
+
+
+def parse_test_comments(content: str, quiz_id: str) -> list[dict]:
+    """
+    Extract test cases from TEST comments in a solution file.
+
+    Each comment's JSON is decoded with a real JSON parser starting at its
+    opening brace, so nested objects and trailing text are handled.
+    """
+    decoder = json.JSONDecoder()
+    start_pattern = re.compile(TEST_COMMENT_PATTERN.format(quiz_id=re.escape(quiz_id)))
+
+    test_cases = []
+    for match in start_pattern.finditer(content):
+        start = match.end()
+        try:
+            tc, _ = decoder.raw_decode(content, start)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(tc, dict):
+            test_cases.append(tc)
+    return test_cases
+
+
+def parse_comparator_comment(content: str, quiz_id: str):
+    """Comparator spec from a COMPARATOR comment, or None if there is none."""
+    pattern = re.compile(COMPARATOR_COMMENT_PATTERN.format(quiz_id=re.escape(quiz_id)))
+    match = pattern.search(content)
+    if not match:
+        return None
+    try:
+        spec, _ = json.JSONDecoder().raw_decode(content, match.end())
+    except json.JSONDecodeError:
+        return None
+    return spec
+
+
+def parse_solution_comments(content: str, quiz_id: str) -> dict | None:
+    """Test cases and quiz settings declared in a solution file's comments."""
+    test_cases = parse_test_comments(content, quiz_id)
+    if not test_cases:
+        return None
+
+    result = {
+        'function_name': find_function_name(content),
+        'test_cases': test_cases,
+    }
+    comparator = parse_comparator_comment(content, quiz_id)
+    if comparator is not None:
+        result['comparator'] = comparator
+    return result
+
+
+def find_function_name(content: str) -> str:
+    """Name of the first function defined in a solution file."""
+    match = FUNCTION_PATTERN.search(content)
+    if match:
+        return match.group(1)
+    for match in C_FUNCTION_PATTERN.finditer(content):
+        if match.group(1) not in C_NON_FUNCTIONS:
+            return match.group(1)
+    return "solve"
+
+
+def import_from_solution(solution_path: Path) -> Path | None:
+    """Copy a solution file's TEST comments into its sidecar file."""
+    quiz_id = solution_path.stem.split('-')[0]
+    test_cases = parse_solution_comments(solution_path.read_text(), quiz_id)
+    if not test_cases:
+        return None
+
+    tests_dir = get_tests_dir(solution_path.parent.parent)
+    return save_test_cases(tests_dir, quiz_id, test_cases)
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ('import', 'show'):
+        print(__doc__.strip().split('Usage:')[1], file=sys.stderr)
+        sys.exit(1)
+
+    if sys.argv[1] == 'import':
+        data_path = import_from_solution(Path(sys.argv[2]))
+        if not data_path:
+            print(f"No TEST comments found in {sys.argv[2]}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Wrote {data_path}")
+        return
+
+    cwd = os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd())
+    tests_dir = get_tests_dir(Path(cwd) / '.leetvibe')
+    quiz_id = sys.argv[2]
+    test_cases = load_test_cases(tests_dir, quiz_id)
+    if len(sys.argv) > 3:
+        cases = test_cases['test_cases'] if test_cases else []
+        index = int(sys.argv[3])
+        print(json.dumps(cases[index] if 0 <= index < len(cases) else None))
+    else:
+        print(json.dumps(test_cases, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Watch Mode for LeetVibe
+
+Re-runs a quiz's tests every time its solution file is saved:
+
+    leetvibe watch 003
+
+The file is watched with inotify on Linux (through ctypes, no extra
+packages) and by polling its mtime elsewhere. Bursts of save events are
+debounced into one run. Work that doesn't depend on the edit stays warm
+across runs: Python solutions run in one long-lived worker process, and
+the C++ harness header and runtime come from the build cache, so only the
+solution itself is rebuilt. Cases that failed on the previous run go first
+and are reported as soon as they finish.
+
+Watch mode does not record progress; run `leetvibe submit` when done.
+
+Usage:
+    python watch.py <quiz_id | solution_file> [--python INTERPRETER]
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from check_solution import (
+    expand_generated_cases, find_solution_file, get_leetvibe_dir,
+    parse_test_cases_from_solution, run_solution,
+)
+import metrics
+from project_config import load_project_config
+from runners.python_runner import DEFAULT_INTERPRETER, WarmPythonWorker
+
+# Quiet period that ends a burst of save events
+DEBOUNCE_SECONDS = 0.05
+
+# How often the polling watcher checks the file
+POLL_SECONDS = 0.2
+
+# inotify constants (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """
+    Reports writes to one file. The parent directory is watched so that
+    editors which save by writing a new file and renaming it are seen too.
+    """
+
+    def __init__(self, path: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(self.fd, str(path.parent).encode(), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), 'inotify_add_watch failed')
+        self.name = path.name.encode()
+
+    def _drain(self) -> bool:
+        """Read pending events; True if any concerns the watched file."""
+        changed = False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                _, _, _, name_len = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = data[offset:offset + name_len].rstrip(b'\0')
+                offset += name_len
+                changed = changed or name == self.name
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the file changes (True) or timeout passes (False)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return False
+            if self._drain():
+                return True
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Reports changes to one file's mtime or size, checked every POLL_SECONDS."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.last = self._stamp()
+
+    def _stamp(self) -> tuple | None:
+        try:
+            stat = self.path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def wait(self, timeout: float | None = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            stamp = self._stamp()
+            if stamp != self.last:
+                self.last = stamp
+                return True
+            time.sleep(POLL_SECONDS if deadline is None else
+                       max(0.0, min(POLL_SECONDS, deadline - time.monotonic())))
+        return False
+
+    def close(self) -> None:
+        pass
+
+
+def make_watcher(path: Path):
+    """inotify where available, polling otherwise."""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(path)
+        except (OSError, AttributeError, TypeError):
+            pass
+    return PollingWatcher(path)
+
+
+def wait_for_save(watcher) -> None:
+    """Wait for a change, then for the burst of events around it to settle."""
+    watcher.wait()
+    while watcher.wait(DEBOUNCE_SECONDS):
+        pass
+
+
+def failed_first(cases: list[dict], failed: set[int]) -> list[int]:
+    """Case indices with previously failing ones first, in their original order."""
+    return sorted(range(len(cases)), key=lambda i: i not in failed)
+
+
+def run_once(solution_path: Path, failed: set[int], options: dict) -> set[int]:
+    """Run the suite once and print the outcome. Returns the failing case indices."""
+    stamp = datetime.now().strftime('%H:%M:%S')
+    test_cases = parse_test_cases_from_solution(solution_path)
+    if not test_cases:
+        print(f"  [{stamp}] No test cases found in {solution_path.name}")
+        return set()
+    expand_error = expand_generated_cases(solution_path, test_cases)
+    if expand_error:
+        print(f"  [{stamp}] Error: {expand_error}")
+        return set()
+
+    cases = test_cases['test_cases']
+    order = failed_first(cases, failed)
+    ordered = {**test_cases, 'test_cases': [cases[i] for i in order]}
+    now_failing = set()
+
+    def report(index, result):
+        case_index = order[index]
+        if not result.passed:
+            now_failing.add(case_index)
+            detail = result.error or result.mismatch or "wrong answer"
+            print(f"    FAIL test {case_index + 1}: {detail.splitlines()[-1] if detail else ''}")
+        elif case_index in failed:
+            print(f"    PASS test {case_index + 1} (fixed)")
+
+    start = time.perf_counter()
+    result = run_solution(solution_path, ordered, on_result=report, options=options)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if result.compile_error:
+        print(f"  [{stamp}] COMPILE ERROR:\n{result.compile_error}")
+        return failed
+    verdict = "all passed" if result.all_passed else f"{result.passed}/{result.total} passed"
+    print(f"  [{stamp}] {verdict} ({elapsed_ms:.0f} ms)")
+    return now_failing
+
+
+def watch(solution_path: Path, options: dict) -> None:
+    """Run the suite now and after every save until interrupted."""
+    worker = None
+    if solution_path.suffix.lower() == '.py':
+        worker = WarmPythonWorker(options.get('python') or DEFAULT_INTERPRETER)
+        options = {**options, 'worker': worker}
+
+    watcher = make_watcher(solution_path)
+    kind = 'inotify' if isinstance(watcher, InotifyWatcher) else 'polling'
+    print(f"\n  Watching {solution_path} ({kind}). Press Ctrl+C to stop.\n")
+
+    failed = set()
+    try:
+        while True:
+            failed = run_once(solution_path, failed, options)
+            metrics.flush()
+            print()
+            wait_for_save(watcher)
+    except KeyboardInterrupt:
+        print("\n  Stopped watching. Run `leetvibe submit` to record your progress.\n")
+    finally:
+        watcher.close()
+        if worker:
+            worker.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-run a LeetVibe quiz on every save')
+    parser.add_argument('target', help='Quiz ID (e.g., 001) or path to solution file')
+    parser.add_argument('--python', metavar='INTERPRETER',
+                        help='Interpreter for Python solutions (e.g. pypy3, python3.12)')
+    args = parser.parse_args()
+    config = load_project_config(get_leetvibe_dir())
+
+    solution_path = Path(args.target)
+    if not solution_path.exists():
+        quiz_id = f"{int(args.target):03d}" if args.target.isdigit() else args.target
+        solution_path = find_solution_file(quiz_id)
+        if not solution_path:
+            print(f"Error: No solution file found for quiz {quiz_id}", file=sys.stderr)
+            sys.exit(1)
+
+    watch(solution_path, {'python': args.python or config.get('python')})
+
+
+if __name__ == '__main__':
+    main()